@@ -8,7 +8,8 @@ import sys
 import pykka.debug
 
 from mopidy import commands, config as config_lib, ext
-from mopidy.internal import encoding, log, path, process, versioning
+from mopidy.internal import (
+    encoding, log, metrics, path, process, profiler, versioning)
 from mopidy.internal.gi import Gst  # noqa: F401
 
 try:
@@ -28,9 +29,10 @@ def main():
     logger.info('Starting Mopidy %s', versioning.get_version())
 
     signal.signal(signal.SIGTERM, process.sigterm_handler)
-    # Windows does not have signal.SIGUSR1
+    # Windows does not have signal.SIGUSR1 or signal.SIGUSR2
     if hasattr(signal, 'SIGUSR1'):
-        signal.signal(signal.SIGUSR1, pykka.debug.log_thread_tracebacks)
+        signal.signal(signal.SIGUSR1, log_debug_info)
+        signal.signal(signal.SIGUSR2, profiler.profiler.toggle)
 
     try:
         registry = ext.Registry()
@@ -143,6 +145,12 @@ def main():
         raise
 
 
+def log_debug_info(*args):
+    pykka.debug.log_thread_tracebacks(*args)
+    if metrics.registry.enabled:
+        metrics.log_summary()
+
+
 def create_core_dirs(config):
     path.get_or_create_dir(config['core']['cache_dir'])
     path.get_or_create_dir(config['core']['config_dir'])
@@ -3,11 +3,12 @@ from __future__ import (
 
 import collections
 import logging
+import threading
 import time
 
 from mopidy import exceptions
 from mopidy.audio import tags as tags_lib, utils
-from mopidy.internal import encoding, log
+from mopidy.internal import encoding, log, workers
 from mopidy.internal.gi import Gst, GstPbutils
 
 # GST_ELEMENT_FACTORY_LIST:
@@ -21,6 +22,17 @@ _PARSER = 1 << 6
 _SELECT_TRY = 0
 _SELECT_EXPOSE = 1
 
+# Scan modes, from fastest to most accurate:
+#: Only get tags, not the duration.
+TAGS_ONLY = 'tags_only'
+#: Get tags, and the duration as known after prerolling, or else estimated
+#: from the bitrate and size. May be off for VBR files without headers.
+TAGS_AND_DURATION_ESTIMATE = 'tags_and_duration_estimate'
+#: Get tags and the exact duration, decoding audio if needed to get it.
+EXACT = 'exact'
+
+SCAN_MODES = (TAGS_ONLY, TAGS_AND_DURATION_ESTIMATE, EXACT)
+
 _Result = collections.namedtuple(
     'Result', ('uri', 'tags', 'duration', 'seekable', 'mime', 'playable'))
 
@@ -39,14 +51,18 @@ class Scanner(object):
 
     :param timeout: timeout for scanning a URI in ms
     :param proxy_config: dictionary containing proxy config strings.
+    :param mode: one of :data:`TAGS_ONLY`, :data:`TAGS_AND_DURATION_ESTIMATE`
+        and :data:`EXACT`. Only :data:`EXACT` may decode audio to find the
+        duration.
     :type event: int
     """
 
-    def __init__(self, timeout=1000, proxy_config=None):
+    def __init__(self, timeout=1000, proxy_config=None, mode=EXACT):
         self._timeout_ms = int(timeout)
         self._proxy_config = proxy_config or {}
+        self._mode = mode
 
-    def scan(self, uri, timeout=None):
+    def scan(self, uri, timeout=None, mode=None):
         """
         Scan the given uri collecting relevant metadata.
 
@@ -55,6 +71,9 @@ class Scanner(object):
         :param timeout: timeout for scanning a URI in ms. Defaults to the
             ``timeout`` value used when creating the scanner.
         :type timeout: int
+        :param mode: scan mode. Defaults to the ``mode`` value used when
+            creating the scanner.
+        :type mode: string
         :return: A named tuple containing
             ``(uri, tags, duration, seekable, mime)``.
             ``tags`` is a dictionary of lists for all the tags we found.
@@ -63,12 +82,14 @@ class Scanner(object):
             indicating if a seek would succeed.
         """
         timeout = int(timeout or self._timeout_ms)
+        mode = mode or self._mode
         tags, duration, seekable, mime = None, None, None, None
         pipeline, signals = _setup_pipeline(uri, self._proxy_config)
 
         try:
             _start_pipeline(pipeline)
-            tags, mime, have_audio, duration = _process(pipeline, timeout)
+            tags, mime, have_audio, duration = _process(
+                pipeline, timeout, mode)
             seekable = _query_seekable(pipeline)
         finally:
             signals.clear()
@@ -78,6 +99,86 @@ class Scanner(object):
         return _Result(uri, tags, duration, seekable, mime, have_audio)
 
 
+class ScanService(object):
+
+    """
+    Scan URIs in a bounded pool of worker threads.
+
+    Scanning a URI that is already being scanned waits for the scan in
+    progress instead of starting another one, even if a different timeout was
+    asked for.
+
+    :param num_workers: maximum number of URIs to scan at the same time
+    :type num_workers: int
+    :param proxy_config: dictionary containing proxy config strings.
+    :type proxy_config: dict
+    """
+
+    def __init__(self, num_workers=4, proxy_config=None):
+        self.num_workers = num_workers
+        self._proxy_config = proxy_config or {}
+        self._pool = workers.WorkerPool(num_workers, name='Scanner')
+        self._lock = threading.Lock()
+        self._pending = {}
+
+    def scan_async(self, uri, timeout=None, mode=EXACT):
+        """
+        Start scanning the given uri.
+
+        See :meth:`Scanner.scan` for the arguments.
+
+        :returns: a future with the result of :meth:`Scanner.scan`
+        :rtype: :class:`pykka.ThreadingFuture`
+        """
+        key = (uri, mode)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = self._pool.submit(
+                    self._scan, uri, timeout, mode)
+        return future
+
+    def scan(self, uri, timeout=None, mode=EXACT):
+        """
+        Scan the given uri, blocking until done.
+
+        See :meth:`Scanner.scan` for the arguments and return value.
+        """
+        return self.scan_async(uri, timeout, mode).get()
+
+    def stop(self):
+        """Stop the worker threads once the scans started so far are done."""
+        self._pool.stop()
+
+    def _scan(self, uri, timeout, mode):
+        try:
+            scanner = Scanner(proxy_config=self._proxy_config, mode=mode)
+            return scanner.scan(uri, timeout=timeout)
+        finally:
+            with self._lock:
+                del self._pending[(uri, mode)]
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service(proxy_config=None):
+    """
+    Get the :class:`ScanService` shared by all of Mopidy's backends.
+
+    The service is created the first time this is called.
+
+    :param proxy_config: dictionary containing proxy config strings.
+    :type proxy_config: dict
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ScanService(proxy_config=proxy_config)
+        return _service
+
+
 # Turns out it's _much_ faster to just create a new pipeline for every as
 # decodebins and other elements don't seem to take well to being reused.
 def _setup_pipeline(uri, proxy_config=None):
@@ -186,7 +287,19 @@ def _query_seekable(pipeline):
     return query.parse_seeking()[1]
 
 
-def _process(pipeline, timeout_ms):
+def _estimate_duration(pipeline, tags):
+    bitrate = (
+        tags.get(Gst.TAG_BITRATE) or tags.get(Gst.TAG_NOMINAL_BITRATE) or
+        [None])[0]
+    if not bitrate:
+        return None
+    success, size = pipeline.query_duration(Gst.Format.BYTES)
+    if not success or size <= 0:
+        return None
+    return int(size * 8 * 1000 // bitrate)
+
+
+def _process(pipeline, timeout_ms, mode=EXACT):
     bus = pipeline.get_bus()
     tags = {}
     mime = None
@@ -238,10 +351,18 @@ def _process(pipeline, timeout_ms):
         elif msg.type == Gst.MessageType.EOS:
             return tags, mime, have_audio, duration
         elif msg.type == Gst.MessageType.ASYNC_DONE:
+            if mode == TAGS_ONLY:
+                return tags, mime, have_audio, duration
+
             success, duration = _query_duration(pipeline)
             if tags and success:
                 return tags, mime, have_audio, duration
 
+            if mode == TAGS_AND_DURATION_ESTIMATE:
+                if not success:
+                    duration = _estimate_duration(pipeline, tags)
+                return tags, mime, have_audio, duration
+
             # Don't try workaround for non-seekable sources such as mmssrc:
             if not _query_seekable(pipeline):
                 return tags, mime, have_audio, duration
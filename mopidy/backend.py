@@ -3,6 +3,7 @@ from __future__ import absolute_import, unicode_literals
 import logging
 
 from mopidy import listener, models
+from mopidy.internal import metrics
 
 
 logger = logging.getLogger(__name__)
@@ -89,6 +90,8 @@ class LibraryProvider(object):
 
     def __init__(self, backend):
         self.backend = backend
+        metrics.registry.instrument(
+            self, 'backend', ['browse', 'lookup', 'lookup_many', 'search'])
 
     def browse(self, uri):
         """
@@ -141,6 +144,36 @@ class LibraryProvider(object):
         """
         raise NotImplementedError
 
+    def lookup_many(self, uris):
+        """
+        Lookup several URIs at once.
+
+        Used by :meth:`mopidy.core.LibraryController.lookup`, so that all the
+        URIs handled by a backend are looked up with one call to the backend.
+        The default implementation calls :meth:`lookup` for each URI, and maps
+        any URI whose lookup raises an exception to an empty list, so one bad
+        URI does not fail the lookup of the others.
+
+        *MAY be implemented by subclass* to look up the URIs more efficiently,
+        e.g. with a single database query.
+
+        :param uris: track URIs
+        :type uris: list of string
+        :rtype: {uri: list of :class:`mopidy.models.Track`}
+
+        .. versionadded:: 3.0
+        """
+        result = {}
+        for uri in uris:
+            try:
+                result[uri] = self.lookup(uri)
+            except Exception:
+                logger.exception(
+                    '%s caused an exception looking up %s.',
+                    self.__class__.__name__, uri)
+                result[uri] = []
+        return result
+
     def refresh(self, uri=None):
         """
         See :meth:`mopidy.core.LibraryController.refresh`.
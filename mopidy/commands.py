@@ -13,7 +13,8 @@ import pykka
 from mopidy import config as config_lib, exceptions
 from mopidy.audio import Audio
 from mopidy.core import Core
-from mopidy.internal import deps, process, timer, versioning
+from mopidy.internal import (
+    deps, metrics, process, profiler, timer, versioning)
 from mopidy.internal.gi import GLib
 
 logger = logging.getLogger(__name__)
@@ -292,6 +293,12 @@ class RootCommand(Command):
         GLib.unix_signal_add(
             GLib.PRIORITY_DEFAULT, signal.SIGTERM, on_sigterm, loop)
 
+        metrics.registry.enabled = config['core']['metrics']
+        profiler.profiler.output_dir = config['core']['cache_dir']
+        profiler.profiler.duration = config['core']['profile_duration']
+        if config['core']['profile_at_startup']:
+            profiler.profiler.start()
+
         mixer_class = self.get_mixer_class(config, args.registry['mixer'])
         backend_classes = args.registry['backend']
         frontend_classes = args.registry['frontend']
@@ -328,6 +335,7 @@ class RootCommand(Command):
             if mixer_class is not None:
                 self.stop_mixer(mixer_class)
             process.stop_remaining_actors()
+            profiler.profiler.stop()
             return exit_status_code
 
     def get_mixer_class(self, config, mixer_classes):
@@ -25,6 +25,13 @@ _core_schema['data_dir'] = Path()
 # MPD supports at most 10k tracks, some clients segfault when this is exceeded.
 _core_schema['max_tracklist_length'] = Integer(minimum=1)
 _core_schema['restore_state'] = Boolean(optional=True)
+_core_schema['state_checkpoint_interval'] = Integer(minimum=1)
+_core_schema['max_history_length'] = Integer(minimum=0)
+_core_schema['search_timeout'] = Integer(minimum=1, optional=True)
+_core_schema['backend_search_timeouts'] = List(optional=True)
+_core_schema['metrics'] = Boolean()
+_core_schema['profile_duration'] = Integer(minimum=1)
+_core_schema['profile_at_startup'] = Boolean()
 
 _logging_schema = ConfigSchema('logging')
 _logging_schema['color'] = Boolean()
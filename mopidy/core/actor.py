@@ -1,29 +1,33 @@
 from __future__ import absolute_import, unicode_literals
 
 import collections
+import inspect
 import itertools
 import logging
 import os
+import threading
 
 import pykka
 
 import mopidy
 from mopidy import audio, backend, mixer
 from mopidy.audio import PlaybackState
-from mopidy.core.history import HistoryController
+from mopidy.core.history import DEFAULT_MAX_LENGTH, HistoryController
 from mopidy.core.library import LibraryController
 from mopidy.core.listener import CoreListener
 from mopidy.core.mixer import MixerController
 from mopidy.core.playback import PlaybackController
 from mopidy.core.playlists import PlaylistsController
 from mopidy.core.tracklist import TracklistController
-from mopidy.internal import path, storage, validation, versioning
+from mopidy.internal import metrics, path, storage, validation, versioning
 from mopidy.internal.deprecation import deprecated_property
 from mopidy.internal.models import CoreState
 
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CHECKPOINT_INTERVAL = 60
+
 
 class Core(
         pykka.ThreadingActor, audio.AudioListener, backend.BackendListener,
@@ -54,16 +58,33 @@ class Core(
 
         self.backends = Backends(backends)
 
-        self.library = LibraryController(backends=self.backends, core=self)
-        self.history = HistoryController()
+        self.library = LibraryController(
+            backends=self.backends, core=self,
+            search_timeout=self._get_config_value('search_timeout', None),
+            backend_search_timeouts=self._get_config_value(
+                'backend_search_timeouts', None))
+        self.history = HistoryController(
+            max_length=self._get_config_value(
+                'max_history_length', DEFAULT_MAX_LENGTH))
         self.mixer = MixerController(mixer=mixer)
         self.playback = PlaybackController(
             audio=audio, backends=self.backends, core=self)
         self.playlists = PlaylistsController(backends=self.backends, core=self)
         self.tracklist = TracklistController(core=self)
 
+        metrics.registry.instrument(
+            self, 'core', ['get_uri_schemes', 'get_version'])
+        for controller in [
+                self.library, self.history, self.mixer, self.playback,
+                self.playlists, self.tracklist]:
+            metrics.registry.instrument(
+                controller, 'core', _get_public_methods(controller))
+
         self.audio = audio
 
+        self._checkpoint_interval = None
+        self._checkpoint_timer = None
+
     def get_uri_schemes(self):
         """Get list of URI schemes we can handle"""
         futures = [b.uri_schemes for b in self.backends]
@@ -118,10 +139,12 @@ class Core(
     def volume_changed(self, volume):
         # Forward event from mixer to frontends
         CoreListener.send('volume_changed', volume=volume)
+        self._schedule_checkpoint()
 
     def mute_changed(self, mute):
         # Forward event from mixer to frontends
         CoreListener.send('mute_changed', mute=mute)
+        self._schedule_checkpoint()
 
     def tags_changed(self, tags):
         if not self.audio or 'title' not in tags:
@@ -148,19 +171,71 @@ class Core(
                     coverage = ['tracklist', 'mode', 'play-last', 'mixer',
                                 'history']
             if len(coverage):
+                self._checkpoint_interval = self._get_config_value(
+                    'state_checkpoint_interval', DEFAULT_CHECKPOINT_INTERVAL)
                 self._load_state(coverage)
+                # Replace the state file deleted by _load_state() right away.
+                self._save_state()
         except Exception as e:
             logger.warn('Restore state: Unexpected error: %s', str(e))
 
     def teardown(self):
         """Do not call this function. It is for internal use at shutdown."""
+        self._checkpoint_interval = None
+        if self._checkpoint_timer is not None:
+            self._checkpoint_timer.cancel()
+            self._checkpoint_timer = None
         try:
             if self._config and 'restore_state' in self._config['core']:
                 if self._config['core']['restore_state']:
+                    logger.info('Saving state')
                     self._save_state()
         except Exception as e:
             logger.warn('Unexpected error while saving state: %s', str(e))
 
+    def _schedule_checkpoint(self):
+        """
+        Save the state after a delay, unless already scheduled.
+
+        Changes made while waiting are included in the same checkpoint. While
+        playing, a new checkpoint is scheduled after every checkpoint to keep
+        the saved playback position up to date.
+        """
+        if not self._checkpoint_interval or self._checkpoint_timer:
+            return
+        self._checkpoint_timer = threading.Timer(
+            self._checkpoint_interval, self._on_checkpoint_timeout)
+        self._checkpoint_timer.daemon = True
+        self._checkpoint_timer.start()
+
+    def _on_checkpoint_timeout(self):
+        # Runs in the timer thread, so hand over to the actor thread.
+        try:
+            self.actor_ref.tell({
+                'command': 'pykka_call',
+                'attr_path': ('_checkpoint',),
+                'args': (),
+                'kwargs': {},
+            })
+        except pykka.ActorDeadError:
+            pass
+
+    def _checkpoint(self):
+        self._checkpoint_timer = None
+        if not self._checkpoint_interval:
+            return
+        try:
+            self._save_state()
+        except Exception as e:
+            logger.warning('Saving state checkpoint failed: %s', str(e))
+        if self.playback.get_state() == PlaybackState.PLAYING:
+            self._schedule_checkpoint()
+
+    def _get_config_value(self, key, default):
+        if self._config and key in self._config['core']:
+            return self._config['core'][key]
+        return default
+
     def _get_data_dir(self):
         # get or create data director for core
         data_dir_path = os.path.join(self._config['core']['data_dir'], b'core')
@@ -173,7 +248,7 @@ class Core(
         """
 
         file_name = os.path.join(self._get_data_dir(), b'state.json.gz')
-        logger.info('Saving state to %s', file_name)
+        logger.debug('Saving state to %s', file_name)
 
         data = {}
         data['version'] = mopidy.__version__
@@ -183,6 +258,8 @@ class Core(
             playback=self.playback._save_state(),
             mixer=self.mixer._save_state())
         storage.dump(file_name, data)
+        # The changes logged since the last save are now in the state file.
+        self.tracklist._clear_journal()
         logger.debug('Saving state done')
 
     def _load_state(self, coverage):
@@ -214,17 +291,30 @@ class Core(
         except OSError:
             logger.info('Failed to delete %s', file_name)
 
-        if 'state' in data:
-            core_state = data['state']
-            validation.check_instance(core_state, CoreState)
-            self.history._load_state(core_state.history, coverage)
-            self.tracklist._load_state(core_state.tracklist, coverage)
-            self.mixer._load_state(core_state.mixer, coverage)
-            # playback after tracklist
-            self.playback._load_state(core_state.playback, coverage)
+        if 'tracklist' in coverage:
+            self.tracklist._setup_journal(
+                os.path.join(self._get_data_dir(), b'tracklist.jsonl'))
+
+        core_state = data.get('state', CoreState())
+        validation.check_instance(core_state, CoreState)
+        self.history._load_state(core_state.history, coverage)
+        self.tracklist._load_state(core_state.tracklist, coverage)
+        self.mixer._load_state(core_state.mixer, coverage)
+        # playback after tracklist
+        self.playback._load_state(core_state.playback, coverage)
+
+        if 'history' in coverage:
+            self.history._setup_journal(
+                os.path.join(self._get_data_dir(), b'history.jsonl'))
         logger.debug('Loading state done')
 
 
+def _get_public_methods(obj):
+    return [
+        name for name, _ in inspect.getmembers(type(obj), inspect.ismethod)
+        if not name.startswith('_')]
+
+
 class Backends(list):
 
     def __init__(self, backends):
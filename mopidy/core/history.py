@@ -1,20 +1,27 @@
 from __future__ import absolute_import, unicode_literals
 
-import copy
+import collections
+import itertools
 import logging
 import time
 
 from mopidy import models
+from mopidy.internal import storage, validation
 from mopidy.internal.models import HistoryState, HistoryTrack
 
 logger = logging.getLogger(__name__)
 
+# 500 tracks a 3 minutes -> 24 hours history
+DEFAULT_MAX_LENGTH = 500
+
 
 class HistoryController(object):
     pykka_traversable = True
 
-    def __init__(self):
-        self._history = []
+    def __init__(self, max_length=DEFAULT_MAX_LENGTH):
+        self._max_length = max_length
+        self._history = collections.deque(maxlen=max_length)
+        self._journal = None
 
     def _add_track(self, track):
         """Add track to the playback history.
@@ -38,7 +45,12 @@ class HistoryController(object):
         name = ' - '.join(name_parts)
         ref = models.Ref.track(uri=track.uri, name=name)
 
-        self._history.insert(0, (timestamp, ref))
+        self._history.appendleft((timestamp, ref))
+
+        if self._journal is not None:
+            self._journal.append(HistoryTrack(timestamp=timestamp, track=ref))
+            if self._journal.size > 2 * self._max_length:
+                self._compact_journal()
 
     def get_length(self):
         """Get the number of tracks in the history.
@@ -48,30 +60,64 @@ class HistoryController(object):
         """
         return len(self._history)
 
-    def get_history(self):
+    def get_history(self, offset=0, limit=None):
         """Get the track history.
 
-        The timestamps are milliseconds since epoch.
+        The timestamps are milliseconds since epoch. The most recently played
+        track comes first.
 
+        :param offset: number of the most recent tracks to skip
+        :type offset: int
+        :param limit: maximum number of tracks to return, or :class:`None` to
+            return all remaining tracks
+        :type limit: int or :class:`None`
         :returns: the track history
         :rtype: list of (timestamp, :class:`mopidy.models.Ref`) tuples
+
+        .. versionadded:: 3.0
+            The ``offset`` and ``limit`` arguments.
+        """
+        validation.check_integer(offset, min=0)
+        limit is None or validation.check_integer(limit, min=0)
+
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(self._history, offset, stop))
+
+    def _setup_journal(self, path):
+        """Persist history changes to an append-only journal at ``path``.
+
+        Entries already in the journal which are newer than the current
+        history are restored first.
+
+        Internal method for :class:`mopidy.core.Core`.
         """
-        return copy.copy(self._history)
+        self._journal = storage.Journal(path)
+
+        known = set(self._history)
+        newest = self._history[0][0] if self._history else None
+        for entry in self._journal.load():
+            if not isinstance(entry, HistoryTrack):
+                continue
+            item = (entry.timestamp, entry.track)
+            if item in known:
+                continue
+            if newest is None or entry.timestamp >= newest:
+                self._history.appendleft(item)
+
+        self._compact_journal()
+
+    def _compact_journal(self):
+        self._journal.rewrite([
+            HistoryTrack(timestamp=timestamp, track=track)
+            for timestamp, track in reversed(self._history)])
 
     def _save_state(self):
-        # 500 tracks a 3 minutes -> 24 hours history
-        count_max = 500
-        count = 1
-        history_list = []
-        for timestamp, track in self._history:
-            history_list.append(
-                HistoryTrack(timestamp=timestamp, track=track))
-            count += 1
-            if count_max < count:
-                logger.info('Limiting history to %s tracks', count_max)
-                break
-        return HistoryState(history=history_list)
+        return HistoryState(history=[
+            HistoryTrack(timestamp=timestamp, track=track)
+            for timestamp, track in self._history])
 
     def _load_state(self, state, coverage):
         if state and 'history' in coverage:
-            self._history = [(h.timestamp, h.track) for h in state.history]
+            self._history.clear()
+            self._history.extend(
+                (h.timestamp, h.track) for h in state.history)
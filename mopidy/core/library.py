@@ -4,10 +4,13 @@ import collections
 import contextlib
 import logging
 import operator
+import time
+
+import pykka
 
 from mopidy import compat, exceptions, models
 from mopidy.compat import urllib
-from mopidy.internal import deprecation, validation
+from mopidy.internal import deprecation, metrics, validation
 
 
 logger = logging.getLogger(__name__)
@@ -30,9 +33,31 @@ def _backend_error_handling(backend, reraise=None):
 class LibraryController(object):
     pykka_traversable = True
 
-    def __init__(self, backends, core):
+    def __init__(
+            self, backends, core, search_timeout=None,
+            backend_search_timeouts=None):
         self.backends = backends
         self.core = core
+        self._search_timeout = search_timeout
+        self._backend_search_timeouts = {}
+        for entry in backend_search_timeouts or []:
+            uri_scheme, _, timeout = entry.partition('|')
+            try:
+                self._backend_search_timeouts[uri_scheme.strip()] = int(
+                    timeout)
+            except ValueError:
+                logger.warning(
+                    'Ignoring invalid core/backend_search_timeouts entry: '
+                    '%s', entry)
+
+    def _get_search_timeout(self, backend):
+        timeouts = [
+            self._backend_search_timeouts[uri_scheme]
+            for uri_scheme, b in self.backends.with_library.items()
+            if b == backend and uri_scheme in self._backend_search_timeouts]
+        if timeouts:
+            return max(timeouts)
+        return self._search_timeout
 
     def _get_backend(self, uri):
         uri_scheme = urllib.parse.urlparse(uri).scheme
@@ -226,20 +251,26 @@ class LibraryController(object):
         futures = {}
         results = {u: [] for u in uris}
 
-        # TODO: lookup(uris) to backend APIs
         for backend, backend_uris in self._get_backends_to_uris(uris).items():
             if backend_uris:
-                for u in backend_uris:
-                    futures[(backend, u)] = backend.library.lookup(u)
+                futures[backend] = (
+                    backend_uris, backend.library.lookup_many(backend_uris))
 
-        for (backend, u), future in futures.items():
+        for backend, (backend_uris, future) in futures.items():
+            tracks_map = {}
             with _backend_error_handling(backend):
                 result = future.get()
                 if result is not None:
-                    validation.check_instances(result, models.Track)
-                    # TODO Consider making Track.uri field mandatory, and
-                    # then remove this filtering of tracks without URIs.
-                    results[u] = [r for r in result if r.uri]
+                    validation.check_instance(result, dict)
+                    tracks_map = result
+            for u in backend_uris:
+                with _backend_error_handling(backend):
+                    tracks = tracks_map.get(u)
+                    if tracks is not None:
+                        validation.check_instances(tracks, models.Track)
+                        # TODO Consider making Track.uri field mandatory, and
+                        # then remove this filtering of tracks without URIs.
+                        results[u] = [t for t in tracks if t.uri]
 
         if uri:
             return results[uri]
@@ -299,6 +330,10 @@ class LibraryController(object):
             # Returns results matching artist 'xyz' and 'abc' in any backend
             search({'artist': ['xyz', 'abc']})
 
+        Backends which haven't returned their results within
+        :confval:`core/search_timeout`, or their timeout in
+        :confval:`core/backend_search_timeouts`, are left out of the results.
+
         :param query: one or more queries to search for
         :type query: dict
         :param uris: zero or more URI roots to limit the search to
@@ -341,11 +376,21 @@ class LibraryController(object):
         # to the backends.
         reraise = (TypeError, LookupError)
 
+        start = time.time()
         results = []
         for backend, future in futures.items():
             try:
                 with _backend_error_handling(backend, reraise=reraise):
-                    result = future.get()
+                    timeout = self._get_search_timeout(backend)
+                    if timeout is None:
+                        result = future.get()
+                    else:
+                        try:
+                            result = future.get(timeout=max(
+                                0, start + timeout / 1000.0 - time.time()))
+                        except pykka.Timeout:
+                            self._log_search_timeout(backend, start, timeout)
+                            continue
                     if result is not None:
                         validation.check_instance(result, models.SearchResult)
                         results.append(result)
@@ -357,6 +402,16 @@ class LibraryController(object):
 
         return results
 
+    def _log_search_timeout(self, backend, start, timeout):
+        backend_name = backend.actor_ref.actor_class.__name__
+        logger.warning(
+            '%s did not return search results within %d ms, returning the '
+            'results of the other backends.', backend_name, timeout)
+        if metrics.registry.enabled:
+            metrics.registry.observe(
+                'core', 'library.search.timeout.%s' % backend_name,
+                time.time() - start)
+
 
 def _normalize_query(query):
     broken_client = False
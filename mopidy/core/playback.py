@@ -124,6 +124,7 @@ class PlaybackController(object):
         logger.debug('Changing state: %s -> %s', old_state, new_state)
 
         self._trigger_playback_state_changed(old_state, new_state)
+        self.core._schedule_checkpoint()
 
     state = deprecation.deprecated_property(get_state, set_state)
     """
@@ -580,6 +581,7 @@ class PlaybackController(object):
         self.core.tracklist._mark_playing(tl_track)
         self.core.history._add_track(tl_track.track)
         listener.CoreListener.send('track_playback_started', tl_track=tl_track)
+        self.core._schedule_checkpoint()
 
     def _trigger_track_playback_ended(self, time_position_before_stop):
         tl_track = self.get_current_tl_track()
@@ -608,6 +610,7 @@ class PlaybackController(object):
         # TODO: Trigger this from audio events?
         logger.debug('Triggering seeked event')
         listener.CoreListener.send('seeked', time_position=time_position)
+        self.core._schedule_checkpoint()
 
     def _save_state(self):
         return models.PlaybackState(
@@ -1,17 +1,26 @@
 from __future__ import absolute_import, unicode_literals
 
+import collections
 import logging
 import random
 
 from mopidy import exceptions
 from mopidy.core import listener
-from mopidy.internal import deprecation, validation
-from mopidy.internal.models import TracklistState
+from mopidy.internal import deprecation, storage, validation
+from mopidy.internal.models import TracklistEntry, TracklistState
 from mopidy.models import TlTrack, Track
 
 logger = logging.getLogger(__name__)
 
 
+def _move(items, start, end, to_position):
+    moved = items[:start] + items[end:]
+    for item in items[start:end]:
+        moved.insert(to_position, item)
+        to_position += 1
+    return moved
+
+
 class TracklistController(object):
     pykka_traversable = True
 
@@ -23,6 +32,11 @@ class TracklistController(object):
 
         self._shuffled = []
 
+        # TLIDs of the tracks which were looked up in the library when added.
+        # Their metadata is not saved, but looked up again on restore.
+        self._library_tlids = set()
+        self._journal = None
+
     # Properties
 
     def get_tl_tracks(self):
@@ -68,6 +82,7 @@ class TracklistController(object):
         self._version += 1
         self.core.playback._on_tracklist_change()
         self._trigger_tracklist_changed()
+        self.core._schedule_checkpoint()
 
     version = deprecation.deprecated_property(get_version)
     """
@@ -427,6 +442,7 @@ class TracklistController(object):
         if uri:
             deprecation.warn('core.tracklist.add:uri_arg')
 
+        from_library = tracks is None
         if tracks is None:
             if uri is not None:
                 uris = [uri]
@@ -438,6 +454,7 @@ class TracklistController(object):
 
         tl_tracks = []
         max_length = self.core._config['core']['max_tracklist_length']
+        position = at_position
 
         for track in tracks:
             if self.get_length() >= max_length:
@@ -454,6 +471,12 @@ class TracklistController(object):
             tl_tracks.append(tl_track)
 
         if tl_tracks:
+            if from_library:
+                self._library_tlids.update(t.tlid for t in tl_tracks)
+            self._record(
+                'add', at_position=position,
+                entries=self._get_entries(tl_tracks),
+                tracks=self._get_unresolved_tracks(tl_tracks))
             self._increase_version()
 
         return tl_tracks
@@ -465,6 +488,8 @@ class TracklistController(object):
         Triggers the :meth:`mopidy.core.CoreListener.tracklist_changed` event.
         """
         self._tl_tracks = []
+        self._library_tlids.clear()
+        self._record('clear')
         self._increase_version()
 
     def filter(self, criteria=None, **kwargs):
@@ -539,11 +564,8 @@ class TracklistController(object):
         assert to_position <= len(tl_tracks), \
             'to_position can not be larger than tracklist length'
 
-        new_tl_tracks = tl_tracks[:start] + tl_tracks[end:]
-        for tl_track in tl_tracks[start:end]:
-            new_tl_tracks.insert(to_position, tl_track)
-            to_position += 1
-        self._tl_tracks = new_tl_tracks
+        self._tl_tracks = _move(tl_tracks, start, end, to_position)
+        self._record('move', start=start, end=end, to_position=to_position)
         self._increase_version()
 
     def remove(self, criteria=None, **kwargs):
@@ -568,6 +590,9 @@ class TracklistController(object):
         for tl_track in tl_tracks:
             position = self._tl_tracks.index(tl_track)
             del self._tl_tracks[position]
+            self._library_tlids.discard(tl_track.tlid)
+        if tl_tracks:
+            self._record('remove', tlids=[t.tlid for t in tl_tracks])
         self._increase_version()
         return tl_tracks
 
@@ -601,6 +626,7 @@ class TracklistController(object):
         after = tl_tracks[end or len(tl_tracks):]
         random.shuffle(shuffled)
         self._tl_tracks = before + shuffled + after
+        self._record('order', tlids=[t.tlid for t in self._tl_tracks])
         self._increase_version()
 
     def slice(self, start, end):
@@ -650,10 +676,131 @@ class TracklistController(object):
     def _trigger_options_changed(self):
         logger.debug('Triggering options changed event')
         listener.CoreListener.send('options_changed')
+        self.core._schedule_checkpoint()
+
+    def _get_entries(self, tl_tracks):
+        return [TracklistEntry(tlid=t.tlid, uri=t.track.uri)
+                for t in tl_tracks]
+
+    def _get_unresolved_tracks(self, tl_tracks):
+        tracks = collections.OrderedDict()
+        for tl_track in tl_tracks:
+            if tl_track.tlid not in self._library_tlids:
+                tracks.setdefault(tl_track.track.uri, tl_track.track)
+        return list(tracks.values())
+
+    def _setup_journal(self, path):
+        """Log tracklist changes to an append-only journal at ``path``.
+
+        The journal is replayed on top of the saved state by
+        :meth:`_load_state`, and is cleared by :meth:`_clear_journal` when the
+        state has been saved again.
+
+        Internal method for :class:`mopidy.core.Core`.
+        """
+        self._journal = storage.Journal(path)
+
+    def _clear_journal(self):
+        """Internal method for :class:`mopidy.core.Core`."""
+        if self._journal is not None:
+            self._journal.clear()
+
+    def _record(self, op, **kwargs):
+        # Called right before _increase_version(), so the record is tagged
+        # with the version it results in.
+        if self._journal is not None:
+            kwargs.update(op=op, version=self._version + 1)
+            self._journal.append(kwargs)
+
+    def _replay(self, entries, tracks, record):
+        op = record['op']
+        if op == 'add':
+            tracks.update((t.uri, t) for t in record['tracks'])
+            if record['at_position'] is None:
+                entries.extend(record['entries'])
+            else:
+                position = record['at_position']
+                entries[position:position] = record['entries']
+        elif op == 'clear':
+            del entries[:]
+        elif op == 'move':
+            entries[:] = _move(
+                entries, record['start'], record['end'],
+                record['to_position'])
+        elif op == 'remove':
+            tlids = set(record['tlids'])
+            entries[:] = [e for e in entries if e.tlid not in tlids]
+        elif op == 'order':
+            by_tlid = {e.tlid: e for e in entries}
+            entries[:] = [
+                by_tlid[tlid] for tlid in record['tlids'] if tlid in by_tlid]
+        else:
+            raise ValueError('Unknown operation: %r' % op)
+
+    def _resolve(self, entries, tracks):
+        uris = collections.OrderedDict(
+            (e.uri, None) for e in entries
+            if e.uri is not None and e.uri not in tracks)
+        found = {}
+        if uris:
+            results = self.core.library.lookup(uris=list(uris))
+            for uri, result in results.items():
+                matches = [t for t in result if t.uri == uri] or result
+                if matches:
+                    found[uri] = matches[0]
+
+        tl_tracks = []
+        for entry in entries:
+            if entry.uri in tracks:
+                track = tracks[entry.uri]
+            elif entry.uri in found:
+                track = found[entry.uri]
+                self._library_tlids.add(entry.tlid)
+            else:
+                logger.debug(
+                    'Restoring tracklist: Lookup of %s failed', entry.uri)
+                track = Track(uri=entry.uri)
+            tl_tracks.append(TlTrack(entry.tlid, track))
+        return tl_tracks
+
+    def _restore_tracklist(self, state):
+        # State files written by older versions store complete tracks.
+        entries = self._get_entries(state.tl_tracks) + list(state.entries)
+        tracks = {t.track.uri: t.track for t in state.tl_tracks}
+        tracks.update((t.uri, t) for t in state.tracks)
+        version = state.version or 0
+
+        records = []
+        if self._journal is not None:
+            records = [
+                r for r in self._journal.load()
+                if isinstance(r, dict) and r.get('version', 0) > version]
+        for record in records:
+            try:
+                self._replay(entries, tracks, record)
+            except (KeyError, IndexError, TypeError, ValueError) as exc:
+                logger.warning(
+                    'Restoring tracklist: Ignoring journal from version '
+                    '%s on: %r', record.get('version'), exc)
+                break
+            version = record['version']
+
+        if not entries and not records:
+            return
+
+        self._library_tlids.clear()
+        self._tl_tracks = self._resolve(entries, tracks)
+        self._next_tlid = max(
+            [state.next_tlid or 0, self._next_tlid] +
+            [e.tlid + 1 for e in entries])
+        self._version = max(version, self._version)
+        self._increase_version()
 
     def _save_state(self):
         return TracklistState(
-            tl_tracks=self._tl_tracks,
+            version=self._version,
+            entries=self._get_entries(self._tl_tracks),
+            tracks=self._get_unresolved_tracks(self._tl_tracks),
             next_tlid=self._next_tlid,
             consume=self.get_consume(),
             random=self.get_random(),
@@ -661,13 +808,10 @@ class TracklistController(object):
             single=self.get_single())
 
     def _load_state(self, state, coverage):
-        if state:
-            if 'mode' in coverage:
-                self.set_consume(state.consume)
-                self.set_random(state.random)
-                self.set_repeat(state.repeat)
-                self.set_single(state.single)
-            if 'tracklist' in coverage:
-                self._next_tlid = max(state.next_tlid, self._next_tlid)
-                self._tl_tracks = list(state.tl_tracks)
-                self._increase_version()
+        if state and 'mode' in coverage:
+            self.set_consume(state.consume)
+            self.set_random(state.random)
+            self.set_repeat(state.repeat)
+            self.set_single(state.single)
+        if coverage and 'tracklist' in coverage:
+            self._restore_tracklist(state or TracklistState())
@@ -71,7 +71,7 @@ class Extension(object):
         """
         assert cls.ext_name is not None
         cache_dir_path = bytes(os.path.join(config['core']['cache_dir'],
-                                            cls.ext_name))
+                                            bytes(cls.ext_name)))
         path.get_or_create_dir(cache_dir_path)
         return cache_dir_path
 
@@ -84,7 +84,7 @@ class Extension(object):
         """
         assert cls.ext_name is not None
         config_dir_path = bytes(os.path.join(config['core']['config_dir'],
-                                             cls.ext_name))
+                                             bytes(cls.ext_name)))
         path.get_or_create_dir(config_dir_path)
         return config_dir_path
 
@@ -99,7 +99,7 @@ class Extension(object):
         """
         assert cls.ext_name is not None
         data_dir_path = bytes(os.path.join(config['core']['data_dir'],
-                                           cls.ext_name))
+                                           bytes(cls.ext_name)))
         path.get_or_create_dir(data_dir_path)
         return data_dir_path
 
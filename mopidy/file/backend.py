@@ -1,11 +1,13 @@
 from __future__ import absolute_import, unicode_literals
 
 import logging
+import os
 
 import pykka
 
 from mopidy import backend
-from mopidy.file import library
+from mopidy.file import Extension, library
+from mopidy.internal import encoding
 
 
 logger = logging.getLogger(__name__)
@@ -16,6 +18,22 @@ class FileBackend(pykka.ThreadingActor, backend.Backend):
 
     def __init__(self, config, audio):
         super(FileBackend, self).__init__()
+        self._config = config
         self.library = library.FileLibraryProvider(backend=self, config=config)
         self.playback = backend.PlaybackProvider(audio=audio, backend=self)
         self.playlists = None
+
+    def on_start(self):
+        self.library.metadata_cache.load(self._get_cache_file())
+
+    def on_stop(self):
+        try:
+            self.library.metadata_cache.save(self._get_cache_file())
+        except EnvironmentError as e:
+            logger.warning(
+                'Saving file metadata cache failed: %s',
+                encoding.locale_decode(e))
+
+    def _get_cache_file(self):
+        return os.path.join(
+            Extension.get_cache_dir(self._config), b'metadata.json.gz')
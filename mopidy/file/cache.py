@@ -0,0 +1,58 @@
+from __future__ import absolute_import, unicode_literals
+
+import logging
+
+from mopidy.internal import storage
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+
+class MetadataCache(object):
+
+    """
+    Cache of the tracks found when scanning files.
+
+    Tracks are kept with the size and modification time the file had when it
+    was scanned, and are only used while the file still has both.
+
+    :param size: maximum number of files to keep tracks for
+    :type size: int
+    """
+
+    def __init__(self, size=10000):
+        self._entries = storage.LruCache(size, version=FORMAT_VERSION)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, uri, file_size, mtime):
+        """
+        Get the cached track for the file at ``uri``.
+
+        :returns: the track, or :class:`None` if there is no track for the
+            file with the given size and modification time
+        """
+        entry = self._entries.get(uri)
+        if entry is None:
+            return None
+        if (entry['size'], entry['mtime']) != (file_size, mtime):
+            self._entries.remove(uri)
+            return None
+        return entry['track']
+
+    def put(self, uri, file_size, mtime, track):
+        """Cache the track found when scanning the file at ``uri``."""
+        self._entries.put(
+            uri, {'size': file_size, 'mtime': mtime, 'track': track})
+
+    def load(self, path):
+        """Load the entries saved to ``path``."""
+        self._entries.load(path)
+        logger.debug('Loaded %d cached file lookups', len(self._entries))
+
+    def save(self, path):
+        """Save the entries to ``path``, if they have changed."""
+        if self._entries.changed:
+            self._entries.save(path)
@@ -1,5 +1,6 @@
 from __future__ import unicode_literals
 
+import collections
 import logging
 import os
 import sys
@@ -7,12 +8,24 @@ import urllib2
 
 from mopidy import backend, exceptions, models
 from mopidy.audio import scan, tags
+from mopidy.file import cache
 from mopidy.internal import path
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 
 logger = logging.getLogger(__name__)
 FS_ENCODING = sys.getfilesystemencoding()
 
+# Number of directories to remember the contents of.
+BROWSE_CACHE_SIZE = 100
+
 
 class FileLibraryProvider(backend.LibraryProvider):
     """Library for browsing local files."""
@@ -38,13 +51,14 @@ class FileLibraryProvider(backend.LibraryProvider):
             bytes(file_ext.lower())
             for file_ext in config['file']['excluded_file_extensions'])
         self._follow_symlinks = config['file']['follow_symlinks']
+        self._browse_cache = collections.OrderedDict()
+        self.metadata_cache = cache.MetadataCache()
 
-        self._scanner = scan.Scanner(
-            timeout=config['file']['metadata_timeout'])
+        self._scanner = scan.get_service(proxy_config=config['proxy'])
+        self._scan_timeout = config['file']['metadata_timeout']
 
     def browse(self, uri):
         logger.debug('Browsing files at: %s', uri)
-        result = []
         local_path = path.uri_to_path(uri)
 
         if local_path == 'root':
@@ -56,30 +70,51 @@ class FileLibraryProvider(backend.LibraryProvider):
                 'in file/media_dirs config.', uri)
             return []
 
-        for dir_entry in os.listdir(local_path):
-            child_path = os.path.join(local_path, dir_entry)
-            uri = path.path_to_uri(child_path)
-
-            if not self._show_dotfiles and dir_entry.startswith(b'.'):
+        # The contents of a directory are cached until its modification time
+        # changes, which happens when entries are added, removed or renamed.
+        mtime = os.stat(local_path).st_mtime
+        cached = self._browse_cache.pop(local_path, None)
+        if cached is not None and cached[0] == mtime:
+            self._browse_cache[local_path] = cached
+            return list(cached[1])
+
+        result = self._list_dir(local_path)
+        if not path.is_recently_modified(mtime):
+            self._browse_cache[local_path] = (mtime, result)
+            while len(self._browse_cache) > BROWSE_CACHE_SIZE:
+                self._browse_cache.popitem(last=False)
+        return list(result)
+
+    def _list_dir(self, local_path):
+        result = []
+        for dir_entry in _scandir(local_path):
+            if not self._show_dotfiles and dir_entry.name.startswith(b'.'):
                 continue
 
             if (self._excluded_file_extensions and
-                    dir_entry.endswith(self._excluded_file_extensions)):
+                    dir_entry.name.endswith(self._excluded_file_extensions)):
                 continue
 
-            if os.path.islink(child_path) and not self._follow_symlinks:
-                logger.debug('Ignoring symlink: %s', uri)
-                continue
-
-            if not self._is_in_basedir(os.path.realpath(child_path)):
-                logger.debug('Ignoring symlink to outside base dir: %s', uri)
-                continue
-
-            name = dir_entry.decode(FS_ENCODING, 'replace')
-            if os.path.isdir(child_path):
-                result.append(models.Ref.directory(name=name, uri=uri))
-            elif os.path.isfile(child_path):
-                result.append(models.Ref.track(name=name, uri=uri))
+            # Entries which aren't symlinks are inside the base dir, as the
+            # directory they're in is.
+            if dir_entry.is_symlink():
+                uri = path.path_to_uri(dir_entry.path)
+                if not self._follow_symlinks:
+                    logger.debug('Ignoring symlink: %s', uri)
+                    continue
+
+                if not self._is_in_basedir(os.path.realpath(dir_entry.path)):
+                    logger.debug(
+                        'Ignoring symlink to outside base dir: %s', uri)
+                    continue
+
+            name = dir_entry.name.decode(FS_ENCODING, 'replace')
+            if dir_entry.is_dir():
+                result.append(models.Ref.directory(
+                    name=name, uri=path.path_to_uri(dir_entry.path)))
+            elif dir_entry.is_file():
+                result.append(models.Ref.track(
+                    name=name, uri=path.path_to_uri(dir_entry.path)))
 
         def order(item):
             return (item.type != models.Ref.DIRECTORY, item.name)
@@ -88,23 +123,70 @@ class FileLibraryProvider(backend.LibraryProvider):
         return result
 
     def lookup(self, uri):
-        logger.debug('Looking up file URI: %s', uri)
-        local_path = path.uri_to_path(uri)
-
+        return self.lookup_many([uri])[uri]
+
+    def lookup_many(self, uris):
+        """
+        Lookup the given URIs.
+
+        Tracks for files that haven't changed since they were last scanned
+        are taken from the metadata cache. The remaining files are scanned in
+        parallel.
+
+        :param uris: track URIs
+        :type uris: list of string
+        :rtype: {uri: list of :class:`mopidy.models.Track`}
+        """
+        results = {}
+        pending = []
+        for uri in uris:
+            if uri in results:
+                continue
+            logger.debug('Looking up file URI: %s', uri)
+            stat = self._stat(path.uri_to_path(uri))
+            track = None
+            if stat is not None:
+                track = self.metadata_cache.get(
+                    uri, stat.st_size, stat.st_mtime)
+            if track is not None:
+                results[uri] = [track]
+            else:
+                results[uri] = None
+                pending.append((uri, stat, self._scanner.scan_async(
+                    uri, timeout=self._scan_timeout)))
+
+        for uri, stat, future in pending:
+            try:
+                result = future.get()
+                track = tags.convert_tags_to_track(result.tags).copy(
+                    uri=uri, length=result.duration)
+            except exceptions.ScannerError as e:
+                logger.warning('Failed looking up %s: %s', uri, e)
+                track = models.Track(uri=uri)
+                stat = None  # Don't cache failures, they may be temporary.
+
+            # A file modified just before it was scanned may be modified again
+            # without its size and modification time changing.
+            if stat is not None and path.is_recently_modified(stat.st_mtime):
+                stat = None
+
+            if not track.name:
+                filename = os.path.basename(path.uri_to_path(uri))
+                name = urllib2.unquote(filename).decode(FS_ENCODING, 'replace')
+                track = track.copy(name=name)
+
+            if stat is not None:
+                self.metadata_cache.put(
+                    uri, stat.st_size, stat.st_mtime, track)
+            results[uri] = [track]
+
+        return results
+
+    def _stat(self, local_path):
         try:
-            result = self._scanner.scan(uri)
-            track = tags.convert_tags_to_track(result.tags).copy(
-                uri=uri, length=result.duration)
-        except exceptions.ScannerError as e:
-            logger.warning('Failed looking up %s: %s', uri, e)
-            track = models.Track(uri=uri)
-
-        if not track.name:
-            filename = os.path.basename(local_path)
-            name = urllib2.unquote(filename).decode(FS_ENCODING, 'replace')
-            track = track.copy(name=name)
-
-        return [track]
+            return os.stat(local_path)
+        except OSError:
+            return None
 
     def _get_media_dirs(self, config):
         for entry in config['file']['media_dirs']:
@@ -144,3 +226,27 @@ class FileLibraryProvider(backend.LibraryProvider):
         return any(
             path.is_path_inside_base_dir(local_path, media_dir['path'])
             for media_dir in self._media_dirs)
+
+
+class _DirEntry(object):
+
+    """Stand-in for the entries returned by scandir, if it isn't available."""
+
+    def __init__(self, dir_path, name):
+        self.name = name
+        self.path = os.path.join(dir_path, name)
+
+    def is_symlink(self):
+        return os.path.islink(self.path)
+
+    def is_dir(self):
+        return os.path.isdir(self.path)
+
+    def is_file(self):
+        return os.path.isfile(self.path)
+
+
+def _scandir(dir_path):
+    if scandir is not None:
+        return scandir(dir_path)
+    return (_DirEntry(dir_path, name) for name in os.listdir(dir_path))
@@ -26,6 +26,11 @@ class Extension(ext.Extension):
         schema['static_dir'] = config_lib.Path(optional=True)
         schema['zeroconf'] = config_lib.String(optional=True)
         schema['allowed_origins'] = config_lib.List(optional=True)
+        schema['max_concurrent_requests'] = config_lib.Integer(minimum=1)
+        schema['websocket_max_queued_events'] = config_lib.Integer(minimum=1)
+        schema['websocket_compression'] = config_lib.Boolean()
+        schema['image_cache_size'] = config_lib.Integer(minimum=0)
+        schema['image_sizes'] = config_lib.List(optional=True)
         return schema
 
     def validate_environment(self):
@@ -80,10 +80,11 @@ class HttpFrontend(pykka.ThreadingActor, CoreListener):
 
 
 def on_event(name, **data):
+    handlers.PlaylistsHandler.on_event(name)
     event = data
     event['event'] = name
     message = json.dumps(event, cls=models.ModelJSONEncoder)
-    handlers.WebSocketHandler.broadcast(message)
+    handlers.WebSocketHandler.broadcast(message, name)
 
 
 class HttpServer(threading.Thread):
@@ -1,10 +1,21 @@
 from __future__ import absolute_import, unicode_literals
 
+import collections
 import functools
+import gzip
+import hashlib
+import io
+import json
 import logging
 import os
+import sys
+import uuid
 
+import pykka
+
+import tornado.concurrent
 import tornado.escape
+import tornado.gen
 import tornado.ioloop
 import tornado.web
 import tornado.websocket
@@ -12,7 +23,9 @@ import tornado.websocket
 import mopidy
 from mopidy import core, models
 from mopidy.compat import urllib
-from mopidy.internal import encoding, jsonrpc
+from mopidy.http import images
+from mopidy.internal import (
+    encoding, http, jsonrpc, metrics, profiler, workers)
 
 
 logger = logging.getLogger(__name__)
@@ -23,15 +36,39 @@ def make_mopidy_app_factory(apps, statics):
         allowed_origins = {
             x.lower() for x in config['http']['allowed_origins'] if x
         }
-        return [
+        pool = workers.WorkerPool(
+            config['http']['max_concurrent_requests'], name='HttpJsonRpc')
+        jsonrpc = make_jsonrpc_wrapper(core)
+        read_kwargs = {
+            'core': core,
+            'allowed_origins': allowed_origins,
+            'pool': pool,
+            'cache': ResponseCache(),
+        }
+        request_handlers = [
             (r'/ws/?', WebSocketHandler, {
                 'core': core,
                 'allowed_origins': allowed_origins,
+                'pool': pool,
+                'jsonrpc': jsonrpc,
+                'max_queued_events': (
+                    config['http']['websocket_max_queued_events']),
+                'compression': config['http']['websocket_compression'],
             }),
             (r'/rpc', JsonRpcHandler, {
                 'core': core,
                 'allowed_origins': allowed_origins,
+                'pool': pool,
+                'jsonrpc': jsonrpc,
             }),
+            (r'/api/tracklist/?', TracklistHandler, read_kwargs),
+            (r'/api/playlists/?', PlaylistsHandler, read_kwargs),
+            (r'/api/browse/?', BrowseHandler, read_kwargs),
+            (r'/metrics', MetricsHandler),
+        ]
+        if config['http']['image_cache_size']:
+            request_handlers.extend(make_image_handlers(config, core))
+        request_handlers.extend([
             (r'/(.+)', StaticFileHandler, {
                 'path': os.path.join(os.path.dirname(__file__), 'data'),
             }),
@@ -39,10 +76,40 @@ def make_mopidy_app_factory(apps, statics):
                 'apps': apps,
                 'statics': statics,
             }),
-        ]
+        ])
+        return request_handlers
     return mopidy_app_factory
 
 
+def make_image_handlers(config, core):
+    sizes = []
+    for size in config['http']['image_sizes']:
+        if size.isdigit() and int(size) > 0:
+            sizes.append(int(size))
+        else:
+            logger.warning('Ignoring invalid http/image_sizes value: %s', size)
+    cache = images.ImageCache(
+        os.path.join(mopidy.http.Extension.get_cache_dir(config), b'images'),
+        max_size=config['http']['image_cache_size'] * 1024 * 1024,
+        sizes=sizes,
+        session=http.get_requests_session(
+            proxy_config=config['proxy'],
+            user_agent='Mopidy-HTTP/%s' % mopidy.__version__))
+    # Fetching images may be slow, so don't let it hold up JSON-RPC calls.
+    pool = workers.WorkerPool(
+        config['http']['max_concurrent_requests'], name='HttpImages')
+    return [
+        (r'/images/?', ImageLookupHandler, {
+            'service': images.ImageService(core, cache),
+            'pool': pool,
+        }),
+        (r'/images/([0-9a-f]{40})/([0-9]+)', ImageHandler, {
+            'cache': cache,
+            'pool': pool,
+        }),
+    ]
+
+
 def make_jsonrpc_wrapper(core_actor):
     inspector = jsonrpc.JsonRpcInspector(
         objects={
@@ -54,6 +121,7 @@ def make_jsonrpc_wrapper(core_actor):
             'core.playback': core.PlaybackController,
             'core.playlists': core.PlaylistsController,
             'core.tracklist': core.TracklistController,
+            'profiler': profiler.Profiler,
         })
     return jsonrpc.JsonRpcWrapper(
         objects={
@@ -66,18 +134,60 @@ def make_jsonrpc_wrapper(core_actor):
             'core.playback': core_actor.playback,
             'core.playlists': core_actor.playlists,
             'core.tracklist': core_actor.tracklist,
+            'profiler': profiler.profiler,
         },
         decoders=[models.model_json_decoder],
         encoders=[models.ModelJSONEncoder]
     )
 
 
-def _send_broadcast(client, msg):
+def complete_in_pool(pool, pending):
+    """
+    Wait for a JSON-RPC response, or other blocking result, in a worker thread.
+
+    :param pool: the worker pool to use
+    :type pool: :class:`mopidy.internal.workers.WorkerPool`
+    :param pending: function returned by
+        :meth:`~mopidy.internal.jsonrpc.JsonRpcWrapper.dispatch_json`, or any
+        other function blocking until a result is ready, like the ``get``
+        method of a Pykka future
+    :returns: a future resolved in the current IOLoop with the response
+    :rtype: :class:`tornado.concurrent.Future`
+    """
+    loop = tornado.ioloop.IOLoop.current()
+    future = tornado.concurrent.Future()
+
+    def complete():
+        try:
+            response = pending()
+        except Exception:
+            loop.add_callback(future.set_exc_info, sys.exc_info())
+        else:
+            loop.add_callback(future.set_result, response)
+
+    pool.submit(complete)
+    return future
+
+
+# Events which only tell the latest state, so that a client which hasn't
+# received an earlier one of them yet only needs the latest.
+COALESCED_EVENTS = {
+    'mute_changed',
+    'options_changed',
+    'playlists_loaded',
+    'seeked',
+    'stream_title_changed',
+    'tracklist_changed',
+    'volume_changed',
+}
+
+
+def _send_broadcast(client, msg, event):
     # We could check for client.ws_connection, but we don't really
     # care why the broadcast failed, we just want the rest of them
     # to succeed, so catch everything.
     try:
-        client.write_message(msg)
+        client.send_event(msg, event)
     except Exception as e:
         error_msg = encoding.locale_decode(e)
         logger.debug('Broadcast of WebSocket message to %s failed: %s',
@@ -85,6 +195,69 @@ def _send_broadcast(client, msg):
         # TODO: should this do the same cleanup as the on_message code?
 
 
+class EventSubscriptions(object):
+
+    """
+    The events a WebSocket client wants to receive.
+
+    Exposed to each WebSocket client as ``core.events``. Clients receive all
+    events until they subscribe to specific events.
+    """
+
+    #: Names of all the events which can be subscribed to.
+    EVENTS = frozenset(
+        name for name in dir(core.CoreListener)
+        if not name.startswith('_') and name not in ('on_event', 'send'))
+
+    def __init__(self):
+        self._events = None
+
+    def subscribe(self, events):
+        """
+        Receive the given events, in addition to any already subscribed to.
+
+        :param events: event names, see :class:`mopidy.core.CoreListener`
+        :type events: list of strings
+        :returns: the subscribed events
+        :rtype: list of strings
+        """
+        self._check_events(events)
+        self._events = (self._events or set()) | set(events)
+        return self.get_subscriptions()
+
+    def unsubscribe(self, events):
+        """
+        Stop receiving the given events.
+
+        :param events: event names, see :class:`mopidy.core.CoreListener`
+        :type events: list of strings
+        :returns: the subscribed events
+        :rtype: list of strings
+        """
+        self._check_events(events)
+        self._events = self._get_events() - set(events)
+        return self.get_subscriptions()
+
+    def get_subscriptions(self):
+        """
+        Get the events this client receives.
+
+        :rtype: list of strings
+        """
+        return sorted(self._get_events())
+
+    def _get_events(self):
+        return self.EVENTS if self._events is None else self._events
+
+    def _check_events(self, events):
+        unknown = set(events) - self.EVENTS
+        if unknown:
+            raise ValueError('Unknown events: %s' % ', '.join(sorted(unknown)))
+
+    def _wants(self, event):
+        return self._events is None or event is None or event in self._events
+
+
 class WebSocketHandler(tornado.websocket.WebSocketHandler):
 
     # XXX This set is shared by all WebSocketHandler objects. This isn't
@@ -93,18 +266,44 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
     clients = set()
 
     @classmethod
-    def broadcast(cls, msg):
+    def broadcast(cls, msg, event=None):
+        """
+        Send an already serialized message to all connected clients.
+
+        :param msg: the message
+        :type msg: string
+        :param event: name of the event in the message, if any. Messages for
+            events in :data:`COALESCED_EVENTS` replace older messages for the
+            same event which are still waiting to be sent to a client.
+        :type event: string or :class:`None`
+        """
         loop = tornado.ioloop.IOLoop.current()
 
         # This can be called from outside the Tornado ioloop, so we need to
         # safely cross the thread boundary by adding a callback to the loop.
         for client in cls.clients:
+            if not client.subscriptions._wants(event):
+                continue
             # One callback per client to keep time we hold up the loop short
-            loop.add_callback(functools.partial(_send_broadcast, client, msg))
-
-    def initialize(self, core, allowed_origins):
-        self.jsonrpc = make_jsonrpc_wrapper(core)
+            loop.add_callback(
+                functools.partial(_send_broadcast, client, msg, event))
+
+    def initialize(self, core, allowed_origins, pool, jsonrpc=None,
+                   max_queued_events=100, compression=False):
+        self.subscriptions = EventSubscriptions()
+        self.jsonrpc = (jsonrpc or make_jsonrpc_wrapper(core)).extend(
+            {'core.events': self.subscriptions})
         self.allowed_origins = allowed_origins
+        self.pool = pool
+        self.in_flight = 0
+        self.queued = collections.deque()
+        self.max_queued_events = max_queued_events
+        self.compression = compression
+        self.events = collections.deque()
+        self.sending_event = False
+
+    def get_compression_options(self):
+        return {} if self.compression else None
 
     def open(self):
         self.set_nodelay(True)
@@ -114,6 +313,8 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
 
     def on_close(self):
         self.clients.discard(self)
+        self.queued.clear()
+        self.events.clear()
         logger.debug(
             'Closed WebSocket connection from %s',
             self.request.remote_ip)
@@ -126,17 +327,83 @@ class WebSocketHandler(tornado.websocket.WebSocketHandler):
             'Received WebSocket message from %s: %r',
             self.request.remote_ip, message)
 
+        # Requests are handled concurrently, but only as many at a time as
+        # the pool has workers, so one client can't queue up unlimited work.
+        if self.in_flight < self.pool.num_workers:
+            self._dispatch(message)
+        else:
+            self.queued.append(message)
+
+    def _dispatch(self, message):
         try:
-            response = self.jsonrpc.handle_json(
+            pending = self.jsonrpc.dispatch_json(
                 tornado.escape.native_str(message))
-            if response and self.write_message(response):
+        except Exception as e:
+            self._on_error(e)
+            return
+        self.in_flight += 1
+        tornado.ioloop.IOLoop.current().add_future(
+            complete_in_pool(self.pool, pending), self._on_response)
+
+    def _on_response(self, future):
+        self.in_flight -= 1
+        try:
+            response = future.result()
+            if response and self.ws_connection:
+                self.write_message(response)
                 logger.debug(
                     'Sent WebSocket message to %s: %r',
                     self.request.remote_ip, response)
         except Exception as e:
-            error_msg = encoding.locale_decode(e)
-            logger.error('WebSocket request error: %s', error_msg)
+            self._on_error(e)
+        if self.queued and self.ws_connection:
+            self._dispatch(self.queued.popleft())
+
+    def _on_error(self, error):
+        error_msg = encoding.locale_decode(error)
+        logger.error('WebSocket request error: %s', error_msg)
+        self.close()
+
+    def send_event(self, msg, event=None):
+        """
+        Send a broadcast message to this client.
+
+        Only one message is written to the connection at a time. Further
+        messages wait in a queue until the previous one has been sent. If the
+        queue is full, the client is too far behind and is disconnected.
+        """
+        if event in COALESCED_EVENTS:
+            self.events = collections.deque(
+                item for item in self.events if item[0] != event)
+        if len(self.events) >= self.max_queued_events:
+            logger.warning(
+                'Closing WebSocket connection from %s, as it is more than '
+                '%d events behind', self.request.remote_ip,
+                self.max_queued_events)
+            self.events.clear()
             self.close()
+            return
+        self.events.append((event, msg))
+        self._send_next_event()
+
+    def _send_next_event(self):
+        if self.sending_event or not self.events or not self.ws_connection:
+            return
+        _, msg = self.events.popleft()
+        self.sending_event = True
+        tornado.ioloop.IOLoop.current().add_future(
+            self.write_message(msg), self._on_event_sent)
+
+    def _on_event_sent(self, future):
+        self.sending_event = False
+        try:
+            future.result()
+        except Exception as e:
+            logger.debug(
+                'Broadcast of WebSocket message to %s failed: %s',
+                self.request.remote_ip, encoding.locale_decode(e))
+            return
+        self._send_next_event()
 
     def check_origin(self, origin):
         return check_origin(origin, self.request.headers, self.allowed_origins)
@@ -159,14 +426,16 @@ def check_origin(origin, request_headers, allowed_origins):
 
 class JsonRpcHandler(tornado.web.RequestHandler):
 
-    def initialize(self, core, allowed_origins):
-        self.jsonrpc = make_jsonrpc_wrapper(core)
+    def initialize(self, core, allowed_origins, pool, jsonrpc=None):
+        self.jsonrpc = jsonrpc or make_jsonrpc_wrapper(core)
         self.allowed_origins = allowed_origins
+        self.pool = pool
 
     def head(self):
         self.set_extra_headers()
         self.finish()
 
+    @tornado.gen.coroutine
     def post(self):
         content_type = self.request.headers.get('Content-Type', '')
         if content_type != 'application/json':
@@ -182,8 +451,9 @@ class JsonRpcHandler(tornado.web.RequestHandler):
 
         try:
             self.set_extra_headers()
-            response = self.jsonrpc.handle_json(
+            pending = self.jsonrpc.dispatch_json(
                 tornado.escape.native_str(data))
+            response = yield complete_in_pool(self.pool, pending)
             if response and self.write(response):
                 logger.debug(
                     'Sent RPC message to %s: %r',
@@ -210,6 +480,280 @@ class JsonRpcHandler(tornado.web.RequestHandler):
         self.finish()
 
 
+# Responses smaller than this are not worth compressing.
+GZIP_MIN_LENGTH = 1024
+
+
+def _gzip(data):
+    # A fixed mtime keeps the output the same for the same data.
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode='wb', mtime=0) as f:
+        f.write(data)
+    return buf.getvalue()
+
+
+class ResponseCache(object):
+
+    """
+    The latest encoded response of :class:`ReadHandler` for each request URI.
+
+    A response is only reused as long as its ETag is still current, so that
+    the core data only has to be encoded and compressed once per version.
+
+    :param size: maximum number of request URIs to keep responses for
+    :type size: int
+    """
+
+    def __init__(self, size=32):
+        self.size = size
+        # Versions start over when Mopidy is restarted, so add something
+        # to the ETags that doesn't, so that old ETags don't match.
+        self.prefix = uuid.uuid4().hex[:8]
+        self._responses = collections.OrderedDict()
+
+    def make_etag(self, version):
+        return 'W/"%s-%s"' % (self.prefix, version)
+
+    def get(self, key, etag):
+        response = self._responses.pop(key, None)
+        if response is None or response[0] != etag:
+            return None
+        self._responses[key] = response
+        return response
+
+    def put(self, key, etag, body):
+        self._responses.pop(key, None)
+        self._responses[key] = response = [etag, body, None]
+        while len(self._responses) > self.size:
+            self._responses.popitem(last=False)
+        return response
+
+
+class ReadHandler(tornado.web.RequestHandler):
+
+    """
+    Base class for read-only REST endpoints returning core data as JSON.
+
+    The data is encoded just like JSON-RPC results. Responses have an ETag,
+    so that clients can send an ``If-None-Match`` header to get an empty
+    ``304 Not Modified`` response if the data is unchanged. Large responses
+    are gzip compressed for clients accepting it.
+
+    Subclasses implement :meth:`get_data` and, if the data has a version
+    which is cheaper to get than the data itself, :meth:`get_version`.
+    """
+
+    def initialize(self, core, allowed_origins, pool, cache):
+        self.core = core
+        self.allowed_origins = allowed_origins
+        self.pool = pool
+        self.cache = cache
+
+    def get_version(self):
+        """
+        Get the version of the data, changing whenever the data changes.
+
+        :returns: the version, a Pykka future with it, or :class:`None` to
+            derive the ETag from the encoded data instead
+        """
+        return None
+
+    def get_cache_key(self):
+        """
+        Get the key to cache the response under.
+
+        :returns: the request URI
+        """
+        return self.request.uri
+
+    def get_data(self):
+        """
+        Get the data to respond with.
+
+        :returns: a Pykka future with the data, responding with
+            ``404 Not Found`` if it is :class:`None`
+        """
+        raise NotImplementedError
+
+    @tornado.gen.coroutine
+    def get(self):
+        self.set_extra_headers()
+        key = self.get_cache_key()
+
+        version = self.get_version()
+        if isinstance(version, pykka.Future):
+            version = yield complete_in_pool(self.pool, version.get)
+        if version is not None:
+            etag = self.cache.make_etag(version)
+            self.set_header('Etag', etag)
+            if self.check_etag_header():
+                self.set_status(304)
+                return
+            response = self.cache.get(key, etag)
+        else:
+            response = None
+
+        if response is None:
+            data = yield complete_in_pool(self.pool, self.get_data().get)
+            if data is None:
+                raise tornado.web.HTTPError(404)
+            body = json.dumps(data, cls=models.ModelJSONEncoder)
+            if version is None:
+                etag = self.cache.make_etag(hashlib.sha1(body).hexdigest())
+                self.set_header('Etag', etag)
+                if self.check_etag_header():
+                    self.set_status(304)
+                    return
+                response = self.cache.get(key, etag)
+            if response is None:
+                response = self.cache.put(key, etag, body)
+
+        self.write_response(response)
+
+    def write_response(self, response):
+        body = response[1]
+        if len(body) >= GZIP_MIN_LENGTH and self.accepts_gzip():
+            if response[2] is None:
+                response[2] = _gzip(body)
+            body = response[2]
+            self.set_header('Content-Encoding', 'gzip')
+        self.write(body)
+
+    def accepts_gzip(self):
+        accept_encoding = self.request.headers.get('Accept-Encoding', '')
+        return 'gzip' in accept_encoding.lower()
+
+    def set_extra_headers(self):
+        set_mopidy_headers(self)
+        self.set_header('Content-Type', 'application/json; utf-8')
+        self.set_header('Vary', 'Accept-Encoding')
+        origin = self.request.headers.get('Origin')
+        if origin is not None and check_origin(
+                origin, self.request.headers, self.allowed_origins):
+            self.set_header('Access-Control-Allow-Origin', origin)
+
+
+class TracklistHandler(ReadHandler):
+
+    """The tracklist, versioned by the tracklist version."""
+
+    def get_version(self):
+        return self.core.tracklist.get_version()
+
+    def get_data(self):
+        return self.core.tracklist.get_tl_tracks()
+
+
+# Events after which the playlists may have changed.
+PLAYLIST_EVENTS = {
+    'playlist_changed',
+    'playlist_deleted',
+    'playlists_loaded',
+}
+
+
+class PlaylistsHandler(ReadHandler):
+
+    """
+    The playlists, or the items of the playlist given by the ``uri`` argument.
+
+    Backends don't have to send an event when their playlists change, e.g.
+    when an M3U file is edited on disk, so the ETag is derived from the
+    result. The count of playlist events seen is only part of the cache key,
+    so that the cached responses are dropped as soon as an event arrives.
+    """
+
+    generation = 0
+
+    @classmethod
+    def on_event(cls, name):
+        if name in PLAYLIST_EVENTS:
+            cls.generation += 1
+
+    def get_cache_key(self):
+        return '%s#%d' % (self.request.uri, self.generation)
+
+    def get_data(self):
+        uri = self.get_argument('uri', None)
+        if uri is None:
+            return self.core.playlists.as_list()
+        return self.core.playlists.get_items(uri)
+
+
+class BrowseHandler(ReadHandler):
+
+    """
+    The result of browsing the ``uri`` argument, or the root if not given.
+
+    As backends don't tell when their libraries change, the ETag is derived
+    from the result.
+    """
+
+    def get_data(self):
+        return self.core.library.browse(self.get_argument('uri', None))
+
+
+class ImageLookupHandler(tornado.web.RequestHandler):
+
+    """
+    Redirect to the cached image of the library item given by the ``uri``
+    argument, resized to fit the ``size`` argument if given.
+    """
+
+    def initialize(self, service, pool):
+        self.service = service
+        self.pool = pool
+
+    @tornado.gen.coroutine
+    def get(self):
+        set_mopidy_headers(self)
+        uri = self.get_argument('uri')
+        try:
+            size = int(self.get_argument('size', '0'))
+        except ValueError:
+            raise tornado.web.HTTPError(400, 'Invalid size')
+
+        key = yield complete_in_pool(
+            self.pool, functools.partial(self.service.get_key, uri))
+        if key is None:
+            raise tornado.web.HTTPError(404)
+        self.redirect('%s/%s/%d' % (
+            self.request.path.rstrip('/'), key,
+            self.service.cache.get_size(size)))
+
+
+class ImageHandler(tornado.web.RequestHandler):
+
+    def initialize(self, cache, pool):
+        self.cache = cache
+        self.pool = pool
+
+    @tornado.gen.coroutine
+    def get(self, key, size):
+        data = yield complete_in_pool(
+            self.pool, functools.partial(self.cache.read, key, int(size)))
+        if data is None:
+            raise tornado.web.HTTPError(404)
+
+        set_mopidy_headers(self)
+        # The URL is only used for this image, so it may be kept for long.
+        self.set_header('Cache-Control', 'public, max-age=31536000')
+        self.set_header('Content-Type', images.get_content_type(data))
+        self.write(data)
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+
+    """The call metrics in the Prometheus text format."""
+
+    def get(self):
+        if not metrics.registry.enabled:
+            raise tornado.web.HTTPError(404, 'Metrics are disabled')
+        set_mopidy_headers(self)
+        self.set_header('Content-Type', 'text/plain; version=0.0.4')
+        self.write(metrics.registry.format_prometheus())
+
+
 class ClientListHandler(tornado.web.RequestHandler):
 
     def initialize(self, apps, statics):
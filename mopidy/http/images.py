@@ -0,0 +1,285 @@
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import hashlib
+import imghdr
+import io
+import logging
+import os
+import re
+import tempfile
+import threading
+
+import pykka
+
+from mopidy.internal import encoding, http, path
+
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+
+logger = logging.getLogger(__name__)
+
+# Size of the unresized image in image file names and URLs.
+ORIGINAL = 0
+
+_FILE_NAME_RE = re.compile(r'^([0-9a-f]{40})-([0-9]+)$')
+
+
+def get_key(uri):
+    """Get the key an image URI is cached under."""
+    return hashlib.sha1(uri.encode('utf-8')).hexdigest()
+
+
+def get_content_type(data):
+    kind = imghdr.what(None, data[:32])
+    return 'image/%s' % kind if kind else 'application/octet-stream'
+
+
+def resize(data, size):
+    """
+    Scale an image down to fit within ``size`` by ``size`` pixels.
+
+    :returns: the resized image, the image itself if it already fits, or
+        :class:`None` if Pillow isn't installed or can't read the image
+    """
+    if PILImage is None:
+        return None
+    try:
+        image = PILImage.open(io.BytesIO(data))
+        if max(image.size) <= size:
+            return data
+        image.thumbnail((size, size), PILImage.ANTIALIAS)
+        output = io.BytesIO()
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image.save(output, 'PNG')
+        else:
+            image.convert('RGB').save(output, 'JPEG', quality=85)
+        return output.getvalue()
+    except Exception as e:
+        logger.debug('Resizing image failed: %s', encoding.locale_decode(e))
+        return None
+
+
+class ImageCache(object):
+
+    """
+    Disk-backed cache of images and thumbnails of them.
+
+    Each image is fetched once, and thumbnails in each of the configured sizes
+    are made right away. When the files grow larger than ``max_size`` in
+    total, the least recently used are removed. File modification times track
+    use, so that this survives restarts.
+
+    Thumbnails need Pillow. Without it, only the original images are cached.
+
+    :param cache_dir: directory to keep the images in
+    :type cache_dir: bytes
+    :param max_size: maximum total size of the files in bytes
+    :type max_size: int
+    :param sizes: thumbnail sizes, each the maximum width and height in pixels
+    :type sizes: list of int
+    :param session: session for downloading images over HTTP
+    :type session: :class:`requests.Session`
+    :param timeout: download timeout in seconds
+    :type timeout: float
+    """
+
+    def __init__(self, cache_dir, max_size, sizes, session, timeout=5.0):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self.sizes = sorted(set(sizes))
+        self._session = session
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._files = None
+        self._total_size = 0
+        self._pending = {}
+
+    def get_size(self, size):
+        """Get the smallest thumbnail size at least ``size`` pixels."""
+        for thumbnail_size in self.sizes:
+            if thumbnail_size >= size:
+                return thumbnail_size
+        return ORIGINAL
+
+    def add(self, uri):
+        """
+        Make sure the image at ``uri`` and its thumbnails are cached.
+
+        Supports ``http``, ``https`` and ``file`` URIs. Blocks while fetching
+        the image. Adding an image which is being added by another thread
+        waits for that to finish instead.
+
+        :returns: the image's key, or :class:`None` if it couldn't be fetched
+        """
+        key = get_key(uri)
+        with self._lock:
+            self._load()
+            if self._name(key, ORIGINAL) in self._files:
+                return key
+            future = self._pending.get(key)
+            if future is None:
+                future = self._pending[key] = pykka.ThreadingFuture()
+                fetching = True
+            else:
+                fetching = False
+
+        if not fetching:
+            return future.get()
+        result = None
+        try:
+            result = self._add(key, uri)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            future.set(result)
+        return result
+
+    def read(self, key, size=ORIGINAL):
+        """
+        Get a cached image.
+
+        Falls back to the original image if the thumbnail is missing.
+
+        :returns: the image data, or :class:`None` if it isn't cached
+        """
+        for name in (self._name(key, size), self._name(key, ORIGINAL)):
+            with self._lock:
+                self._load()
+                if name not in self._files:
+                    continue
+                self._files[name] = self._files.pop(name)
+                file_path = os.path.join(self.cache_dir, name)
+                try:
+                    os.utime(file_path, None)
+                    with open(file_path, 'rb') as fh:
+                        return fh.read()
+                except EnvironmentError as e:
+                    logger.warning(
+                        'Reading cached image failed: %s',
+                        encoding.locale_decode(e))
+                    self._remove(name)
+        return None
+
+    def _add(self, key, uri):
+        data = self._fetch(uri)
+        if not data:
+            return None
+        files = [(ORIGINAL, data)]
+        for size in self.sizes:
+            thumbnail = resize(data, size)
+            if thumbnail is not None:
+                files.append((size, thumbnail))
+
+        with self._lock:
+            for size, content in files:
+                self._write(self._name(key, size), content)
+            self._evict()
+        return key
+
+    def _fetch(self, uri):
+        if uri.startswith(('http://', 'https://')):
+            return http.download(self._session, uri, timeout=self._timeout)
+        elif uri.startswith('file://'):
+            try:
+                with open(path.uri_to_path(uri), 'rb') as fh:
+                    return fh.read()
+            except EnvironmentError as e:
+                logger.warning(
+                    'Reading image %r failed: %s',
+                    uri, encoding.locale_decode(e))
+                return None
+        logger.debug('Not caching image with unsupported URI: %r', uri)
+        return None
+
+    def _name(self, key, size):
+        return bytes('%s-%d' % (key, size))
+
+    def _load(self):
+        if self._files is not None:
+            return
+        path.get_or_create_dir(self.cache_dir)
+        files = []
+        for name in os.listdir(self.cache_dir):
+            file_path = os.path.join(self.cache_dir, name)
+            if not _FILE_NAME_RE.match(name):
+                if name.startswith(b'tmp'):
+                    os.remove(file_path)
+                continue
+            stat = os.stat(file_path)
+            files.append((stat.st_mtime, name, stat.st_size))
+        self._files = collections.OrderedDict(
+            (name, size) for _, name, size in sorted(files))
+        self._total_size = sum(self._files.values())
+        self._evict()
+
+    def _write(self, name, content):
+        with tempfile.NamedTemporaryFile(
+                prefix=b'tmp', dir=self.cache_dir, delete=False) as fh:
+            fh.write(content)
+        os.rename(fh.name, os.path.join(self.cache_dir, name))
+        self._total_size += len(content) - self._files.pop(name, 0)
+        self._files[name] = len(content)
+
+    def _remove(self, name):
+        self._total_size -= self._files.pop(name)
+        try:
+            os.remove(os.path.join(self.cache_dir, name))
+        except EnvironmentError:
+            pass
+
+    def _evict(self):
+        while self._files and self._total_size > self.max_size:
+            self._remove(next(iter(self._files)))
+
+
+class ImageService(object):
+
+    """
+    Find the images of library items and cache them.
+
+    Remembers the image found for each of the most recently used ``size``
+    library URIs, so that clients showing the same items again don't cause
+    new :meth:`~mopidy.core.LibraryController.get_images` calls.
+
+    :param core: the core actor proxy
+    :param cache: the image cache to use
+    :type cache: :class:`ImageCache`
+    :param size: number of library URIs to remember images for
+    :type size: int
+    """
+
+    def __init__(self, core, cache, size=1000):
+        self.core = core
+        self.cache = cache
+        self.size = size
+        self._lock = threading.Lock()
+        self._images = collections.OrderedDict()
+
+    def get_key(self, uri):
+        """
+        Get the cache key of the image of the library item at ``uri``.
+
+        Blocks until the image is cached.
+
+        :returns: the key, or :class:`None` if the item has no usable image
+        """
+        with self._lock:
+            image_uri = self._images.pop(uri, None)
+            if image_uri is not None:
+                self._images[uri] = image_uri
+        if image_uri is None:
+            images = self.core.library.get_images([uri]).get().get(uri)
+            if not images:
+                return None
+            # Make thumbnails from the largest image, if sizes are known.
+            image_uri = max(
+                images, key=lambda i: (i.width or 0) * (i.height or 0)).uri
+            with self._lock:
+                self._images[uri] = image_uri
+                while len(self._images) > self.size:
+                    self._images.popitem(last=False)
+        return self.cache.add(image_uri)
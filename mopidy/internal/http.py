@@ -22,18 +22,8 @@ def get_requests_session(proxy_config, user_agent):
 
 
 def download(session, uri, timeout=1.0, chunk_size=4096):
-    try:
-        response = session.get(uri, stream=True, timeout=timeout)
-    except requests.exceptions.Timeout:
-        logger.warning('Download of %r failed due to connection timeout after '
-                       '%.3fs', uri, timeout)
-        return None
-    except requests.exceptions.InvalidSchema:
-        logger.warning('Download of %r failed due to unsupported schema', uri)
-        return None
-    except requests.exceptions.RequestException as exc:
-        logger.warning('Download of %r failed: %s', uri, exc)
-        logger.debug('Download exception details', exc_info=True)
+    response = _get(session, uri, timeout)
+    if response is None:
         return None
 
     content = []
@@ -50,3 +40,58 @@ def download(session, uri, timeout=1.0, chunk_size=4096):
         return None
 
     return b''.join(content)
+
+
+def download_chunks(session, uri, timeout=1.0, chunk_size=4096):
+    """
+    Download ``uri``, getting the content in chunks as they arrive.
+
+    The download stops early if it takes more than ``timeout`` seconds, or if
+    the returned iterator is closed. Callers reading only part of the content
+    should close the iterator to close the connection.
+
+    :returns: an iterator of chunks of bytes, or :class:`None` if the download
+        failed to start
+    """
+    response = _get(session, uri, timeout)
+    if response is None:
+        return None
+
+    if not response.ok:
+        logger.warning('Problem downloading %r: %s', uri, response.reason)
+        response.close()
+        return None
+
+    return _iter_content(response, uri, timeout, chunk_size)
+
+
+def _get(session, uri, timeout):
+    try:
+        return session.get(uri, stream=True, timeout=timeout)
+    except requests.exceptions.Timeout:
+        logger.warning('Download of %r failed due to connection timeout after '
+                       '%.3fs', uri, timeout)
+        return None
+    except requests.exceptions.InvalidSchema:
+        logger.warning('Download of %r failed due to unsupported schema', uri)
+        return None
+    except requests.exceptions.RequestException as exc:
+        logger.warning('Download of %r failed: %s', uri, exc)
+        logger.debug('Download exception details', exc_info=True)
+        return None
+
+
+def _iter_content(response, uri, timeout, chunk_size):
+    deadline = time.time() + timeout
+    try:
+        for chunk in response.iter_content(chunk_size):
+            yield chunk
+            if time.time() > deadline:
+                logger.warning(
+                    'Download of %r stopped due to download taking more '
+                    'than %.3fs', uri, timeout)
+                return
+    except requests.exceptions.RequestException as exc:
+        logger.warning('Download of %r failed: %s', uri, exc)
+    finally:
+        response.close()
@@ -1,12 +1,15 @@
 from __future__ import absolute_import, unicode_literals
 
+import copy
 import inspect
 import json
+import time
 import traceback
 
 import pykka
 
 from mopidy import compat
+from mopidy.internal import metrics
 
 
 class JsonRpcWrapper(object):
@@ -42,6 +45,9 @@ class JsonRpcWrapper(object):
 
     If a method returns a :class:`pykka.Future`, the future will be completed
     and its value unwrapped before the JSON-RPC wrapper returns the response.
+    In batch requests, all the methods are called before any of the futures
+    are waited for, so that the calls are processed concurrently. The
+    responses are still returned in the order of the requests.
 
     For further details on the JSON-RPC 2.0 spec, see
     http://www.jsonrpc.org/specification
@@ -63,6 +69,32 @@ class JsonRpcWrapper(object):
         self.objects = objects
         self.decoder = get_combined_json_decoder(decoders or [])
         self.encoder = get_combined_json_encoder(encoders or [])
+        self._methods = {}
+        self._parent = None
+
+    def extend(self, objects):
+        """
+        Create a wrapper which also exposes ``objects``.
+
+        The new wrapper shares the encoders, decoders and already looked up
+        methods with this wrapper, so it is cheap to create one per connection
+        to expose objects which are specific to the connection.
+
+        :param objects: mapping between mounting points and exposed functions
+            or class instances, in addition to those of this wrapper
+        :type objects: dict
+        :rtype: :class:`JsonRpcWrapper`
+        """
+        if '' in objects.keys():
+            raise AttributeError(
+                'The empty string is not allowed as an object mount')
+        wrapper = copy.copy(self)
+        wrapper.objects = dict(self.objects)
+        wrapper.objects.update(objects)
+        wrapper._methods = {}
+        wrapper._parent = self
+        wrapper._parent_mounts = set(self.objects) - set(objects)
+        return wrapper
 
     def handle_json(self, request):
         """
@@ -75,15 +107,35 @@ class JsonRpcWrapper(object):
         :type request: string
         :rtype: string or :class:`None`
         """
+        return self.dispatch_json(request)()
+
+    def dispatch_json(self, request):
+        """
+        Starts handling an incoming request encoded as a JSON string.
+
+        The requested methods are called before this returns, but their
+        results are not waited for. Instead, a function which waits for the
+        results and returns the same as :meth:`handle_json` is returned. This
+        lets the caller keep the order of calls, while waiting for the results
+        elsewhere, like in another thread.
+
+        :param request: the serialized JSON-RPC request
+        :type request: string
+        :rtype: function returning a string or :class:`None`
+        """
         try:
             request = json.loads(request, object_hook=self.decoder)
         except ValueError:
-            response = JsonRpcParseError().get_response()
+            pending = _constant(JsonRpcParseError().get_response())
         else:
-            response = self.handle_data(request)
-        if response is None:
-            return None
-        return json.dumps(response, cls=self.encoder)
+            pending = self.dispatch_data(request)
+
+        def encode():
+            response = pending()
+            if response is None:
+                return None
+            return json.dumps(response, cls=self.encoder)
+        return encode
 
     def handle_data(self, request):
         """
@@ -96,63 +148,80 @@ class JsonRpcWrapper(object):
         :type request: dict
         :rtype: dict, list, or :class:`None`
         """
+        return self.dispatch_data(request)()
+
+    def dispatch_data(self, request):
+        """
+        Starts handling an incoming request in the form of a Python data
+        structure.
+
+        Like :meth:`dispatch_json`, this returns a function which waits for
+        the results and returns the same as :meth:`handle_data`.
+
+        :param request: the unserialized JSON-RPC request
+        :type request: dict
+        :rtype: function returning a dict, list, or :class:`None`
+        """
         if isinstance(request, list):
-            return self._handle_batch(request)
+            return self._dispatch_batch(request)
         else:
-            return self._handle_single_request(request)
+            return self._dispatch_single_request(request)
 
-    def _handle_batch(self, requests):
+    def _dispatch_batch(self, requests):
         if not requests:
-            return JsonRpcInvalidRequestError(
-                data='Batch list cannot be empty').get_response()
+            return _constant(JsonRpcInvalidRequestError(
+                data='Batch list cannot be empty').get_response())
 
-        responses = []
-        for request in requests:
-            response = self._handle_single_request(request)
-            if response:
-                responses.append(response)
+        # Make all the calls before waiting for any of the results.
+        pending = [self._dispatch_single_request(r) for r in requests]
 
-        return responses or None
+        def complete():
+            responses = [response for response in (p() for p in pending)
+                         if response]
+            return responses or None
+        return complete
 
-    def _handle_single_request(self, request):
+    def _dispatch_single_request(self, request):
         try:
             self._validate_request(request)
             args, kwargs = self._get_params(request)
         except JsonRpcInvalidRequestError as error:
-            return error.get_response()
+            return _constant(error.get_response())
 
+        start = time.time()
         try:
             method = self._get_method(request['method'])
 
             try:
                 result = method(*args, **kwargs)
-
-                if self._is_notification(request):
-                    return None
-
-                result = self._unwrap_result(result)
-
-                return {
-                    'jsonrpc': '2.0',
-                    'id': request['id'],
-                    'result': result,
-                }
-            except TypeError as error:
-                raise JsonRpcInvalidParamsError(data={
-                    'type': error.__class__.__name__,
-                    'message': compat.text_type(error),
-                    'traceback': traceback.format_exc(),
-                })
             except Exception as error:
-                raise JsonRpcApplicationError(data={
-                    'type': error.__class__.__name__,
-                    'message': compat.text_type(error),
-                    'traceback': traceback.format_exc(),
-                })
+                raise _get_call_error(error)
         except JsonRpcError as error:
             if self._is_notification(request):
-                return None
-            return error.get_response(request['id'])
+                return _constant(None)
+            return _constant(error.get_response(request['id']))
+
+        if self._is_notification(request):
+            return _constant(None)
+
+        def complete():
+            try:
+                try:
+                    value = self._unwrap_result(result)
+                except Exception as error:
+                    raise _get_call_error(error)
+                finally:
+                    if metrics.registry.enabled:
+                        metrics.registry.observe(
+                            'jsonrpc', request['method'], time.time() - start)
+            except JsonRpcError as error:
+                return error.get_response(request['id'])
+            return {
+                'jsonrpc': '2.0',
+                'id': request['id'],
+                'result': value,
+            }
+        return complete
 
     def _validate_request(self, request):
         if not isinstance(request, dict):
@@ -184,6 +253,20 @@ class JsonRpcWrapper(object):
                 data='"params", if given, must be an array or an object')
 
     def _get_method(self, method_path):
+        # Looking up methods through Pykka proxies is slow, and the mounted
+        # objects are fixed, so each method is only looked up once.
+        try:
+            return self._methods[method_path]
+        except KeyError:
+            pass
+        if self._parent is not None and (
+                method_path in self._parent_mounts or
+                method_path.rsplit('.', 1)[0] in self._parent_mounts):
+            return self._parent._get_method(method_path)
+        method = self._methods[method_path] = self._find_method(method_path)
+        return method
+
+    def _find_method(self, method_path):
         if callable(self.objects.get(method_path, None)):
             # The mounted object is the callable
             return self.objects[method_path]
@@ -223,6 +306,23 @@ class JsonRpcWrapper(object):
         return result
 
 
+def _constant(value):
+    return lambda: value
+
+
+def _get_call_error(error):
+    # Must be called while handling the error, to include the traceback.
+    data = {
+        'type': error.__class__.__name__,
+        'message': compat.text_type(error),
+        'traceback': traceback.format_exc(),
+    }
+    if isinstance(error, TypeError):
+        return JsonRpcInvalidParamsError(data=data)
+    else:
+        return JsonRpcApplicationError(data=data)
+
+
 class JsonRpcError(Exception):
     code = -32000
     message = 'Unspecified server error'
@@ -280,10 +380,14 @@ def get_combined_json_decoder(decoders):
 def get_combined_json_encoder(encoders):
     class JsonRpcEncoder(json.JSONEncoder):
 
+        def __init__(self, *args, **kwargs):
+            super(JsonRpcEncoder, self).__init__(*args, **kwargs)
+            self.encoders = [encoder() for encoder in encoders]
+
         def default(self, obj):
-            for encoder in encoders:
+            for encoder in self.encoders:
                 try:
-                    return encoder().default(obj)
+                    return encoder.default(obj)
                 except TypeError:
                     pass  # Try next encoder
             return json.JSONEncoder.default(self, obj)
@@ -0,0 +1,158 @@
+from __future__ import absolute_import, unicode_literals
+
+import bisect
+import contextlib
+import functools
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency histogram buckets.
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class Histogram(object):
+
+    """Count and latency distribution of the calls to one method."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.bucket_counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+
+class Registry(object):
+
+    """
+    Per-method call counts and latency histograms.
+
+    Methods are grouped by component, like ``core``, ``backend``, ``mpd`` and
+    ``jsonrpc``. Nothing is recorded unless :attr:`enabled` is set, which is
+    done at startup if the :confval:`core/metrics` config value is set.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, component, method, seconds):
+        """Record a call to ``method`` of ``component`` taking ``seconds``."""
+        with self._lock:
+            histogram = self._histograms.get((component, method))
+            if histogram is None:
+                histogram = self._histograms[(component, method)] = Histogram()
+            histogram.observe(seconds)
+
+    @contextlib.contextmanager
+    def timed(self, component, method):
+        """Context manager recording the time taken by its block."""
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.observe(component, method, time.time() - start)
+
+    def instrument(self, obj, component, names):
+        """
+        Replace the methods ``names`` of ``obj`` with timed versions.
+
+        The methods are named by the class of ``obj`` and the method name. Does
+        nothing if not :attr:`enabled`, so this is meant for use when ``obj``
+        is created.
+        """
+        if not self.enabled:
+            return
+        for name in names:
+            method = getattr(obj, name)
+            label = '%s.%s' % (type(obj).__name__, name)
+            setattr(obj, name, self._wrap(method, component, label))
+
+    def _wrap(self, method, component, label):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            with self.timed(component, label):
+                return method(*args, **kwargs)
+        return wrapper
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+
+    def get_histograms(self):
+        """
+        :returns: ``((component, method), histogram)`` pairs, sorted
+        """
+        with self._lock:
+            return sorted(
+                (key, _copy(histogram))
+                for key, histogram in self._histograms.items())
+
+    def format_prometheus(self):
+        """Format the metrics in the Prometheus text exposition format."""
+        lines = [
+            '# HELP mopidy_call_duration_seconds '
+            'Time taken by calls, per component and method.',
+            '# TYPE mopidy_call_duration_seconds histogram',
+        ]
+        for (component, method), histogram in self.get_histograms():
+            labels = 'component="%s",method="%s"' % (
+                _escape(component), _escape(method))
+            cumulative = 0
+            bounds = [repr(float(b)) for b in histogram.buckets] + ['+Inf']
+            for bound, count in zip(bounds, histogram.bucket_counts):
+                cumulative += count
+                lines.append(
+                    'mopidy_call_duration_seconds_bucket{%s,le="%s"} %d' % (
+                        labels, bound, cumulative))
+            lines.append('mopidy_call_duration_seconds_sum{%s} %r' % (
+                labels, histogram.sum))
+            lines.append('mopidy_call_duration_seconds_count{%s} %d' % (
+                labels, histogram.count))
+        return '\n'.join(lines) + '\n'
+
+    def format_summary(self):
+        """Format the metrics as a table for humans."""
+        lines = ['%-10s %-40s %8s %10s %10s %10s' % (
+            'Component', 'Method', 'Calls', 'Total ms', 'Mean ms', 'Max ms')]
+        for (component, method), histogram in self.get_histograms():
+            lines.append('%-10s %-40s %8d %10.1f %10.1f %10.1f' % (
+                component, method, histogram.count, histogram.sum * 1000,
+                histogram.sum * 1000 / histogram.count, histogram.max * 1000))
+        return '\n'.join(lines)
+
+
+def _copy(histogram):
+    result = Histogram(histogram.buckets)
+    result.bucket_counts = list(histogram.bucket_counts)
+    result.count = histogram.count
+    result.sum = histogram.sum
+    result.max = histogram.max
+    return result
+
+
+def _escape(value):
+    return (
+        value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+
+
+#: The registry used throughout Mopidy.
+registry = Registry()
+
+
+def log_summary():
+    """Log the metrics as a table."""
+    logger.info('Call metrics:\n%s', registry.format_summary())
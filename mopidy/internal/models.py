@@ -1,7 +1,7 @@
 from __future__ import absolute_import, unicode_literals
 
 from mopidy.internal import validation
-from mopidy.models import Ref, TlTrack, fields
+from mopidy.models import Ref, TlTrack, Track, fields
 from mopidy.models.immutable import ValidatedImmutableObject
 
 
@@ -76,6 +76,23 @@ class PlaybackState(ValidatedImmutableObject):
     state = fields.Field(choices=validation.PLAYBACK_STATES)
 
 
+class TracklistEntry(ValidatedImmutableObject):
+    """
+    A tracklist entry. Identifies a track by URI only.
+
+    :param tlid: tracklist ID
+    :type tlid: int
+    :param uri: track URI
+    :type uri: string
+    """
+
+    # The tracklist ID. Read-only.
+    tlid = fields.Integer(min=0)
+
+    # The track URI. Read-only.
+    uri = fields.URI()
+
+
 class TracklistState(ValidatedImmutableObject):
 
     """
@@ -92,7 +109,15 @@ class TracklistState(ValidatedImmutableObject):
     :type single: bool
     :param next_tlid: the id for the next added track
     :type next_tlid: int
-    :param tl_tracks: the list of tracks
+    :param version: the tracklist version
+    :type version: int
+    :param entries: the list of tracks by URI
+    :type entries: list of :class:`TracklistEntry`
+    :param tracks: metadata of the tracks which can not be looked up in the
+        library
+    :type tracks: list of :class:`mopidy.models.Track`
+    :param tl_tracks: the list of tracks, only used by state files written by
+        older versions
     :type tl_tracks: list of :class:`TlTrack`
     """
 
@@ -111,7 +136,16 @@ class TracklistState(ValidatedImmutableObject):
     # The id of the track to play. Read-only.
     next_tlid = fields.Integer(min=0)
 
-    # The list of tracks. Read-only.
+    # The tracklist version. Read-only.
+    version = fields.Integer(min=0)
+
+    # The list of tracks by URI. Read-only.
+    entries = fields.Collection(type=TracklistEntry, container=tuple)
+
+    # The metadata not provided by the library. Read-only.
+    tracks = fields.Collection(type=Track, container=tuple)
+
+    # The list of tracks, as stored by older versions. Read-only.
     tl_tracks = fields.Collection(type=TlTrack, container=tuple)
 
 
@@ -6,6 +6,7 @@ import re
 import stat
 import string
 import threading
+import time
 
 from mopidy import compat, exceptions
 from mopidy.compat import queue, urllib
@@ -17,6 +18,11 @@ logger = logging.getLogger(__name__)
 
 XDG_DIRS = xdg.get_dirs()
 
+# File systems may only store modification times with a resolution of a
+# second or two, so a file modified this recently may be modified again
+# without its modification time changing.
+RECENT_MTIME_SECONDS = 2
+
 
 def get_or_create_dir(dir_path):
     if not isinstance(dir_path, bytes):
@@ -203,6 +209,17 @@ def find_mtimes(root, follow=False):
     return mtimes, errors
 
 
+def is_recently_modified(mtime):
+    """
+    Whether a modification time is too recent to tell if the file changes.
+
+    Data derived from a file, like its parsed content or a directory listing,
+    shouldn't be cached using the modification time as the only validation
+    while this is true.
+    """
+    return mtime > time.time() - RECENT_MTIME_SECONDS
+
+
 def is_path_inside_base_dir(path, base_path):
     if not isinstance(path, bytes):
         raise ValueError('path is not a bytestring')
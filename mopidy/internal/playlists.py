@@ -1,8 +1,9 @@
 from __future__ import absolute_import, unicode_literals
 
 import io
+import itertools
+import logging
 
-from mopidy.compat import configparser
 from mopidy.internal import validation
 
 try:
@@ -10,18 +11,103 @@ try:
 except ImportError:
     import xml.etree.ElementTree as elementtree
 
+logger = logging.getLogger(__name__)
+
+# Number of bytes the playlist format is detected from.
+_HEADER_SIZE = 150
+
+# Longest line read from line based playlists. Longer lines are split, which
+# makes a URI list invalid, so that e.g. audio data isn't read to the end.
+_MAX_LINE_SIZE = 8192
+
+_XSPF_NS = '{http://xspf.org/ns/0/}'
+
 
 def parse(data):
-    handlers = {
-        detect_extm3u_header: parse_extm3u,
-        detect_pls_header: parse_pls,
-        detect_asx_header: parse_asx,
-        detect_xspf_header: parse_xspf,
-    }
-    for detector, parser in handlers.items():
-        if detector(data):
-            return list(parser(data))
-    return parse_urilist(data)  # Fallback
+    return parse_chunks([data])
+
+
+def parse_chunks(chunks, max_uris=None, max_size=None):
+    """
+    Parse a playlist, reading it chunk by chunk.
+
+    The format is detected from the first chunks, and then the playlist is
+    parsed in a single pass. Reading stops as soon as ``max_uris`` URIs have
+    been found, or when more than ``max_size`` bytes have been read, in which
+    case the URIs found so far are returned.
+
+    :param chunks: the playlist
+    :type chunks: iterable of bytes
+    :param max_uris: maximum number of URIs to return, or :class:`None`
+    :type max_uris: int
+    :param max_size: maximum number of bytes to read, or :class:`None`
+    :type max_size: int
+    :rtype: list of URIs
+    """
+    chunks = iter(chunks)
+    head = b''
+    for chunk in chunks:
+        head += chunk
+        if len(head) >= _HEADER_SIZE:
+            break
+
+    handlers = [
+        (detect_extm3u_header, _iter_extm3u),
+        (detect_pls_header, _iter_pls),
+        (detect_asx_header, _iter_asx),
+        (detect_xspf_header, _iter_xspf),
+    ]
+    for detector, parser in handlers:
+        if detector(head):
+            break
+    else:
+        parser = _iter_urilist  # Fallback
+
+    fh = io.BufferedReader(
+        _ChunkStream(itertools.chain([head], chunks), max_size))
+    try:
+        return list(itertools.islice(parser(fh), max_uris))
+    except ValueError:
+        return []
+
+
+class _ChunkStream(io.RawIOBase):
+
+    def __init__(self, chunks, max_size=None):
+        self._chunks = chunks
+        self._max_size = max_size
+        self._size = 0
+        self._buffer = b''
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            if self._max_size is not None:
+                if self._size + len(chunk) > self._max_size:
+                    logger.warning(
+                        'Stopped reading playlist after %d bytes',
+                        self._max_size)
+                    chunk = chunk[:self._max_size - self._size]
+                    self._chunks = iter([])
+            self._size += len(chunk)
+            self._buffer = chunk
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+
+def _iter_lines(fh):
+    while True:
+        line = fh.readline(_MAX_LINE_SIZE)
+        if not line:
+            return
+        yield line.rstrip(b'\r\n')
 
 
 def detect_extm3u_header(data):
@@ -61,9 +147,13 @@ def detect_asx_header(data):
 
 
 def parse_extm3u(data):
+    return _iter_extm3u(io.BytesIO(data))
+
+
+def _iter_extm3u(fh):
     # TODO: convert non URIs to file URIs.
     found_header = False
-    for line in data.splitlines():
+    for line in _iter_lines(fh):
         if found_header or line.startswith(b'#EXTM3U'):
             found_header = True
         else:
@@ -73,56 +163,75 @@ def parse_extm3u(data):
 
 
 def parse_pls(data):
-    # TODO: convert non URIs to file URIs.
-    try:
-        cp = configparser.RawConfigParser()
-        cp.readfp(io.BytesIO(data))
-    except configparser.Error:
-        return
+    return _iter_pls(io.BytesIO(data))
 
-    for section in cp.sections():
-        if section.lower() != 'playlist':
-            continue
-        for i in range(cp.getint(section, 'numberofentries')):
-            yield cp.get(section, 'file%d' % (i + 1))
+
+def _iter_pls(fh):
+    # TODO: convert non URIs to file URIs.
+    in_playlist = False
+    for line in _iter_lines(fh):
+        line = line.strip()
+        if line.startswith(b'['):
+            in_playlist = line.lower() == b'[playlist]'
+        elif in_playlist and line.lower().startswith(b'file'):
+            key, _, value = line.partition(b'=')
+            if key[4:].strip().isdigit():
+                yield value.strip()
 
 
 def parse_xspf(data):
-    try:
-        # Last element will be root.
-        for event, element in elementtree.iterparse(io.BytesIO(data)):
-            element.tag = element.tag.lower()  # normalize
-    except elementtree.ParseError:
-        return
+    return _iter_xspf(io.BytesIO(data))
+
 
-    ns = 'http://xspf.org/ns/0/'
-    for track in element.iterfind('{%s}tracklist/{%s}track' % (ns, ns)):
-        yield track.findtext('{%s}location' % ns)
+def _iter_xspf(fh):
+    path = [
+        _XSPF_NS + 'playlist', _XSPF_NS + 'tracklist', _XSPF_NS + 'track',
+        _XSPF_NS + 'location']
+    for stack, element in _iter_elements(fh):
+        if stack == path:
+            yield element.text or ''
+        elif stack == path[:3]:
+            element.clear()
 
 
 def parse_asx(data):
+    return _iter_asx(io.BytesIO(data))
+
+
+def _iter_asx(fh):
+    for stack, element in _iter_elements(fh):
+        if stack[1:] in (['entry', 'ref'], ['entry']):
+            if element.get('href') is not None:
+                yield element.get('href', '').strip()
+            if len(stack) == 2:
+                element.clear()
+
+
+def _iter_elements(fh):
+    """Yield the lowercased tag path and element as each element ends."""
+    stack = []
     try:
-        # Last element will be root.
-        for event, element in elementtree.iterparse(io.BytesIO(data)):
-            element.tag = element.tag.lower()  # normalize
+        for event, element in elementtree.iterparse(
+                fh, events=(b'start', b'end')):
+            if event == 'start':
+                stack.append(element.tag.lower())
+            else:
+                yield stack, element
+                stack.pop()
     except elementtree.ParseError:
         return
 
-    for ref in element.findall('entry/ref[@href]'):
-        yield ref.get('href', '').strip()
 
-    for entry in element.findall('entry[@href]'):
-        yield entry.get('href', '').strip()
+def parse_urilist(data):
+    try:
+        return list(_iter_urilist(io.BytesIO(data)))
+    except ValueError:
+        return []
 
 
-def parse_urilist(data):
-    result = []
-    for line in data.splitlines():
+def _iter_urilist(fh):
+    for line in _iter_lines(fh):
         if not line.strip() or line.startswith(b'#'):
             continue
-        try:
-            validation.check_uri(line)
-        except ValueError:
-            return []
-        result.append(line)
-    return result
+        validation.check_uri(line)
+        yield line
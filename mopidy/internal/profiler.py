@@ -0,0 +1,201 @@
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+import pykka
+
+from mopidy.internal import encoding, path, validation
+
+logger = logging.getLogger(__name__)
+
+# Suffix added by Python and Pykka to make thread names unique.
+_THREAD_NUMBER_RE = re.compile(r'-\d+$')
+
+# Threads which aren't actors, but which we know what are doing.
+_KNOWN_THREADS = {
+    'MainThread': 'MainThread (GLib main loop)',
+    'HttpServer': 'HttpServer (Tornado IOLoop)',
+}
+
+
+def get_thread_labels():
+    """
+    Get a label for each running thread, by thread ident.
+
+    The numbers added to thread names to make them unique are removed, so
+    that all threads running the same code get the same label. Threads of
+    Pykka actors are labeled with the actor class.
+    """
+    actor_classes = {}
+    for ref in pykka.ActorRegistry.get_all():
+        cls = ref.actor_class
+        actor_classes[cls.__name__] = '%s.%s' % (cls.__module__, cls.__name__)
+
+    labels = {}
+    for thread in threading.enumerate():
+        name = _THREAD_NUMBER_RE.sub('', thread.name)
+        labels[thread.ident] = actor_classes.get(
+            name, _KNOWN_THREADS.get(name, name))
+    return labels
+
+
+def _format_stack(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append('%s:%s' % (
+            frame.f_globals.get('__name__', code.co_filename), code.co_name))
+        frame = frame.f_back
+    stack.reverse()
+    return ';'.join(stack)
+
+
+class Profiler(object):
+
+    """
+    Sampling profiler for all of Mopidy's threads.
+
+    While running, the stack of each thread is sampled every ``interval``
+    seconds. When stopped, the samples are written in the collapsed stack
+    format used by tools like ``flamegraph.pl`` and speedscope: one line for
+    each distinct stack, with the thread label first and the innermost
+    function last, separated by semicolons, followed by the number of samples.
+
+    :param output_dir: directory to write the profiles to
+    :type output_dir: bytes
+    :param duration: default number of seconds to profile for
+    :type duration: int
+    :param interval: seconds between samples
+    :type interval: float
+
+    .. attribute:: last_profile
+
+        Path of the latest profile written, or :class:`None` if writing it
+        failed.
+    """
+
+    def __init__(self, output_dir=None, duration=30, interval=0.01):
+        self.output_dir = output_dir
+        self.duration = duration
+        self.interval = interval
+        self.last_profile = None
+        self._lock = threading.Lock()
+        self._stop_event = None
+        self._thread = None
+
+    def is_running(self):
+        """Whether the profiler is running."""
+        with self._lock:
+            return self._thread is not None
+
+    def start(self, duration=None):
+        """
+        Start profiling, unless already running.
+
+        Profiling isn't started if there is no :attr:`output_dir` to write
+        the profile to, e.g. when running other commands than the server.
+
+        :param duration: seconds to profile for, by default :attr:`duration`
+        :type duration: int
+        :returns: whether profiling was started
+        :rtype: bool
+        """
+        duration is None or validation.check_integer(duration, min=1)
+        if self.output_dir is None:
+            logger.warning('Not profiling, as there is no output dir')
+            return False
+        with self._lock:
+            if self._thread is not None:
+                return False
+            duration = duration or self.duration
+            self._stop_event = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, name='Profiler',
+                args=(self._stop_event, duration))
+            # Not a daemon thread, so that a profile stopped when Mopidy
+            # exits is written before the process ends.
+            self._thread.daemon = False
+            self._thread.start()
+        logger.info('Profiling for %d seconds', duration)
+        return True
+
+    def stop(self):
+        """
+        Stop profiling.
+
+        Returns without waiting for the profile to be written, as that is
+        done in the background. Its path is then found in
+        :attr:`last_profile`.
+
+        :returns: whether profiling was running
+        :rtype: bool
+        """
+        with self._lock:
+            if self._thread is None:
+                return False
+            self._stop_event.set()
+        return True
+
+    def toggle(self, *args):
+        """
+        Start profiling if not running, or stop it if it is.
+
+        Takes and ignores any arguments, so it can be used as a signal handler.
+        """
+        if not self.start():
+            self.stop()
+
+    def _run(self, stop_event, duration):
+        try:
+            self.last_profile = self._sample(stop_event, duration)
+        finally:
+            with self._lock:
+                self._thread = None
+
+    def _sample(self, stop_event, duration):
+        own_ident = threading.current_thread().ident
+        samples = collections.Counter()
+        labels = get_thread_labels()
+        start = time.time()
+        deadline = start + duration
+
+        while not stop_event.wait(self.interval) and time.time() < deadline:
+            frames = sys._current_frames()
+            if any(ident not in labels for ident in frames):
+                labels = get_thread_labels()
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                label = labels.get(ident, 'Thread-%d' % ident)
+                samples['%s;%s' % (label, _format_stack(frame))] += 1
+            del frames
+
+        return self._write(samples, start)
+
+    def _write(self, samples, start):
+        file_path = os.path.join(
+            self.output_dir, b'profile-%s.txt' % time.strftime(
+                '%Y%m%d-%H%M%S', time.localtime(start)).encode('ascii'))
+        try:
+            path.get_or_create_dir(self.output_dir)
+            with open(file_path, 'wb') as fh:
+                for stack, count in sorted(samples.items()):
+                    fh.write(('%s %d\n' % (stack, count)).encode('utf-8'))
+        except EnvironmentError as e:
+            logger.warning(
+                'Writing profile failed: %s', encoding.locale_decode(e))
+            return None
+        logger.info(
+            'Wrote profile with %d samples to %s',
+            sum(samples.values()), encoding.locale_decode(file_path))
+        return file_path
+
+
+#: The profiler used throughout Mopidy.
+profiler = Profiler()
@@ -1,13 +1,15 @@
 from __future__ import absolute_import, unicode_literals
 
+import collections
 import gzip
+import io
 import json
 import logging
 import os
 import tempfile
 
-from mopidy import models
 from mopidy.internal import encoding
+from mopidy.models import serialize
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +29,7 @@ def load(path):
         return {}
     try:
         with gzip.open(path, 'rb') as fp:
-            return json.load(fp, object_hook=models.model_json_decoder)
+            return serialize.decode_models(json.load(fp))
     except (IOError, ValueError) as error:
         logger.warning(
             'Loading JSON failed: %s',
@@ -52,9 +54,189 @@ def dump(path, data):
 
     try:
         with gzip.GzipFile(fileobj=tmp, mode='wb') as fp:
-            json.dump(data, fp, cls=models.ModelJSONEncoder,
-                      indent=2, separators=(',', ': '))
+            for chunk in serialize.iterencode_models(data):
+                fp.write(chunk.encode('utf-8'))
         os.rename(tmp.name, path)
     finally:
         if os.path.exists(tmp.name):
             os.remove(tmp.name)
+
+
+class LruCache(object):
+    """
+    Cache keeping the ``size`` most recently used entries, which can be saved
+    to and loaded from a file.
+
+    Each entry is a dict of values which can be serialized with :func:`dump`,
+    e.g. models, stored under a string key. Files saved with another
+    ``version`` are ignored when loading, so that the entries can be changed
+    without reading old entries by mistake.
+
+    :param size: maximum number of entries to keep
+    :type size: int
+    :param version: version of the entries' format
+    :type version: int
+    """
+
+    def __init__(self, size, version=1):
+        self.size = size
+        self.version = version
+        self.changed = False
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Get the entry for ``key`` and mark it as recently used."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._entries[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        """Add or replace the entry for ``key``."""
+        self._entries.pop(key, None)
+        self._entries[key] = entry
+        self._trim()
+        self.changed = True
+
+    def remove(self, key):
+        """Remove the entry for ``key``, if any."""
+        if self._entries.pop(key, None) is not None:
+            self.changed = True
+
+    def load(self, path, is_valid=None):
+        """
+        Load the entries saved to ``path``.
+
+        :param is_valid: called with each entry, which is skipped if it
+            returns false
+        :type is_valid: callable or :class:`None`
+        """
+        if not os.path.isfile(path):
+            return
+        data = load(path)
+        if data.get('version') != self.version:
+            logger.debug(
+                'Ignoring cache with unknown format: %s',
+                encoding.locale_decode(path))
+            return
+        for key, entry in data.get('entries', []):
+            if is_valid is None or is_valid(entry):
+                self._entries[key] = entry
+        self._trim()
+        self.changed = False
+
+    def save(self, path, is_valid=None):
+        """
+        Save the entries to ``path``.
+
+        :param is_valid: called with each entry, which isn't saved if it
+            returns false
+        :type is_valid: callable or :class:`None`
+        """
+        dump(path, {
+            'version': self.version,
+            'entries': [
+                [key, entry] for key, entry in self._entries.items()
+                if is_valid is None or is_valid(entry)],
+        })
+        self.changed = False
+
+    def _trim(self):
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+class Journal(object):
+    """
+    Append-only log of JSON serialized records, one record per line.
+
+    Appending a record only writes that record, so the journal can be kept
+    up to date while Mopidy is running without rewriting everything that has
+    already been stored. Use :meth:`rewrite` to compact the journal.
+
+    :param path: full path to the journal file
+    :type path: bytes
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.size = 0
+
+    def load(self):
+        """
+        Deserialize all records in the journal.
+
+        A truncated or otherwise broken record, e.g. from a crash while
+        writing, ends the loading and is ignored together with anything after
+        it.
+
+        :rtype: list
+        """
+        records = []
+        if not os.path.isfile(self.path):
+            self.size = 0
+            return records
+        try:
+            with io.open(self.path, 'rb') as fp:
+                for line in fp:
+                    if not line.strip():
+                        continue
+                    records.append(
+                        serialize.decode_models(json.loads(line)))
+        except (IOError, ValueError) as error:
+            logger.warning(
+                'Loading journal %s stopped after %d records: %s',
+                self.path, len(records), encoding.locale_decode(error))
+        self.size = len(records)
+        return records
+
+    def append(self, record):
+        """
+        Serialize and append a single record to the journal.
+
+        :param record: data to append
+        """
+        line = ''.join(serialize.iterencode_models(record))
+        try:
+            with io.open(self.path, 'ab') as fp:
+                fp.write(line.encode('utf-8') + b'\n')
+        except IOError as error:
+            logger.warning(
+                'Appending to journal %s failed: %s',
+                self.path, encoding.locale_decode(error))
+            return
+        self.size += 1
+
+    def rewrite(self, records):
+        """
+        Atomically replace the journal content with the given records.
+
+        :param records: data to store
+        :type records: list
+        """
+        directory, basename = os.path.split(self.path)
+        tmp = tempfile.NamedTemporaryFile(
+            prefix=basename + '.', dir=directory, delete=False)
+        try:
+            with tmp:
+                for record in records:
+                    line = ''.join(serialize.iterencode_models(record))
+                    tmp.write(line.encode('utf-8') + b'\n')
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.rename(tmp.name, self.path)
+        finally:
+            if os.path.exists(tmp.name):
+                os.remove(tmp.name)
+        self.size = len(records)
+
+    def clear(self):
+        """Remove the journal file."""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self.size = 0
@@ -0,0 +1,84 @@
+from __future__ import absolute_import, unicode_literals
+
+import sys
+import threading
+
+import pykka
+
+from mopidy import compat
+
+
+class WorkerPool(object):
+
+    """
+    Run functions in a bounded number of daemon threads.
+
+    Threads are started as needed, up to ``num_workers``, and are then kept
+    around waiting for more work. Work submitted while all threads are busy
+    is queued and run in order.
+
+    :param num_workers: maximum number of threads to run
+    :type num_workers: int
+    :param name: name prefix for the threads
+    :type name: string
+    """
+
+    def __init__(self, num_workers, name='Worker'):
+        self.num_workers = num_workers
+        self.name = name
+        self._queue = compat.queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._idle = 0
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Run ``func(*args, **kwargs)`` in a worker thread.
+
+        :returns: a future with the return value of ``func``
+        :rtype: :class:`pykka.ThreadingFuture`
+        """
+        future = pykka.ThreadingFuture()
+        with self._lock:
+            self._queue.put((future, func, args, kwargs))
+            if self._idle > 0:
+                self._idle -= 1
+            elif len(self._threads) < self.num_workers:
+                self._start_thread()
+        return future
+
+    def stop(self):
+        """Stop the threads once the work queued so far is done."""
+        with self._lock:
+            for _ in self._threads:
+                self._queue.put(None)
+            self._threads = []
+            self._idle = 0
+
+    def _start_thread(self):
+        thread = threading.Thread(
+            target=self._run,
+            name='%s-%d' % (self.name, len(self._threads) + 1))
+        thread.daemon = True
+        self._threads.append(thread)
+        thread.start()
+
+    def _run(self):
+        while True:
+            work = self._queue.get()
+            if work is None:
+                return
+            future, func, args, kwargs = work
+            value, exc_info = None, None
+            try:
+                value = func(*args, **kwargs)
+            except Exception:
+                exc_info = sys.exc_info()
+            # Count ourselves as idle before anyone waiting on the future can
+            # submit more work, so that no extra thread is started for it.
+            with self._lock:
+                self._idle += 1
+            if exc_info is None:
+                future.set(value)
+            else:
+                future.set_exception(exc_info=exc_info)
@@ -7,8 +7,12 @@ import pykka
 logger = logging.getLogger(__name__)
 
 
+# Listener class -> (all actor refs when cached, {event: listener refs})
+_listeners_cache = {}
+
+
 def send(cls, event, **kwargs):
-    listeners = pykka.ActorRegistry.get_by_class(cls)
+    listeners = _get_listeners(cls, event)
     logger.debug('Sending %s to %s: %s', event, cls.__name__, kwargs)
     for listener in listeners:
         # Save time by calling methods on Pykka actor without creating a
@@ -28,6 +32,35 @@ def send(cls, event, **kwargs):
         })
 
 
+def _get_listeners(cls, event):
+    # The listeners are cached until any actor is started or stopped. Looking
+    # them up again means checking every actor's class and methods, which is
+    # a lot slower than comparing the actor refs to the cached ones.
+    refs = pykka.ActorRegistry.get_all()
+    cached = _listeners_cache.get(cls)
+    if cached is None or cached[0] != refs:
+        cached = _listeners_cache[cls] = (refs, {})
+    listeners = cached[1].get(event)
+    if listeners is None:
+        listeners = cached[1][event] = [
+            ref for ref in refs
+            if issubclass(ref.actor_class, cls) and
+            _handles_event(ref.actor_class, cls, event)]
+    return listeners
+
+
+def _handles_event(actor_class, cls, event):
+    # Don't send events to actors which only have the listener's default
+    # implementations for them, as those don't do anything.
+    for name in ('on_event', event):
+        method = getattr(actor_class, name, None)
+        default = getattr(cls, name, None)
+        if getattr(method, '__func__', method) is not getattr(
+                default, '__func__', default):
+            return True
+    return False
+
+
 class Listener(object):
 
     def on_event(self, event, **kwargs):
@@ -29,18 +29,22 @@ class Extension(ext.Extension):
         schema['scan_timeout'] = config.Integer(
             minimum=1000, maximum=1000 * 60 * 60)
         schema['scan_flush_threshold'] = config.Integer(minimum=0)
+        schema['scan_mode'] = config.String(
+            choices=['tags_only', 'tags_and_duration_estimate', 'exact'])
         schema['scan_follow_symlinks'] = config.Boolean()
         schema['excluded_file_extensions'] = config.List(optional=True)
         return schema
 
     def setup(self, registry):
         from .actor import LocalBackend
+        from .compact import CompactLibrary
         from .json import JsonLibrary
 
         LocalBackend.libraries = registry['local:library']
 
         registry.add('backend', LocalBackend)
         registry.add('local:library', JsonLibrary)
+        registry.add('local:library', CompactLibrary)
 
     def get_command(self):
         from .commands import LocalCommand
@@ -185,7 +189,9 @@ class Library(object):
         :param track: Track to add to the library
         :type track: :class:`~mopidy.models.Track`
         :param tags: All the tags the scanner found for the media. See
-            :mod:`mopidy.audio.utils` for details about the tags.
+            :mod:`mopidy.audio.utils` for details about the tags. Embedded
+            images are replaced by the URIs of the images stored in the
+            local data dir, which are also in the track's album images.
         :type tags: dictionary of tag keys with a list of values.
         :param duration: Duration of media in milliseconds or :class:`None` if
             unknown
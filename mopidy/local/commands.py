@@ -1,14 +1,15 @@
 from __future__ import (
     absolute_import, division, print_function, unicode_literals)
 
+import collections
 import logging
 import os
 import time
 
-from mopidy import commands, compat, exceptions
+from mopidy import commands, compat, exceptions, local
 from mopidy.audio import scan, tags
 from mopidy.internal import path
-from mopidy.local import translator
+from mopidy.local import images, translator
 
 
 logger = logging.getLogger(__name__)
@@ -74,6 +75,7 @@ class ScanCommand(commands.Command):
         media_dir = config['local']['media_dir']
         scan_timeout = config['local']['scan_timeout']
         flush_threshold = config['local']['scan_flush_threshold']
+        scan_mode = config['local']['scan_mode']
         excluded_file_extensions = config['local']['excluded_file_extensions']
         excluded_file_extensions = tuple(
             bytes(file_ext.lower()) for file_ext in excluded_file_extensions)
@@ -132,26 +134,41 @@ class ScanCommand(commands.Command):
         uris_to_update = sorted(uris_to_update, key=lambda v: v.lower())
         uris_to_update = uris_to_update[:args.limit]
 
-        scanner = scan.Scanner(scan_timeout)
+        scanner = scan.ScanService(proxy_config=config['proxy'])
+        image_store = images.ImageStore(os.path.join(
+            local.Extension.get_data_dir(config), b'images'))
         progress = _Progress(flush_threshold, len(uris_to_update))
+        scans = _scan_ahead(
+            scanner, uris_to_update, media_dir, scan_timeout, scan_mode)
 
-        for uri in uris_to_update:
+        for uri, future in scans:
             try:
                 relpath = translator.local_track_uri_to_path(uri, media_dir)
-                file_uri = path.path_to_uri(os.path.join(media_dir, relpath))
-                result = scanner.scan(file_uri)
+                result = future.get()
+                if result.duration is not None:
+                    too_short = result.duration < MIN_DURATION_MS
+                else:
+                    # Only the exact scan mode always finds the duration.
+                    too_short = scan_mode == scan.EXACT
                 if not result.playable:
                     logger.warning('Failed %s: No audio found in file.', uri)
-                elif result.duration < MIN_DURATION_MS:
+                elif too_short:
                     logger.warning('Failed %s: Track shorter than %dms',
                                    uri, MIN_DURATION_MS)
                 else:
                     mtime = file_mtimes.get(os.path.join(media_dir, relpath))
-                    track = tags.convert_tags_to_track(result.tags).replace(
+                    track_tags = image_store.store_images(result.tags)
+                    track = tags.convert_tags_to_track(track_tags).replace(
                         uri=uri, length=result.duration, last_modified=mtime)
+                    image_uris = [
+                        image_uri for tag in images.IMAGE_TAGS
+                        for image_uri in track_tags.get(tag, [])]
+                    if track.album and image_uris:
+                        track = track.replace(
+                            album=track.album.replace(images=image_uris))
                     if library.add_supports_tags_and_duration:
                         library.add(
-                            track, tags=result.tags, duration=result.duration)
+                            track, tags=track_tags, duration=result.duration)
                     else:
                         library.add(track)
                     logger.debug('Added %s', track.uri)
@@ -164,11 +181,32 @@ class ScanCommand(commands.Command):
                     logger.debug('Progress flushed.')
 
         progress.log()
+        scanner.stop()
         library.close()
         logger.info('Done scanning.')
         return 0
 
 
+def _scan_ahead(scanner, uris, media_dir, timeout, mode):
+    """
+    Scan files in parallel, yielding ``(uri, future)`` in the given order.
+
+    A few files more than the scanner has workers are scanned ahead of the
+    one being yielded, so that the workers are kept busy while the results
+    are added to the library.
+    """
+    pending = collections.deque()
+    for uri in uris:
+        relpath = translator.local_track_uri_to_path(uri, media_dir)
+        file_uri = path.path_to_uri(os.path.join(media_dir, relpath))
+        pending.append((uri, scanner.scan_async(
+            file_uri, timeout=timeout, mode=mode)))
+        if len(pending) > scanner.num_workers * 2:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
 class _Progress(object):
 
     def __init__(self, batch_size, total):
@@ -0,0 +1,323 @@
+from __future__ import absolute_import, unicode_literals
+
+import array
+import base64
+import logging
+import os
+import sys
+
+import mopidy
+from mopidy import local, models
+from mopidy.internal import storage as internal_storage
+from mopidy.internal import timer
+from mopidy.local import browse, search, storage
+
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the layout of the stored columns changes.
+FORMAT_VERSION = 1
+
+_STRING_FIELDS = ('name', 'genre', 'date', 'comment', 'musicbrainz_id')
+_INTEGER_FIELDS = ('track_no', 'disc_no', 'bitrate')
+# Stored as doubles, as they may not fit in a C int.
+_LARGE_INTEGER_FIELDS = ('length', 'last_modified')
+_ARTIST_FIELDS = ('artists', 'composers', 'performers')
+_FIELDS = (
+    _STRING_FIELDS + _INTEGER_FIELDS + _LARGE_INTEGER_FIELDS +
+    ('album',) + _ARTIST_FIELDS)
+
+
+class _TrackStore(object):
+
+    """
+    Track metadata stored as one array per field instead of one model per
+    track.
+
+    Strings, albums and artists are stored once in tables, and referenced by
+    their index in the table. Missing values are stored as ``-1``. Each
+    artist field is stored as an array of artist indexes for all tracks, and
+    an array with the offset of each track's artists into it.
+    """
+
+    def __init__(self):
+        self.uris = []
+        self.rows = {}
+        self.strings = []
+        self.albums = []
+        self.artists = []
+        self.columns = {}
+        for field in _STRING_FIELDS + _INTEGER_FIELDS + ('album',):
+            self.columns[field] = array.array(b'i')
+        for field in _LARGE_INTEGER_FIELDS:
+            self.columns[field] = array.array(b'd')
+        for field in _ARTIST_FIELDS:
+            self.columns[field] = array.array(b'i', [0])
+            self.columns[field + '_values'] = array.array(b'i')
+        self._indexes = None
+
+    def __len__(self):
+        return len(self.uris)
+
+    def _intern(self, table, value):
+        if value is None:
+            return -1
+        if self._indexes is None:
+            # Only needed while adding tracks, so built on first use.
+            self._indexes = {
+                name: {v: i for i, v in enumerate(getattr(self, name))}
+                for name in ('strings', 'albums', 'artists')}
+        index = self._indexes[table].get(value)
+        if index is None:
+            values = getattr(self, table)
+            index = self._indexes[table][value] = len(values)
+            values.append(value)
+        return index
+
+    def append(self, track):
+        self.rows[track.uri] = len(self.uris)
+        self.uris.append(track.uri)
+        for field in _STRING_FIELDS:
+            self.columns[field].append(
+                self._intern('strings', getattr(track, field)))
+        for field in _INTEGER_FIELDS + _LARGE_INTEGER_FIELDS:
+            value = getattr(track, field)
+            self.columns[field].append(-1 if value is None else value)
+        self.columns['album'].append(self._intern('albums', track.album))
+        for field in _ARTIST_FIELDS:
+            values = self.columns[field + '_values']
+            values.extend(
+                self._intern('artists', a) for a in getattr(track, field))
+            self.columns[field].append(len(values))
+
+    def get(self, row, field):
+        if field == 'uri':
+            return self.uris[row]
+        elif field in _STRING_FIELDS:
+            index = self.columns[field][row]
+            return None if index < 0 else self.strings[index]
+        elif field in _INTEGER_FIELDS or field in _LARGE_INTEGER_FIELDS:
+            value = self.columns[field][row]
+            return None if value < 0 else int(value)
+        elif field == 'album':
+            index = self.columns[field][row]
+            return None if index < 0 else self.albums[index]
+        elif field in _ARTIST_FIELDS:
+            offsets = self.columns[field]
+            values = self.columns[field + '_values']
+            return [
+                self.artists[i]
+                for i in values[offsets[row]:offsets[row + 1]]]
+        raise AttributeError(field)
+
+    def track(self, row):
+        kwargs = {'uri': self.uris[row]}
+        for field in _FIELDS:
+            value = self.get(row, field)
+            if value is not None and value != []:
+                kwargs[field] = value
+        return models.Track(**kwargs)
+
+    def views(self):
+        return [_TrackView(self, row) for row in range(len(self.uris))]
+
+    def serialize(self):
+        return {
+            'format': FORMAT_VERSION,
+            'byteorder': sys.byteorder,
+            'uris': self.uris,
+            'strings': self.strings,
+            'albums': self.albums,
+            'artists': self.artists,
+            'columns': {
+                name: base64.b64encode(column.tostring())
+                for name, column in self.columns.items()},
+        }
+
+    @classmethod
+    def deserialize(cls, data):
+        store = cls()
+        store.uris = data['uris']
+        store.rows = {uri: row for row, uri in enumerate(store.uris)}
+        store.strings = data['strings']
+        store.albums = data['albums']
+        store.artists = data['artists']
+        for name, column in store.columns.items():
+            del column[:]
+            column.fromstring(base64.b64decode(data['columns'][name]))
+        return store
+
+
+def _field_property(field):
+    return property(lambda self: self._store.get(self._row, field))
+
+
+class _TrackView(object):
+
+    """
+    Read-only view of a row in a :class:`_TrackStore`.
+
+    Provides the :class:`~mopidy.models.Track` attributes without creating
+    the model, so the library can be searched without materializing every
+    track.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    # The most searched fields are spelled out, the rest are added below.
+
+    @property
+    def uri(self):
+        return self._store.uris[self._row]
+
+    @property
+    def name(self):
+        index = self._store.columns['name'][self._row]
+        return None if index < 0 else self._store.strings[index]
+
+    @property
+    def album(self):
+        index = self._store.columns['album'][self._row]
+        return None if index < 0 else self._store.albums[index]
+
+
+for _field in _FIELDS:
+    if not hasattr(_TrackView, _field):
+        setattr(_TrackView, _field, _field_property(_field))
+
+
+class CompactLibrary(local.Library):
+
+    """
+    Local library keeping the track metadata in columns.
+
+    Uses far less memory than :class:`~mopidy.local.json.JsonLibrary` for
+    large libraries, as :class:`~mopidy.models.Track` models are only
+    created for the tracks returned by :meth:`lookup` and :meth:`search`.
+    """
+
+    name = 'compact'
+
+    def __init__(self, config):
+        self._store = _TrackStore()
+        self._added = {}
+        self._removed = set()
+        self._browse_cache = None
+        self._media_dir = config['local']['media_dir']
+        self._json_file = os.path.join(
+            local.Extension.get_data_dir(config), b'library.compact.json.gz')
+
+        storage.check_dirs_and_files(config)
+
+    def browse(self, uri):
+        if not self._browse_cache:
+            return []
+        return self._browse_cache.lookup(uri)
+
+    def load(self):
+        logger.debug('Loading library: %s', self._json_file)
+        with timer.time_logger('Loading tracks'):
+            self._store = _TrackStore()
+            if not os.path.isfile(self._json_file):
+                logger.info(
+                    'No local library metadata cache found at %s. Please run '
+                    '`mopidy local scan` to index your local music library. '
+                    'If you do not have a local music collection, you can '
+                    'disable the local backend to hide this message.',
+                    self._json_file)
+            else:
+                data = internal_storage.load(self._json_file)
+                if data and (data.get('format') != FORMAT_VERSION or
+                             data.get('byteorder') != sys.byteorder):
+                    logger.warning(
+                        'Local library metadata cache at %s was written by '
+                        'an incompatible version of Mopidy. Please run '
+                        '`mopidy local scan --force` to rebuild it.',
+                        self._json_file)
+                elif data:
+                    self._store = _TrackStore.deserialize(data)
+        with timer.time_logger('Building browse cache'):
+            self._browse_cache = browse.BrowseCache(sorted(self._store.uris))
+        return len(self._store)
+
+    def lookup(self, uri):
+        row = self._store.rows.get(uri)
+        if row is None:
+            return []
+        return [self._store.track(row)]
+
+    def get_distinct(self, field, query=None):
+        if field == 'track':
+            field = 'name'
+        if field == 'albumartist':
+            def distinct(track):
+                album = track.album or models.Album()
+                return {a.name for a in album.artists}
+        elif field == 'album':
+            def distinct(track):
+                album = track.album or models.Album()
+                return {album.name}
+        elif field in ('artist', 'composer', 'performer'):
+            def distinct(track):
+                return {a.name for a in getattr(track, field + 's')}
+        elif field in ('name', 'date', 'genre'):
+            def distinct(track):
+                return {getattr(track, field)}
+        else:
+            return set()
+
+        distinct_result = set()
+        for track in search.match(self._store.views(), query):
+            distinct_result.update(distinct(track))
+        return distinct_result - {None}
+
+    def search(self, query=None, limit=100, offset=0, uris=None, exact=False):
+        # TODO Only return results within URI roots given by ``uris``
+        if exact:
+            views = search.match_exact(self._store.views(), query)
+        else:
+            views = search.match(self._store.views(), query)
+        if limit is None:
+            views = views[offset:]
+        else:
+            views = views[offset:offset + limit]
+        return models.SearchResult(
+            uri='local:search',
+            tracks=[self._store.track(view._row) for view in views])
+
+    def begin(self):
+        return (self._store.track(row) for row in range(len(self._store)))
+
+    def add(self, track):
+        self._added[track.uri] = track
+        self._removed.discard(track.uri)
+
+    def remove(self, uri):
+        self._added.pop(uri, None)
+        self._removed.add(uri)
+
+    def close(self):
+        store = _TrackStore()
+        for row, uri in enumerate(self._store.uris):
+            if uri not in self._added and uri not in self._removed:
+                store.append(self._store.track(row))
+        for track in self._added.values():
+            store.append(track)
+        self._store = store
+        self._added.clear()
+        self._removed.clear()
+
+        data = store.serialize()
+        data['version'] = mopidy.__version__
+        internal_storage.dump(self._json_file, data)
+
+    def clear(self):
+        try:
+            os.remove(self._json_file)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,81 @@
+from __future__ import absolute_import, unicode_literals
+
+import hashlib
+import imghdr
+import logging
+import os
+import tempfile
+
+from mopidy.internal import encoding, path
+
+logger = logging.getLogger(__name__)
+
+# Tags which may hold images embedded in media files.
+IMAGE_TAGS = ('image', 'preview-image')
+
+
+class ImageStore(object):
+
+    """
+    Content addressed store of images embedded in media files.
+
+    Each image is written once, to a file named by the SHA-1 hash of its
+    content, so that all the tracks of an album embedding the same cover
+    share one file.
+
+    :param image_dir: directory to keep the images in
+    :type image_dir: bytes
+    """
+
+    def __init__(self, image_dir):
+        self.image_dir = image_dir
+        self._uris = {}
+
+    def add(self, data):
+        """
+        Store an image.
+
+        :param data: the image
+        :type data: bytes
+        :returns: file URI of the stored image, or :class:`None` if it
+            couldn't be stored
+        """
+        key = hashlib.sha1(data).hexdigest()
+        uri = self._uris.get(key)
+        if uri is not None:
+            return uri
+
+        kind = imghdr.what(None, data[:32])
+        name = bytes('%s.%s' % (key, kind) if kind else key)
+        file_path = os.path.join(self.image_dir, name)
+        if not os.path.isfile(file_path):
+            try:
+                path.get_or_create_dir(self.image_dir)
+                with tempfile.NamedTemporaryFile(
+                        prefix=b'tmp', dir=self.image_dir,
+                        delete=False) as fh:
+                    fh.write(data)
+                os.rename(fh.name, file_path)
+            except EnvironmentError as e:
+                logger.warning(
+                    'Storing image failed: %s', encoding.locale_decode(e))
+                return None
+
+        uri = self._uris[key] = path.path_to_uri(file_path)
+        return uri
+
+    def store_images(self, tags):
+        """
+        Store the images in ``tags``.
+
+        :param tags: tags as returned by the scanner
+        :type tags: dictionary of tag keys with a list of values
+        :returns: a copy of ``tags`` with the images replaced by their URIs
+        :rtype: dictionary of tag keys with a list of values
+        """
+        result = dict(tags)
+        for tag in IMAGE_TAGS:
+            if tag in result:
+                uris = (self.add(data) for data in result[tag] if data)
+                result[tag] = [uri for uri in uris if uri is not None]
+        return result
@@ -1,74 +1,18 @@
 from __future__ import absolute_import, absolute_import, unicode_literals
 
-import collections
 import logging
 import os
-import re
-import sys
 
 import mopidy
 from mopidy import compat, local, models
 from mopidy.internal import storage as internal_storage
 from mopidy.internal import timer
-from mopidy.local import search, storage, translator
+from mopidy.local import browse, search, storage
 
 
 logger = logging.getLogger(__name__)
 
 
-class _BrowseCache(object):
-    encoding = sys.getfilesystemencoding()
-    splitpath_re = re.compile(r'([^/]+)')
-
-    def __init__(self, uris):
-        self._cache = {
-            local.Library.ROOT_DIRECTORY_URI: collections.OrderedDict()}
-
-        for track_uri in uris:
-            path = translator.local_track_uri_to_path(track_uri, b'/')
-            parts = self.splitpath_re.findall(
-                path.decode(self.encoding, 'replace'))
-            track_ref = models.Ref.track(uri=track_uri, name=parts.pop())
-
-            # Look for our parents backwards as this is faster than having to
-            # do a complete search for each add.
-            parent_uri = None
-            child = None
-            for i in reversed(range(len(parts))):
-                directory = '/'.join(parts[:i + 1])
-                uri = translator.path_to_local_directory_uri(directory)
-
-                # First dir we process is our parent
-                if not parent_uri:
-                    parent_uri = uri
-
-                # We found ourselves and we exist, done.
-                if uri in self._cache:
-                    if child:
-                        self._cache[uri][child.uri] = child
-                    break
-
-                # Initialize ourselves, store child if present, and add
-                # ourselves as child for next loop.
-                self._cache[uri] = collections.OrderedDict()
-                if child:
-                    self._cache[uri][child.uri] = child
-                child = models.Ref.directory(uri=uri, name=parts[i])
-            else:
-                # Loop completed, so final child needs to be added to root.
-                if child:
-                    self._cache[
-                        local.Library.ROOT_DIRECTORY_URI][child.uri] = child
-                # If no parent was set we belong in the root.
-                if not parent_uri:
-                    parent_uri = local.Library.ROOT_DIRECTORY_URI
-
-            self._cache[parent_uri][track_uri] = track_ref
-
-    def lookup(self, uri):
-        return self._cache.get(uri, {}).values()
-
-
 class JsonLibrary(local.Library):
     name = 'json'
 
@@ -102,7 +46,8 @@ class JsonLibrary(local.Library):
                 self._tracks = dict((t.uri, t) for t in
                                     library.get('tracks', []))
         with timer.time_logger('Building browse cache'):
-            self._browse_cache = _BrowseCache(sorted(self._tracks.keys()))
+            self._browse_cache = browse.BrowseCache(
+                sorted(self._tracks.keys()))
         return len(self._tracks)
 
     def lookup(self, uri):
@@ -142,8 +87,7 @@ class JsonLibrary(local.Library):
             return set()
 
         distinct_result = set()
-        search_result = search.search(self._tracks.values(), query, limit=None)
-        for track in search_result.tracks:
+        for track in search.match(self._tracks.values(), query):
             distinct_result.update(distinct(track))
         return distinct_result - {None}
 
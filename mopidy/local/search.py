@@ -16,11 +16,32 @@ def find_exact(tracks, query=None, limit=100, offset=0, uris=None):
     :rtype: :class:`~mopidy.models.SearchResult`
     """
     # TODO Only return results within URI roots given by ``uris``
+    tracks = match_exact(tracks, query)
+    if limit is None:
+        tracks = tracks[offset:]
+    else:
+        tracks = tracks[offset:offset + limit]
+    # TODO: add local:search:<query>
+    return SearchResult(uri='local:search', tracks=tracks)
+
+
+def match_exact(tracks, query=None):
+    """
+    Filter ``tracks`` like :func:`find_exact`, without limiting the result.
 
+    The tracks only need to provide the attributes of
+    :class:`~mopidy.models.Track` which are searched, so libraries can pass
+    lightweight row objects instead of full track models.
+
+    :param tracks: an iterable of tracks
+    :param dict query: one or more field/value pairs to search for
+    :rtype: list of tracks
+    """
     if query is None:
         query = {}
 
     _validate_query(query)
+    tracks = list(tracks)
 
     for (field, values) in query.items():
         # FIXME this is bound to be slow for large libraries
@@ -104,12 +125,7 @@ def find_exact(tracks, query=None, limit=100, offset=0, uris=None):
             else:
                 raise LookupError('Invalid lookup field: %s' % field)
 
-    if limit is None:
-        tracks = tracks[offset:]
-    else:
-        tracks = tracks[offset:offset + limit]
-    # TODO: add local:search:<query>
-    return SearchResult(uri='local:search', tracks=tracks)
+    return tracks
 
 
 def search(tracks, query=None, limit=100, offset=0, uris=None):
@@ -125,11 +141,32 @@ def search(tracks, query=None, limit=100, offset=0, uris=None):
     :rtype: :class:`~mopidy.models.SearchResult`
     """
     # TODO Only return results within URI roots given by ``uris``
+    tracks = match(tracks, query)
+    if limit is None:
+        tracks = tracks[offset:]
+    else:
+        tracks = tracks[offset:offset + limit]
+    # TODO: add local:search:<query>
+    return SearchResult(uri='local:search', tracks=tracks)
+
+
+def match(tracks, query=None):
+    """
+    Filter ``tracks`` like :func:`search`, without limiting the result.
 
+    The tracks only need to provide the attributes of
+    :class:`~mopidy.models.Track` which are searched, so libraries can pass
+    lightweight row objects instead of full track models.
+
+    :param tracks: an iterable of tracks
+    :param dict query: one or more field/value pairs to search for
+    :rtype: list of tracks
+    """
     if query is None:
         query = {}
 
     _validate_query(query)
+    tracks = list(tracks)
 
     for (field, values) in query.items():
         # FIXME this is bound to be slow for large libraries
@@ -217,12 +254,7 @@ def search(tracks, query=None, limit=100, offset=0, uris=None):
             else:
                 raise LookupError('Invalid lookup field: %s' % field)
 
-    if limit is None:
-        tracks = tracks[offset:]
-    else:
-        tracks = tracks[offset:offset + limit]
-    # TODO: add local:search:<query>
-    return SearchResult(uri='local:search', tracks=tracks)
+    return tracks
 
 
 def _validate_query(query):
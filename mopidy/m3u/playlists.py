@@ -64,22 +64,24 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
         self._base_dir = ext_config['base_dir'] or self._playlists_dir
         self._default_encoding = ext_config['default_encoding']
         self._default_extension = ext_config['default_extension']
+        self._refs = None
+        self._refs_mtime = None
+        self._items = {}
 
     def as_list(self):
-        result = []
-        for entry in os.listdir(self._playlists_dir):
-            if not entry.endswith((b'.m3u', b'.m3u8')):
-                continue
-            elif not os.path.isfile(self._abspath(entry)):
-                continue
+        mtime = os.stat(self._playlists_dir).st_mtime
+        if self._refs is None or mtime != self._refs_mtime:
+            self._refs = self._list_refs()
+            if path.is_recently_modified(mtime):
+                self._refs_mtime = None
             else:
-                result.append(translator.path_to_ref(entry))
-        result.sort(key=operator.attrgetter('name'))
-        return result
+                self._refs_mtime = mtime
+        return list(self._refs)
 
     def create(self, name):
         path = translator.path_from_name(name.strip(), self._default_extension)
         try:
+            self._invalidate(path)
             with self._open(path, 'w'):
                 pass
             mtime = os.path.getmtime(self._abspath(path))
@@ -94,6 +96,7 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
             logger.debug('Ignoring path outside playlist dir: %s', uri)
             return False
         try:
+            self._invalidate(path)
             os.remove(self._abspath(path))
         except EnvironmentError as e:
             log_environment_error('Error deleting playlist %s' % uri, e)
@@ -107,12 +110,11 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
             logger.debug('Ignoring path outside playlist dir: %s', uri)
             return None
         try:
-            with self._open(path, 'r') as fp:
-                items = translator.load_items(fp, self._base_dir)
+            items, _ = self._load_items(path)
         except EnvironmentError as e:
             log_environment_error('Error reading playlist %s' % uri, e)
         else:
-            return items
+            return list(items)
 
     def lookup(self, uri):
         path = translator.uri_to_path(uri)
@@ -120,16 +122,20 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
             logger.debug('Ignoring path outside playlist dir: %s', uri)
             return None
         try:
-            with self._open(path, 'r') as fp:
-                items = translator.load_items(fp, self._base_dir)
-            mtime = os.path.getmtime(self._abspath(path))
+            items, mtime = self._load_items(path)
         except EnvironmentError as e:
             log_environment_error('Error reading playlist %s' % uri, e)
         else:
             return translator.playlist(path, items, mtime)
 
     def refresh(self):
-        pass  # nothing to do
+        self._refs = None
+        for ref in self.as_list():
+            path = translator.uri_to_path(ref.uri)
+            try:
+                self._load_items(path)
+            except EnvironmentError as e:
+                log_environment_error('Error reading playlist %s' % ref.uri, e)
 
     def save(self, playlist):
         path = translator.uri_to_path(playlist.uri)
@@ -139,11 +145,13 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
             return None
         name = translator.name_from_path(path)
         try:
+            self._invalidate(path)
             with self._open(path, 'w') as fp:
                 translator.dump_items(playlist.tracks, fp)
             if playlist.name and playlist.name != name:
                 opath, ext = os.path.splitext(path)
                 path = translator.path_from_name(playlist.name.strip()) + ext
+                self._invalidate(path)
                 os.rename(self._abspath(opath + ext), self._abspath(path))
             mtime = os.path.getmtime(self._abspath(path))
         except EnvironmentError as e:
@@ -154,6 +162,41 @@ class M3UPlaylistsProvider(backend.PlaylistsProvider):
     def _abspath(self, path):
         return os.path.join(self._playlists_dir, path)
 
+    def _list_refs(self):
+        result = []
+        found = set()
+        for entry in os.listdir(self._playlists_dir):
+            if not entry.endswith((b'.m3u', b'.m3u8')):
+                continue
+            elif not os.path.isfile(self._abspath(entry)):
+                continue
+            else:
+                found.add(self._abspath(entry))
+                result.append(translator.path_to_ref(entry))
+        for abspath in set(self._items) - found:
+            del self._items[abspath]
+        result.sort(key=operator.attrgetter('name'))
+        return result
+
+    def _load_items(self, local_path):
+        abspath = self._abspath(local_path)
+        stat = os.stat(abspath)
+        key = (stat.st_mtime, stat.st_size)
+        entry = self._items.get(abspath)
+        if entry is not None and entry[0] == key:
+            return entry[1], stat.st_mtime
+        with self._open(local_path, 'r') as fp:
+            items = tuple(translator.load_items(fp, self._base_dir))
+        if path.is_recently_modified(stat.st_mtime):
+            self._items.pop(abspath, None)
+        else:
+            self._items[abspath] = (key, items)
+        return items, stat.st_mtime
+
+    def _invalidate(self, path):
+        self._refs = None
+        self._items.pop(self._abspath(path), None)
+
     def _is_in_basedir(self, local_path):
         if not os.path.isabs(local_path):
             local_path = os.path.join(self._playlists_dir, local_path)
@@ -40,6 +40,10 @@ class Field(object):
                             (self._name, self._choices, value))
         return value
 
+    def normalize(self, value):
+        """Modify a known valid field value like :meth:`validate` would"""
+        return value
+
     def __get__(self, instance, owner):
         if not instance:
             return self
@@ -96,6 +100,9 @@ class Identifier(String):
     """
     def validate(self, value):
         value = super(Identifier, self).validate(value)
+        return self.normalize(value)
+
+    def normalize(self, value):
         if isinstance(value, compat.text_type):
             value = value.encode('utf-8')
         return compat.intern(value)
@@ -168,4 +175,7 @@ class Collection(Field):
             if not isinstance(v, self._type):
                 raise TypeError('Expected %s to be a collection of %s, not %r'
                                 % (self._name, self._type.__name__, value))
+        return self.normalize(value)
+
+    def normalize(self, value):
         return self._default.__class__(value) or None
@@ -5,12 +5,15 @@ import itertools
 import weakref
 
 from mopidy.internal import deprecation
-from mopidy.models.fields import Field
+from mopidy.models.fields import Collection, Field
 
 
 # Registered models for automatic deserialization
 _models = {}
 
+# Marker for fields without a value
+_unset = object()
+
 
 class ImmutableObject(object):
     """
@@ -157,17 +160,122 @@ class _ValidatedImmutableObjectMeta(type):
         clsc = super(_ValidatedImmutableObjectMeta, cls).__new__(
             cls, name, bases, attrs)
 
+        clsc._field_objects = {
+            key: getattr(clsc, key) for key in fields}
+
         if clsc.__name__ != 'ValidatedImmutableObject':
             _models[clsc.__name__] = clsc
 
         return clsc
 
     def __call__(cls, *args, **kwargs):  # noqa: N805
+        # Look for an existing instance before paying for a new one.
+        if kwargs and not args:
+            probe = _InstanceProbe.create(cls, kwargs)
+            if probe is not None:
+                instance = cls._instances.get(probe)
+                if instance is not None:
+                    return instance
+
         instance = super(_ValidatedImmutableObjectMeta, cls).__call__(
             *args, **kwargs)
         return cls._instances.setdefault(weakref.ref(instance), instance)
 
 
+class _InstanceProbe(object):
+
+    """
+    Stand-in for a model instance that has not been created yet.
+
+    Hashes like the instance would, and compares equal to existing instances
+    with the exact same field values, so it can be used to look up an
+    instance in the ``_instances`` of the model.
+    """
+
+    __slots__ = ['cls', 'values', 'hash']
+
+    def __init__(self, cls, values):
+        self.cls = cls
+        self.values = values
+        self.hash = 0
+        for key, value in values.items():
+            self.hash += hash(key) + hash(value)
+
+    @classmethod
+    def create(cls, model, kwargs):
+        """Create a probe, or return :class:`None` if ``kwargs`` are not
+        obviously valid, leaving it to the model constructor to complain."""
+        try:
+            values = _normalize(model, kwargs, check=True)
+            if values is not None:
+                return cls(model, values)
+        except TypeError:  # E.g. unhashable values
+            pass
+        return None
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        instance = other() if isinstance(other, weakref.ref) else other
+        if type(instance) is not self.cls:
+            return False
+        slots = self.cls._fields
+        for key, value in self.values.items():
+            current = getattr(instance, slots[key], None)
+            if current is not value and (
+                    type(current) is not type(value) or current != value):
+                return False
+        # The instance must not have any other fields set.
+        num_values = 0
+        for slot in slots.itervalues():
+            if hasattr(instance, slot):
+                num_values += 1
+        return num_values == len(self.values)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+
+def _normalize(cls, kwargs, check=False):
+    values = {}
+    for key, value in kwargs.items():
+        field = cls._field_objects.get(key)
+        if field is None:
+            return None
+        if value is None:
+            continue
+        if check and isinstance(field, Collection) and not isinstance(
+                value, (list, tuple, set, frozenset)):
+            return None
+        value = field.normalize(value)
+        if value is not None and value != field._default:
+            values[key] = value
+    return values
+
+
+def _create_trusted(cls, kwargs):
+    """
+    Create a model instance without validating the field values.
+
+    Only for data we have serialized ourselves, e.g. when loading files
+    written by Mopidy. Returns an existing instance with the same values if
+    there is one.
+    """
+    values = _normalize(cls, kwargs)
+    if values is None:
+        return cls(**kwargs)  # Let the constructor raise the error
+    probe = _InstanceProbe(cls, values)
+    instance = cls._instances.get(probe)
+    if instance is None:
+        instance = cls.__new__(cls)
+        for key, value in values.items():
+            object.__setattr__(instance, cls._fields[key], value)
+        object.__setattr__(instance, '_hash', probe.hash)
+        instance = cls._instances.setdefault(weakref.ref(instance), instance)
+    return instance
+
+
 class ValidatedImmutableObject(ImmutableObject):
     """
     Superclass for immutable objects whose fields can only be modified via the
@@ -183,10 +291,11 @@ class ValidatedImmutableObject(ImmutableObject):
     __slots__ = ['_hash']
 
     def __hash__(self):
-        if not hasattr(self, '_hash'):
+        hash_sum = getattr(self, '_hash', None)
+        if hash_sum is None:
             hash_sum = super(ValidatedImmutableObject, self).__hash__()
             object.__setattr__(self, '_hash', hash_sum)
-        return self._hash
+        return hash_sum
 
     def _is_valid_field(self, name):
         return name in self._fields
@@ -196,8 +305,9 @@ class ValidatedImmutableObject(ImmutableObject):
 
     def _items(self):
         for field, key in self._fields.items():
-            if hasattr(self, key):
-                yield field, getattr(self, key)
+            value = getattr(self, key, _unset)
+            if value is not _unset:
+                yield field, value
 
     def replace(self, **kwargs):
         """
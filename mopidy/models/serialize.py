@@ -2,6 +2,7 @@ from __future__ import absolute_import, unicode_literals
 
 import json
 
+from mopidy import compat
 from mopidy.models import immutable
 
 
@@ -43,3 +44,200 @@ def model_json_decoder(dct):
             cls = immutable._models[model_name]
             return cls(**dct)
     return dct
+
+
+def trusted_model_json_decoder(dct):
+    """
+    Like :func:`model_json_decoder`, but skips the validation of the model
+    fields.
+
+    Only use this for JSON written by Mopidy itself, e.g. when loading our
+    own data files, as invalid data results in invalid models.
+    """
+    if '__model__' in dct:
+        model_name = dct.pop('__model__')
+        if model_name in immutable._models:
+            cls = immutable._models[model_name]
+            return immutable._create_trusted(cls, dct)
+    return dct
+
+
+def decode_models(data):
+    """
+    Deserialize Mopidy models in data decoded from JSON without an
+    ``object_hook``.
+
+    This is equivalent to using :func:`trusted_model_json_decoder`, but
+    faster: Only the fields which can contain models are inspected, and
+    models nested in other models, like the albums and artists of tracks, are
+    only created once per distinct serialized value.
+
+    As with :func:`trusted_model_json_decoder`, the model fields are not
+    validated, so only use this for JSON written by Mopidy itself.
+
+    Usage::
+
+        >>> import json
+        >>> decode_models(json.loads(
+        ...     '{"a_track": {"__model__": "Track", "name": "name"}}'))
+        {u'a_track': Track(artists=[], name=u'name')}
+
+    :param data: data as returned by :func:`json.load`
+    :rtype: data with models instead of serialized models
+    """
+    return _ModelDecoder().decode(data)
+
+
+def iterencode_models(data):
+    """
+    Serialize data containing Mopidy models to JSON.
+
+    The output is the same JSON as from using :class:`ModelJSONEncoder`, but
+    models are serialized without building intermediate dicts, and models
+    nested in other models, like the albums and artists of tracks, are only
+    serialized once.
+
+    :param data: data to serialize
+    :rtype: iterator of JSON strings that should be joined
+    """
+    return _ModelEncoder().iterencode(data)
+
+
+# Marks a frozen dict, to keep it apart from a frozen list of pairs.
+_frozen_dict = object()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        frozen = [
+            (k, _freeze(v) if isinstance(v, (dict, list)) else v)
+            for k, v in value.items()]
+        frozen.append(_frozen_dict)
+    else:
+        frozen = [
+            _freeze(v) if isinstance(v, (dict, list)) else v for v in value]
+    return tuple(frozen)
+
+
+# Names of the fields which can contain models, by model class.
+_model_fields = {}
+
+
+def _get_model_fields(cls):
+    if cls not in _model_fields:
+        _model_fields[cls] = frozenset(
+            key for key, field in cls._field_objects.items()
+            if isinstance(field._type, type) and
+            issubclass(field._type, immutable.ImmutableObject))
+    return _model_fields[cls]
+
+
+class _ModelDecoder(object):
+
+    def __init__(self):
+        self._interned = {}
+
+    def decode(self, value):
+        if isinstance(value, dict):
+            if '__model__' in value:
+                return self.decode_model(value)
+            return {k: self.decode(v) for k, v in value.items()}
+        elif isinstance(value, list):
+            return [self.decode(v) for v in value]
+        return value
+
+    def decode_nested(self, value):
+        if isinstance(value, dict) and '__model__' in value:
+            key = _freeze(value)
+            instance = self._interned.get(key)
+            if instance is None:
+                instance = self._interned[key] = self.decode_model(value)
+            return instance
+        elif isinstance(value, list):
+            return [self.decode_nested(v) for v in value]
+        return self.decode(value)
+
+    def decode_model(self, dct):
+        dct = dict(dct)
+        cls = immutable._models.get(dct.pop('__model__'))
+        if cls is None:
+            return self.decode(dct)
+
+        model_fields = _get_model_fields(cls)
+        for key, value in dct.items():
+            if key in model_fields:
+                dct[key] = self.decode_nested(value)
+            elif isinstance(value, (dict, list)):
+                dct[key] = self.decode(value)
+        return immutable._create_trusted(cls, dct)
+
+
+_encode_string = json.encoder.encode_basestring_ascii
+
+
+class _ModelEncoder(object):
+
+    def __init__(self):
+        self._encoded = {}
+
+    def iterencode(self, value):
+        if isinstance(value, dict) and all(
+                isinstance(k, compat.string_types) for k in value):
+            yield '{'
+            for i, (key, item) in enumerate(value.items()):
+                yield '%s%s: ' % (', ' if i else '', _encode_string(key))
+                for chunk in self.iterencode(item):
+                    yield chunk
+            yield '}'
+        elif isinstance(value, (list, tuple)):
+            yield '['
+            for i, item in enumerate(value):
+                if i:
+                    yield ', '
+                for chunk in self.iterencode(item):
+                    yield chunk
+            yield ']'
+        else:
+            yield self.encode(value)
+
+    def encode(self, value):
+        if isinstance(value, immutable.ImmutableObject):
+            return self.encode_model(value)
+        elif isinstance(value, compat.string_types):
+            return _encode_string(value)
+        elif value is None:
+            return 'null'
+        elif value is True:
+            return 'true'
+        elif value is False:
+            return 'false'
+        elif isinstance(value, compat.integer_types):
+            return str(value)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            return '[%s]' % ', '.join(self.encode(v) for v in value)
+        return json.dumps(value, cls=ModelJSONEncoder)
+
+    def encode_nested(self, value):
+        if not isinstance(value, immutable.ValidatedImmutableObject):
+            return self.encode(value)
+        result = self._encoded.get(value)
+        if result is None:
+            result = self._encoded[value] = self.encode_model(value)
+        return result
+
+    def encode_model(self, model):
+        parts = ['"__model__": %s' % _encode_string(model.__class__.__name__)]
+        for key, value in model._items():
+            if isinstance(value, compat.string_types):
+                value = _encode_string(value)
+            elif type(value) is int:
+                value = str(value)
+            elif isinstance(value, (set, frozenset, list, tuple)):
+                if not value:
+                    continue
+                value = '[%s]' % ', '.join(
+                    self.encode_nested(v) for v in value)
+            else:
+                value = self.encode_nested(value)
+            parts.append('%s: %s' % (_encode_string(key), value))
+        return '{%s}' % ', '.join(parts)
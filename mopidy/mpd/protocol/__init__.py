@@ -14,6 +14,7 @@ from __future__ import absolute_import, unicode_literals
 
 import inspect
 
+from mopidy.internal import metrics
 from mopidy.mpd import exceptions
 
 #: The MPD protocol uses UTF-8 for encoding all data.
@@ -177,7 +178,8 @@ class Commands(object):
             raise exceptions.MpdNoCommand()
         if tokens[0] not in self.handlers:
             raise exceptions.MpdUnknownCommand(command=tokens[0])
-        return self.handlers[tokens[0]](context, *tokens[1:])
+        with metrics.registry.timed('mpd', tokens[0]):
+            return self.handlers[tokens[0]](context, *tokens[1:])
 
 
 #: Global instance to install commands into
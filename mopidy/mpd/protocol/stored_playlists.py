@@ -9,6 +9,9 @@ from mopidy.mpd import exceptions, protocol, translator
 
 logger = logging.getLogger(__name__)
 
+# Number of tracks added to the tracklist at a time when loading playlists.
+_LOAD_CHUNK_SIZE = 500
+
 
 def _check_playlist_name(name):
     if re.search('[/\n\r]', name):
@@ -145,7 +148,11 @@ def load(context, name, playlist_slice=slice(0, None)):
     """
     playlist = _get_playlist(context, name)
     track_uris = [track.uri for track in playlist.tracks[playlist_slice]]
-    context.core.tracklist.add(uris=track_uris).get()
+    # Add the tracks in chunks, so that e.g. playback can be started after the
+    # first chunk instead of waiting for all of a long playlist.
+    for i in range(0, len(track_uris), _LOAD_CHUNK_SIZE):
+        context.core.tracklist.add(
+            uris=track_uris[i:i + _LOAD_CHUNK_SIZE]).get()
 
 
 @protocol.commands.add('playlistadd')
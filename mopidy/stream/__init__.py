@@ -22,6 +22,7 @@ class Extension(ext.Extension):
         schema['metadata_blacklist'] = config.List(optional=True)
         schema['timeout'] = config.Integer(
             minimum=1000, maximum=1000 * 60 * 60)
+        schema['cache_ttl'] = config.Integer(minimum=0)
         return schema
 
     def validate_environment(self):
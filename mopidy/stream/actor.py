@@ -2,6 +2,7 @@ from __future__ import absolute_import, unicode_literals
 
 import fnmatch
 import logging
+import os
 import re
 import time
 
@@ -10,8 +11,9 @@ import pykka
 from mopidy import audio as audio_lib, backend, exceptions, stream
 from mopidy.audio import scan, tags
 from mopidy.compat import urllib
-from mopidy.internal import http, playlists
+from mopidy.internal import encoding, http, playlists
 from mopidy.models import Track
+from mopidy.stream import cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,9 +23,7 @@ class StreamBackend(pykka.ThreadingActor, backend.Backend):
     def __init__(self, config, audio):
         super(StreamBackend, self).__init__()
 
-        self._scanner = scan.Scanner(
-            timeout=config['stream']['timeout'],
-            proxy_config=config['proxy'])
+        self._scanner = scan.get_service(proxy_config=config['proxy'])
 
         self._session = http.get_requests_session(
             proxy_config=config['proxy'],
@@ -36,6 +36,9 @@ class StreamBackend(pykka.ThreadingActor, backend.Backend):
 
         self._timeout = config['stream']['timeout']
 
+        self._config = config
+        self._cache = cache.UnwrapCache(ttl=config['stream']['cache_ttl'])
+
         self.library = StreamLibraryProvider(backend=self)
         self.playback = StreamPlaybackProvider(audio=audio, backend=self)
         self.playlists = None
@@ -50,6 +53,41 @@ class StreamBackend(pykka.ThreadingActor, backend.Backend):
                 'Please remove it from the stream/protocols config.')
             self.uri_schemes -= {'file'}
 
+    def on_start(self):
+        if self._cache.ttl:
+            self._cache.load(self._get_cache_file())
+
+    def on_stop(self):
+        if self._cache.ttl:
+            try:
+                self._cache.save(self._get_cache_file())
+            except EnvironmentError as e:
+                logger.warning(
+                    'Saving stream cache failed: %s',
+                    encoding.locale_decode(e))
+
+    def _get_cache_file(self):
+        return os.path.join(
+            stream.Extension.get_cache_dir(self._config), b'unwrap.json.gz')
+
+    def _unwrap(self, uri):
+        result = self._cache.get(uri)
+        if result is not None:
+            logger.debug('Using cached result of unwrapping %s', uri)
+            return result
+
+        unwrapped_uri, scan_result = _unwrap_stream(
+            uri, timeout=self._timeout, scanner=self._scanner,
+            requests_session=self._session)
+        if scan_result:
+            track = tags.convert_tags_to_track(scan_result.tags).replace(
+                uri=uri, length=scan_result.duration)
+        else:
+            track = None
+
+        self._cache.put(uri, unwrapped_uri, track)
+        return unwrapped_uri, track
+
 
 class StreamLibraryProvider(backend.LibraryProvider):
     def lookup(self, uri):
@@ -60,14 +98,9 @@ class StreamLibraryProvider(backend.LibraryProvider):
             logger.debug('URI matched metadata lookup blacklist: %s', uri)
             return [Track(uri=uri)]
 
-        _, scan_result = _unwrap_stream(
-            uri, timeout=self.backend._timeout, scanner=self.backend._scanner,
-            requests_session=self.backend._session)
+        _, track = self.backend._unwrap(uri)
 
-        if scan_result:
-            track = tags.convert_tags_to_track(scan_result.tags).replace(
-                uri=uri, length=scan_result.duration)
-        else:
+        if track is None:
             logger.warning('Problem looking up %s', uri)
             track = Track(uri=uri)
 
@@ -84,23 +117,105 @@ class StreamPlaybackProvider(backend.PlaybackProvider):
             logger.debug('URI matched metadata lookup blacklist: %s', uri)
             return uri
 
-        unwrapped_uri, _ = _unwrap_stream(
-            uri, timeout=self.backend._timeout, scanner=self.backend._scanner,
-            requests_session=self.backend._session)
+        unwrapped_uri, _ = self.backend._unwrap(uri)
         return unwrapped_uri
 
 
+# Seconds to wait for a stream from a playlist to scan before also scanning
+# the next one.
+_PROBE_DELAY = 0.5
+
+# Maximum number of streams from a playlist to scan at the same time.
+_MAX_PROBES = 3
+
+# Seconds between checking if any of the running probes has finished.
+_PROBE_POLL_INTERVAL = 0.01
+
+# Maximum number of stream URIs to get from a playlist.
+_MAX_PLAYLIST_URIS = 10
+
+# Maximum number of bytes to read from a playlist.
+_MAX_PLAYLIST_SIZE = 1024 * 1024
+
+
+def _is_stream(scan_result):
+    return scan_result is not None and (
+        scan_result.playable or (
+            not scan_result.mime.startswith('text/') and
+            not scan_result.mime.startswith('application/')))
+
+
+def _probe_streams(uris, timeout, scanner):
+    """
+    Find the first of ``uris`` that scans as a stream.
+
+    The URIs are scanned in order, but if a scan takes more than
+    ``_PROBE_DELAY`` seconds, or doesn't find a stream, the next URI is
+    scanned at the same time. This way a dead mirror early in a playlist
+    doesn't use up the timeout.
+
+    The scans run in the scanner's worker pool, and can't be cancelled once a
+    stream is found, so the others keep their workers until they finish, at
+    the latest when ``timeout`` runs out. To leave workers for other scans,
+    at most ``_MAX_PROBES`` scans run at the same time, and never all of the
+    scanner's workers are used.
+
+    :returns: ``(uri, scan_result)`` of the first stream found, or
+        ``(None, None)``, and a dict with the results of the other scans
+        that finished
+    """
+    max_probes = max(1, min(_MAX_PROBES, scanner.num_workers - 1))
+    pending = list(uris)
+    running = []
+    scan_results = {}
+    deadline = time.time() + timeout / 1000.0
+    next_probe = 0
+
+    while (pending or running) and time.time() < deadline:
+        now = time.time()
+        if pending and len(running) < max_probes and now >= next_probe:
+            uri = pending.pop(0)
+            logger.debug('Probing stream from URI: %s', uri)
+            running.append((uri, scanner.scan_async(
+                uri, timeout=int((deadline - now) * 1000))))
+            next_probe = now + _PROBE_DELAY
+
+        finished = False
+        for uri, future in list(running):
+            try:
+                scan_result = future.get(timeout=0)
+            except pykka.Timeout:
+                continue
+            except exceptions.ScannerError as exc:
+                logger.debug(
+                    'GStreamer failed scanning URI (%s): %s', uri, exc)
+                scan_result = None
+            running.remove((uri, future))
+            if _is_stream(scan_result):
+                return (uri, scan_result), scan_results
+            scan_results[uri] = scan_result
+            finished = True
+            next_probe = 0
+
+        if not finished:
+            time.sleep(_PROBE_POLL_INTERVAL)
+
+    return (None, None), scan_results
+
+
 # TODO: cleanup the return value of this.
 def _unwrap_stream(uri, timeout, scanner, requests_session):
     """
     Get a stream URI from a playlist URI, ``uri``.
 
     Unwraps nested playlists until something that's not a playlist is found or
-    the ``timeout`` is reached.
+    the ``timeout`` is reached. When a playlist has several URIs, they are
+    scanned concurrently and the first stream found is used.
     """
 
     original_uri = uri
     seen_uris = set()
+    scan_results = {}
     deadline = time.time() + timeout
 
     while time.time() < deadline:
@@ -114,26 +229,26 @@ def _unwrap_stream(uri, timeout, scanner, requests_session):
 
         logger.debug('Unwrapping stream from URI: %s', uri)
 
-        try:
-            scan_timeout = deadline - time.time()
-            if scan_timeout < 0:
-                logger.info(
-                    'Unwrapping stream from URI (%s) failed: '
-                    'timed out in %sms', uri, timeout)
-                return None, None
-            scan_result = scanner.scan(uri, timeout=scan_timeout)
-        except exceptions.ScannerError as exc:
-            logger.debug('GStreamer failed scanning URI (%s): %s', uri, exc)
-            scan_result = None
-
-        if scan_result is not None:
-            if scan_result.playable or (
-                not scan_result.mime.startswith('text/') and
-                not scan_result.mime.startswith('application/')
-            ):
+        if uri in scan_results:
+            scan_result = scan_results.pop(uri)
+        else:
+            try:
+                scan_timeout = deadline - time.time()
+                if scan_timeout < 0:
+                    logger.info(
+                        'Unwrapping stream from URI (%s) failed: '
+                        'timed out in %sms', uri, timeout)
+                    return None, None
+                scan_result = scanner.scan(uri, timeout=scan_timeout)
+            except exceptions.ScannerError as exc:
                 logger.debug(
-                    'Unwrapped potential %s stream: %s', scan_result.mime, uri)
-                return uri, scan_result
+                    'GStreamer failed scanning URI (%s): %s', uri, exc)
+                scan_result = None
+
+        if _is_stream(scan_result):
+            logger.debug(
+                'Unwrapped potential %s stream: %s', scan_result.mime, uri)
+            return uri, scan_result
 
         download_timeout = deadline - time.time()
         if download_timeout < 0:
@@ -141,23 +256,40 @@ def _unwrap_stream(uri, timeout, scanner, requests_session):
                 'Unwrapping stream from URI (%s) failed: timed out in %sms',
                 uri, timeout)
             return None, None
-        content = http.download(
+        chunks = http.download_chunks(
             requests_session, uri, timeout=download_timeout / 1000)
 
-        if content is None:
+        if chunks is None:
             logger.info(
                 'Unwrapping stream from URI (%s) failed: '
                 'error downloading URI %s', original_uri, uri)
             return None, None
 
-        uris = playlists.parse(content)
+        try:
+            uris = playlists.parse_chunks(
+                chunks, max_uris=_MAX_PLAYLIST_URIS,
+                max_size=_MAX_PLAYLIST_SIZE)
+        finally:
+            chunks.close()
         if not uris:
             logger.debug(
                 'Failed parsing URI (%s) as playlist; found potential stream.',
                 uri)
             return uri, None
 
-        # TODO Test streams and return first that seems to be playable
+        candidates = [u for u in uris if u not in seen_uris]
+        if len(candidates) > 1:
+            logger.debug(
+                'Parsed playlist (%s) and found %d new URIs',
+                uri, len(candidates))
+            (stream_uri, scan_result), scan_results = _probe_streams(
+                candidates, deadline - time.time(), scanner)
+            if stream_uri is not None:
+                logger.debug(
+                    'Unwrapped potential %s stream: %s',
+                    scan_result.mime, stream_uri)
+                return stream_uri, scan_result
+
         logger.debug(
             'Parsed playlist (%s) and found new URI: %s', uri, uris[0])
         uri = uris[0]
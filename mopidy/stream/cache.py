@@ -0,0 +1,85 @@
+from __future__ import absolute_import, unicode_literals
+
+import logging
+import time
+
+from mopidy.internal import storage
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 2
+
+
+class UnwrapCache(object):
+
+    """
+    Cache of unwrapped stream URIs and the tracks found when scanning them.
+
+    Unwrapping a stream may download playlists and scan the stream with
+    GStreamer, so the result is kept for both looking up and playing the
+    stream. Entries expire after ``ttl`` seconds, or ``failure_ttl`` seconds
+    for streams which couldn't be unwrapped.
+
+    :param ttl: seconds to keep results for, or 0 to not cache at all
+    :type ttl: int
+    :param size: maximum number of URIs to keep results for
+    :type size: int
+    :param failure_ttl: seconds to keep failures for
+    :type failure_ttl: int
+    """
+
+    def __init__(self, ttl, size=1000, failure_ttl=30):
+        self.ttl = ttl
+        self.failure_ttl = min(failure_ttl, ttl)
+        self._entries = storage.LruCache(size, version=FORMAT_VERSION)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, uri):
+        """
+        Get the cached result for ``uri``.
+
+        :returns: ``(unwrapped_uri, track)``, where either may be
+            :class:`None`, or :class:`None` if there is no current result
+        """
+        entry = self._entries.get(uri)
+        if entry is None:
+            return None
+        if not _is_current(entry):
+            self._entries.remove(uri)
+            return None
+        return entry['unwrapped_uri'], entry['track']
+
+    def put(self, uri, unwrapped_uri, track):
+        """
+        Cache the result of unwrapping ``uri``.
+
+        :param uri: the URI that was unwrapped
+        :type uri: string
+        :param unwrapped_uri: the stream URI, or :class:`None` on failure
+        :type unwrapped_uri: string or :class:`None`
+        :param track: the track found when scanning the stream
+        :type track: :class:`mopidy.models.Track` or :class:`None`
+        """
+        if not self.ttl:
+            return
+        ttl = self.ttl if unwrapped_uri is not None else self.failure_ttl
+        self._entries.put(uri, {
+            'unwrapped_uri': unwrapped_uri,
+            'track': track,
+            'expires': time.time() + ttl,
+        })
+
+    def load(self, path):
+        """Load the entries saved to ``path`` which haven't expired yet."""
+        self._entries.load(path, is_valid=_is_current)
+        logger.debug('Loaded %d cached stream lookups', len(self._entries))
+
+    def save(self, path):
+        """Save the entries which haven't expired yet to ``path``."""
+        self._entries.save(path, is_valid=_is_current)
+
+
+def _is_current(entry):
+    return entry['expires'] > time.time()
@@ -1,8 +1,11 @@
 from __future__ import absolute_import, unicode_literals
 
 import os
+import threading
 import unittest
 
+import mock
+
 from mopidy import exceptions
 from mopidy.audio import scan
 from mopidy.internal import path as path_lib
@@ -22,8 +25,8 @@ class ScannerTest(unittest.TestCase):
         for path in result:
             yield os.path.join(media_dir, path)
 
-    def scan(self, paths):
-        scanner = scan.Scanner()
+    def scan(self, paths, mode=scan.EXACT):
+        scanner = scan.Scanner(mode=mode)
         for path in paths:
             uri = path_lib.path_to_uri(path)
             key = uri[len('file://'):]
@@ -64,6 +67,24 @@ class ScannerTest(unittest.TestCase):
         self.assertEqual(self.result[mp3].duration, 4680)
         self.assertEqual(self.result[ogg].duration, 4680)
 
+    def test_duration_is_estimated(self):
+        self.scan(
+            self.find('scanner/simple'), mode=scan.TAGS_AND_DURATION_ESTIMATE)
+
+        self.check_if_missing_plugin()
+
+        mp3 = path_to_data_dir('scanner/simple/song1.mp3')
+        self.assertAlmostEqual(self.result[mp3].duration, 4680, delta=100)
+
+    def test_tags_only_has_no_duration(self):
+        self.scan(self.find('scanner/simple'), mode=scan.TAGS_ONLY)
+
+        self.check_if_missing_plugin()
+
+        for result in self.result.values():
+            self.assertTrue(result.tags)
+            self.assertIsNone(result.duration)
+
     def test_artist_is_set(self):
         self.scan(self.find('scanner/simple'))
 
@@ -123,3 +144,91 @@ class ScannerTest(unittest.TestCase):
     @unittest.SkipTest
     def test_song_without_time_is_handeled(self):
         pass
+
+
+class ScanServiceTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        patcher = mock.patch.object(scan, 'Scanner')
+        self.scanner = patcher.start()()
+        self.addCleanup(patcher.stop)
+        self.service = scan.ScanService(num_workers=2)
+        self.addCleanup(self.service.stop)
+
+    def test_scan_returns_result(self):
+        self.scanner.scan.return_value = mock.sentinel.result
+
+        result = self.service.scan('file:///foo.mp3', timeout=100)
+
+        self.assertEqual(mock.sentinel.result, result)
+        self.scanner.scan.assert_called_once_with(
+            'file:///foo.mp3', timeout=100)
+
+    def test_scan_mode_is_passed_to_scanner(self):
+        with mock.patch.object(scan, 'Scanner') as scanner_cls:
+            self.service.scan('file:///foo.mp3', mode=scan.TAGS_ONLY)
+
+        scanner_cls.assert_called_once_with(
+            proxy_config={}, mode=scan.TAGS_ONLY)
+
+    def test_scan_raises_scanner_error(self):
+        self.scanner.scan.side_effect = exceptions.ScannerError('Kaboom')
+
+        with self.assertRaises(exceptions.ScannerError):
+            self.service.scan('file:///foo.mp3')
+
+    def test_uris_are_scanned_in_parallel(self):
+        barrier = threading.Semaphore(0)
+        event = threading.Event()
+
+        def scan(uri, timeout=None):
+            barrier.release()
+            event.wait(5)
+            return uri
+
+        self.scanner.scan.side_effect = scan
+
+        futures = [
+            self.service.scan_async(uri)
+            for uri in ('file:///a.mp3', 'file:///b.mp3', 'file:///c.mp3')]
+
+        self.assertTrue(barrier.acquire())
+        self.assertTrue(barrier.acquire())
+        self.assertFalse(barrier.acquire(False))
+        event.set()
+        self.assertEqual(
+            ['file:///a.mp3', 'file:///b.mp3', 'file:///c.mp3'],
+            [future.get(timeout=1) for future in futures])
+
+    def test_uri_being_scanned_is_only_scanned_once(self):
+        event = threading.Event()
+        self.scanner.scan.side_effect = lambda uri, timeout: event.wait(5)
+
+        first = self.service.scan_async('file:///foo.mp3')
+        second = self.service.scan_async('file:///foo.mp3')
+        event.set()
+
+        self.assertIs(first, second)
+        self.assertTrue(first.get(timeout=1))
+        self.assertEqual(1, self.scanner.scan.call_count)
+
+    def test_uri_is_scanned_again_with_other_mode(self):
+        event = threading.Event()
+        self.scanner.scan.side_effect = lambda uri, timeout: event.wait(5)
+
+        first = self.service.scan_async('file:///foo.mp3')
+        second = self.service.scan_async(
+            'file:///foo.mp3', mode=scan.TAGS_ONLY)
+        event.set()
+
+        self.assertIsNot(first, second)
+        second.get(timeout=1)
+
+    def test_uri_is_scanned_again_when_done(self):
+        self.service.scan('file:///foo.mp3')
+        self.service.scan('file:///foo.mp3')
+
+        self.assertEqual(2, self.scanner.scan.call_count)
+
+    def test_get_service_returns_shared_service(self):
+        self.assertIs(scan.get_service(), scan.get_service())
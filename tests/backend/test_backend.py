@@ -2,6 +2,8 @@ from __future__ import absolute_import, unicode_literals
 
 import unittest
 
+import mock
+
 from mopidy import backend, models
 
 from tests import dummy_backend
@@ -30,6 +32,37 @@ class LibraryTest(unittest.TestCase):
         expected = {'trackuri': []}
         self.assertEqual(library.get_images(['trackuri']), expected)
 
+    def test_default_lookup_many_impl(self):
+        track = models.Track(uri='trackuri')
+
+        library = dummy_backend.DummyLibraryProvider(backend=None)
+        library.dummy_library.append(track)
+
+        expected = {'trackuri': [track], 'unknownuri': []}
+        self.assertEqual(
+            library.lookup_many(['trackuri', 'unknownuri']), expected)
+
+    def test_default_lookup_many_impl_handles_lookup_errors_per_uri(self):
+        track = models.Track(uri='trackuri')
+
+        library = dummy_backend.DummyLibraryProvider(backend=None)
+        library.dummy_library.append(track)
+        original_lookup = library.lookup
+
+        def lookup(uri):
+            if uri == 'baduri':
+                raise LookupError(uri)
+            return original_lookup(uri)
+
+        library.lookup = lookup
+
+        with mock.patch('mopidy.backend.logger') as logger_mock:
+            result = library.lookup_many(['trackuri', 'baduri'])
+
+        self.assertEqual(result, {'trackuri': [track], 'baduri': []})
+        logger_mock.exception.assert_called_once_with(
+            mock.ANY, 'DummyLibraryProvider', 'baduri')
+
 
 class PlaylistsTest(unittest.TestCase):
 
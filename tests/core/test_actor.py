@@ -11,7 +11,7 @@ import pykka
 
 import mopidy
 from mopidy.core import Core
-from mopidy.internal import models, storage, versioning
+from mopidy.internal import deprecation, metrics, models, storage, versioning
 from mopidy.models import Track
 
 from tests import dummy_mixer
@@ -52,14 +52,52 @@ class CoreActorTest(unittest.TestCase):
         self.assertEqual(self.core.version, versioning.get_version())
 
 
+class CoreActorMetricsTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        metrics.registry.enabled = True
+        self.core = Core.start(mixer=None, backends=[]).proxy()
+        # Creating proxies reads properties, which may call timed methods.
+        self.core.playback, self.core.tracklist
+        metrics.registry.reset()
+
+    def tearDown(self):  # noqa: N802
+        pykka.ActorRegistry.stop_all()
+        metrics.registry.enabled = False
+        metrics.registry.reset()
+
+    def test_proxy_calls_are_timed(self):
+        self.core.get_uri_schemes().get()
+        self.core.tracklist.get_length().get()
+
+        self.assertEqual(
+            [('core', 'Core.get_uri_schemes'),
+             ('core', 'TracklistController.get_length')],
+            [key for key, _ in metrics.registry.get_histograms()])
+
+    def test_calls_between_controllers_are_timed(self):
+        self.core.playback.play().get()
+
+        keys = [key for key, _ in metrics.registry.get_histograms()]
+        self.assertIn(('core', 'PlaybackController.play'), keys)
+        self.assertIn(('core', 'TracklistController.next_track'), keys)
+
+    def test_attribute_access_is_not_timed(self):
+        self.core.uri_schemes.get()
+
+        self.assertEqual([], metrics.registry.get_histograms())
+
+
 class CoreActorSaveLoadStateTest(unittest.TestCase):
 
     def setUp(self):
         self.temp_dir = tempfile.mkdtemp()
         self.state_file = os.path.join(self.temp_dir,
                                        b'core', b'state.json.gz')
+        self.journal_file = os.path.join(self.temp_dir,
+                                         b'core', b'tracklist.jsonl')
 
-        config = {
+        self.config = config = {
             'core': {
                 'max_tracklist_length': 10000,
                 'restore_state': True,
@@ -88,7 +126,7 @@ class CoreActorSaveLoadStateTest(unittest.TestCase):
             tracklist=models.TracklistState(
                 repeat=False, random=False,
                 consume=False, single=False,
-                next_tlid=1),
+                next_tlid=1, version=0),
             history=models.HistoryState(),
             playback=models.PlaybackState(state='stopped',
                                           time_position=0),
@@ -145,11 +183,55 @@ class CoreActorSaveLoadStateTest(unittest.TestCase):
         assert self.core.playback._start_at_position == 432
         assert self.core.history.get_length() == 2
 
-    def test_delete_state_file_on_restore(self):
+    def test_replace_state_file_on_restore(self):
         data = {}
         storage.dump(self.state_file, data)
         assert os.path.isfile(self.state_file)
 
         self.core.setup()
 
-        assert not os.path.isfile(self.state_file)
+        assert 'state' in storage.load(self.state_file)
+
+    def test_load_state_replays_tracklist_journal(self):
+        self.core.setup()
+        with deprecation.ignore('core.tracklist.add:tracks_arg'):
+            self.core.tracklist.add(tracks=[Track(uri='a:a')])
+
+        # Simulate a crash: no teardown, a new core reads the same files.
+        restored = Core(config=self.config, mixer=self.mixer, backends=[])
+        restored.setup()
+
+        assert restored.tracklist.get_tl_tracks() == (
+            self.core.tracklist.get_tl_tracks())
+
+    def test_save_state_clears_tracklist_journal(self):
+        self.core.setup()
+        with deprecation.ignore('core.tracklist.add:tracks_arg'):
+            self.core.tracklist.add(tracks=[Track(uri='a:a')])
+        assert os.path.isfile(self.journal_file)
+
+        self.core._save_state()
+
+        assert not os.path.isfile(self.journal_file)
+
+    def test_checkpoint_is_scheduled_on_change(self):
+        self.core.setup()
+
+        with mock.patch('threading.Timer') as timer:
+            self.core.tracklist.set_repeat(True)
+            self.core.tracklist.set_random(True)
+
+        timer.assert_called_once_with(60, self.core._on_checkpoint_timeout)
+        timer.return_value.start.assert_called_once_with()
+
+        self.core._checkpoint()
+
+        assert self.core._checkpoint_timer is None
+        reload_data = storage.load(self.state_file)
+        assert reload_data['state'].tracklist.random is True
+
+    def test_checkpoint_is_not_scheduled_without_restore_state(self):
+        with mock.patch('threading.Timer') as timer:
+            self.core.tracklist.set_repeat(True)
+
+        assert not timer.called
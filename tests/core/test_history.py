@@ -1,5 +1,8 @@
 from __future__ import absolute_import, unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
 from mopidy import compat
@@ -48,6 +51,45 @@ class PlaybackHistoryTest(unittest.TestCase):
         for artist in track.artists:
             self.assertIn(artist.name, ref.name)
 
+    def test_history_is_bounded(self):
+        self.history = HistoryController(max_length=2)
+        for track in self.tracks:
+            self.history._add_track(track)
+
+        result = self.history.get_history()
+
+        self.assertEqual(self.history.get_length(), 2)
+        self.assertEqual(result[0][1].uri, self.tracks[2].uri)
+        self.assertEqual(result[1][1].uri, self.tracks[1].uri)
+
+    def test_get_history_with_offset(self):
+        for track in self.tracks:
+            self.history._add_track(track)
+
+        result = self.history.get_history(offset=1)
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0][1].uri, self.tracks[1].uri)
+        self.assertEqual(result[1][1].uri, self.tracks[0].uri)
+
+    def test_get_history_with_offset_and_limit(self):
+        for track in self.tracks:
+            self.history._add_track(track)
+
+        result = self.history.get_history(offset=1, limit=1)
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0][1].uri, self.tracks[1].uri)
+
+    def test_get_history_with_offset_past_end(self):
+        self.history._add_track(self.tracks[0])
+
+        self.assertEqual(self.history.get_history(offset=5), [])
+
+    def test_get_history_with_negative_offset_fails(self):
+        with self.assertRaises(ValueError):
+            self.history.get_history(offset=-1)
+
 
 class CoreHistorySaveLoadStateTest(unittest.TestCase):
 
@@ -98,9 +140,75 @@ class CoreHistorySaveLoadStateTest(unittest.TestCase):
         self.assertEqual(hist[2], (45, self.refs[2]))
         self.assertEqual(hist[3], (56, self.refs[1]))
 
+    def test_save_is_bounded(self):
+        self.history = HistoryController(max_length=1)
+        self.history._add_track(self.tracks[2])
+        self.history._add_track(self.tracks[1])
+
+        value = self.history._save_state()
+
+        self.assertEqual(len(value.history), 1)
+        self.assertEqual(value.history[0].track, self.refs[1])
+
     def test_load_invalid_type(self):
         with self.assertRaises(TypeError):
             self.history._load_state(11, None)
 
     def test_load_none(self):
         self.history._load_state(None, None)
+
+
+class CoreHistoryJournalTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_file = os.path.join(self.temp_dir, b'history.jsonl')
+        self.tracks = [
+            Track(uri='dummy1:a', name='foober'),
+            Track(uri='dummy2:a', name='foo'),
+            Track(uri='dummy3:a', name='bar')
+        ]
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.temp_dir)
+
+    def test_added_tracks_survive_in_journal(self):
+        history = HistoryController()
+        history._setup_journal(self.journal_file)
+        history._add_track(self.tracks[0])
+        history._add_track(self.tracks[1])
+
+        restored = HistoryController()
+        restored._setup_journal(self.journal_file)
+
+        self.assertEqual(restored.get_history(), history.get_history())
+
+    def test_journal_entries_newer_than_state_are_restored(self):
+        history = HistoryController()
+        history._setup_journal(self.journal_file)
+        history._add_track(self.tracks[0])
+        state = history._save_state()
+        history._add_track(self.tracks[1])
+
+        restored = HistoryController()
+        restored._load_state(state, ['history'])
+        restored._setup_journal(self.journal_file)
+
+        self.assertEqual(restored.get_length(), 2)
+        self.assertEqual(restored.get_history(), history.get_history())
+
+    def test_journal_is_compacted(self):
+        history = HistoryController(max_length=1)
+        history._setup_journal(self.journal_file)
+        for track in self.tracks:
+            history._add_track(track)
+
+        with open(self.journal_file, 'rb') as fp:
+            self.assertLessEqual(len(fp.readlines()), 2)
+
+        restored = HistoryController(max_length=1)
+        restored._setup_journal(self.journal_file)
+
+        self.assertEqual(restored.get_length(), 1)
+        self.assertEqual(
+            restored.get_history()[0][1].uri, self.tracks[2].uri)
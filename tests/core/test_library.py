@@ -4,10 +4,14 @@ import unittest
 
 import mock
 
+import pykka
+
 from mopidy import backend, core
 from mopidy.internal import deprecation
 from mopidy.models import Image, Ref, SearchResult, Track
 
+from tests import dummy_backend
+
 
 class BaseCoreLibraryTest(unittest.TestCase):
 
@@ -159,8 +163,8 @@ class CoreLibraryTest(BaseCoreLibraryTest):
         track1 = Track(uri='dummy1:a', name='abc')
         track2 = Track(uri='dummy2:a', name='def')
 
-        self.library1.lookup().get.return_value = [track1]
-        self.library2.lookup().get.return_value = [track2]
+        self.library1.lookup_many().get.return_value = {'dummy1:a': [track1]}
+        self.library2.lookup_many().get.return_value = {'dummy2:a': [track2]}
 
         result = self.core.library.lookup(uris=['dummy1:a', 'dummy2:a'])
         self.assertEqual(result, {'dummy2:a': [track2], 'dummy1:a': [track1]})
@@ -169,14 +173,25 @@ class CoreLibraryTest(BaseCoreLibraryTest):
         result = self.core.library.lookup(uris=['dummy3:a'])
 
         self.assertEqual(result, {'dummy3:a': []})
-        self.assertFalse(self.library1.lookup.called)
-        self.assertFalse(self.library2.lookup.called)
+        self.assertFalse(self.library1.lookup_many.called)
+        self.assertFalse(self.library2.lookup_many.called)
+
+    def test_lookup_calls_each_backend_once(self):
+        self.library1.lookup_many.return_value.get.return_value = {}
+        self.library2.lookup_many.return_value.get.return_value = {}
+
+        self.core.library.lookup(uris=['dummy1:a', 'dummy2:a', 'dummy1:b'])
+
+        self.library1.lookup_many.assert_called_once_with(
+            ['dummy1:a', 'dummy1:b'])
+        self.library2.lookup_many.assert_called_once_with(['dummy2:a'])
 
     def test_lookup_ignores_tracks_without_uri_set(self):
         track1 = Track(uri='dummy1:a', name='abc')
         track2 = Track()
 
-        self.library1.lookup().get.return_value = [track1, track2]
+        self.library1.lookup_many().get.return_value = {
+            'dummy1:a': [track1, track2]}
 
         result = self.core.library.lookup(uris=['dummy1:a'])
         self.assertEqual(result, {'dummy1:a': [track1]})
@@ -280,6 +295,67 @@ class CoreLibraryTest(BaseCoreLibraryTest):
             query={'any': ['foobar']}, uris=None, exact=False)
 
 
+@mock.patch('mopidy.core.library.logger')
+class SearchTimeoutCoreLibraryTest(BaseCoreLibraryTest):
+
+    def setUp(self):  # noqa: N802
+        super(SearchTimeoutCoreLibraryTest, self).setUp()
+        self.result2 = SearchResult(tracks=[Track(uri='dummy2:a')])
+        # A future which is never completed, like from a hung backend.
+        self.library1.search.return_value = pykka.ThreadingFuture()
+        self.library2.search.return_value.get.return_value = self.result2
+
+    def create_core(self, **config):
+        return core.Core(config={'core': config}, mixer=None, backends=[
+            self.backend1, self.backend2, self.backend3])
+
+    def test_search_returns_partial_results_after_timeout(self, logger):
+        c = self.create_core(search_timeout=10)
+
+        result = c.library.search({'any': ['a']})
+
+        self.assertEqual([self.result2], result)
+        logger.warning.assert_called_once_with(
+            mock.ANY, 'DummyBackend1', 10)
+
+    def test_backend_search_timeout_overrides_search_timeout(self, logger):
+        self.library1.search.return_value.set(
+            SearchResult(tracks=[Track(uri='dummy1:a')]))
+        c = self.create_core(
+            search_timeout=10, backend_search_timeouts=['dummy2|20'])
+
+        result = c.library.search({'any': ['a']})
+
+        self.assertEqual(2, len(result))
+        self.library2.search.return_value.get.assert_called_once_with(
+            timeout=mock.ANY)
+        self.assertGreater(
+            self.library2.search.return_value.get.call_args[1]['timeout'],
+            0.01)
+
+    def test_backend_search_timeout_for_any_uri_scheme(self, logger):
+        c = self.create_core(backend_search_timeouts=['du2|20', 'dummy1|10'])
+
+        result = c.library.search({'any': ['a']})
+
+        self.assertEqual([self.result2], result)
+
+    def test_search_without_timeout_waits_for_backends(self, logger):
+        self.library1.search.return_value = mock.Mock()
+        self.library1.search.return_value.get.return_value = None
+        c = self.create_core(search_timeout=None)
+
+        c.library.search({'any': ['a']})
+
+        self.library1.search.return_value.get.assert_called_once_with()
+
+    def test_invalid_backend_search_timeout_is_ignored(self, logger):
+        c = self.create_core(backend_search_timeouts=['dummy1'])
+
+        self.assertEqual({}, c.library._backend_search_timeouts)
+        logger.warning.assert_called_once_with(mock.ANY, 'dummy1')
+
+
 class DeprecatedFindExactCoreLibraryTest(BaseCoreLibraryTest):
 
     def run(self, result=None):
@@ -369,25 +445,25 @@ class DeprecatedLookupCoreLibraryTest(BaseCoreLibraryTest):
             return super(DeprecatedLookupCoreLibraryTest, self).run(result)
 
     def test_lookup_selects_dummy1_backend(self):
-        self.library1.lookup.return_value.get.return_value = []
+        self.library1.lookup_many.return_value.get.return_value = {}
         self.core.library.lookup('dummy1:a')
 
-        self.library1.lookup.assert_called_once_with('dummy1:a')
-        self.assertFalse(self.library2.lookup.called)
+        self.library1.lookup_many.assert_called_once_with(['dummy1:a'])
+        self.assertFalse(self.library2.lookup_many.called)
 
     def test_lookup_selects_dummy2_backend(self):
-        self.library2.lookup.return_value.get.return_value = []
+        self.library2.lookup_many.return_value.get.return_value = {}
         self.core.library.lookup('dummy2:a')
 
-        self.assertFalse(self.library1.lookup.called)
-        self.library2.lookup.assert_called_once_with('dummy2:a')
+        self.assertFalse(self.library1.lookup_many.called)
+        self.library2.lookup_many.assert_called_once_with(['dummy2:a'])
 
     def test_lookup_uri_returns_empty_list_for_dummy3_track(self):
         result = self.core.library.lookup('dummy3:a')
 
         self.assertEqual(result, [])
-        self.assertFalse(self.library1.lookup.called)
-        self.assertFalse(self.library2.lookup.called)
+        self.assertFalse(self.library1.lookup_many.called)
+        self.assertFalse(self.library2.lookup_many.called)
 
 
 class LegacyFindExactToSearchLibraryTest(unittest.TestCase):
@@ -544,47 +620,92 @@ class LookupByUrisBadBackendTest(MockBackendCoreLibraryBase):
 
     def test_backend_raises_exception(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.side_effect = Exception
+        self.library.lookup_many.return_value.get.side_effect = Exception
         self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
         logger.exception.assert_called_with(mock.ANY, 'DummyBackend')
 
     def test_backend_returns_none(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = None
+        self.library.lookup_many.return_value.get.return_value = None
+        self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
+        self.assertFalse(logger.error.called)
+
+    def test_backend_returns_none_for_uri(self, logger):
+        uri = 'dummy:/1'
+        self.library.lookup_many.return_value.get.return_value = {uri: None}
         self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
         self.assertFalse(logger.error.called)
 
     def test_backend_returns_wrong_type(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = 'abc'
+        self.library.lookup_many.return_value.get.return_value = 'abc'
+        self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
+        logger.error.assert_called_with(mock.ANY, 'DummyBackend', mock.ANY)
+
+    def test_backend_returns_wrong_type_for_uri(self, logger):
+        uri = 'dummy:/1'
+        self.library.lookup_many.return_value.get.return_value = {uri: 'abc'}
         self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
         logger.error.assert_called_with(mock.ANY, 'DummyBackend', mock.ANY)
 
     def test_backend_returns_iterable_containing_wrong_types(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = [123]
+        self.library.lookup_many.return_value.get.return_value = {uri: [123]}
         self.assertEqual({uri: []}, self.core.library.lookup(uris=[uri]))
         logger.error.assert_called_with(mock.ANY, 'DummyBackend', mock.ANY)
 
     def test_backend_returns_none_with_uri(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = None
+        self.library.lookup_many.return_value.get.return_value = None
         self.assertEqual([], self.core.library.lookup(uri))
         self.assertFalse(logger.error.called)
 
     def test_backend_returns_wrong_type_with_uri(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = 'abc'
+        self.library.lookup_many.return_value.get.return_value = {uri: 'abc'}
         self.assertEqual([], self.core.library.lookup(uri))
         logger.error.assert_called_with(mock.ANY, 'DummyBackend', mock.ANY)
 
     def test_backend_returns_iterable_wrong_types_with_uri(self, logger):
         uri = 'dummy:/1'
-        self.library.lookup.return_value.get.return_value = [123]
+        self.library.lookup_many.return_value.get.return_value = {uri: [123]}
         self.assertEqual([], self.core.library.lookup(uri))
         logger.error.assert_called_with(mock.ANY, 'DummyBackend', mock.ANY)
 
 
+class BadUriLibraryProvider(dummy_backend.DummyLibraryProvider):
+
+    def lookup(self, uri):
+        if uri == 'dummy:bad':
+            raise LookupError(uri)
+        return super(BadUriLibraryProvider, self).lookup(uri)
+
+
+class BadUriBackend(dummy_backend.DummyBackend):
+
+    def __init__(self, config, audio):
+        super(BadUriBackend, self).__init__(config, audio)
+        self.library = BadUriLibraryProvider(backend=self)
+
+
+class LookupManyDefaultImplTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.track = Track(uri='dummy:good')
+        self.backend = BadUriBackend.start(config=None, audio=None).proxy()
+        self.backend.library.dummy_library = [self.track]
+        self.core = core.Core(mixer=None, backends=[self.backend])
+
+    def tearDown(self):  # noqa: N802
+        pykka.ActorRegistry.stop_all()
+
+    def test_lookup_error_for_one_uri_does_not_fail_the_others(self):
+        result = self.core.library.lookup(uris=['dummy:good', 'dummy:bad'])
+
+        self.assertEqual(
+            result, {'dummy:good': [self.track], 'dummy:bad': []})
+
+
 @mock.patch('mopidy.core.library.logger')
 class RefreshBadBackendTest(MockBackendCoreLibraryBase):
 
@@ -1,12 +1,15 @@
 from __future__ import absolute_import, unicode_literals
 
+import os
+import shutil
+import tempfile
 import unittest
 
 import mock
 
 from mopidy import backend, core
 from mopidy.internal import deprecation
-from mopidy.internal.models import TracklistState
+from mopidy.internal.models import TracklistEntry, TracklistState
 from mopidy.models import TlTrack, Track
 
 
@@ -25,15 +28,16 @@ class TracklistTest(unittest.TestCase):
             Track(uri='dummy1:c', name='bar'),
         ]
 
-        def lookup(uri):
+        def lookup_many(uris):
             future = mock.Mock()
-            future.get.return_value = [t for t in self.tracks if t.uri == uri]
+            future.get.return_value = {
+                u: [t for t in self.tracks if t.uri == u] for u in uris}
             return future
 
         self.backend = mock.Mock()
         self.backend.uri_schemes.get.return_value = ['dummy1']
         self.library = mock.Mock(spec=backend.LibraryProvider)
-        self.library.lookup.side_effect = lookup
+        self.library.lookup_many.side_effect = lookup_many
         self.backend.library = self.library
 
         self.core = core.Core(config, mixer=None, backends=[self.backend])
@@ -41,28 +45,25 @@ class TracklistTest(unittest.TestCase):
             t.uri for t in self.tracks])
 
     def test_add_by_uri_looks_up_uri_in_library(self):
-        self.library.lookup.reset_mock()
+        self.library.lookup_many.reset_mock()
         self.core.tracklist.clear()
 
         with deprecation.ignore('core.tracklist.add:uri_arg'):
             tl_tracks = self.core.tracklist.add(uris=['dummy1:a'])
 
-        self.library.lookup.assert_called_once_with('dummy1:a')
+        self.library.lookup_many.assert_called_once_with(['dummy1:a'])
         self.assertEqual(1, len(tl_tracks))
         self.assertEqual(self.tracks[0], tl_tracks[0].track)
         self.assertEqual(tl_tracks, self.core.tracklist.tl_tracks[-1:])
 
     def test_add_by_uris_looks_up_uris_in_library(self):
-        self.library.lookup.reset_mock()
+        self.library.lookup_many.reset_mock()
         self.core.tracklist.clear()
 
         tl_tracks = self.core.tracklist.add(uris=[t.uri for t in self.tracks])
 
-        self.library.lookup.assert_has_calls([
-            mock.call('dummy1:a'),
-            mock.call('dummy1:b'),
-            mock.call('dummy1:c'),
-        ])
+        self.library.lookup_many.assert_called_once_with(
+            ['dummy1:a', 'dummy1:b', 'dummy1:c'])
         self.assertEqual(3, len(tl_tracks))
         self.assertEqual(self.tracks[0], tl_tracks[0].track)
         self.assertEqual(self.tracks[1], tl_tracks[1].track)
@@ -217,15 +218,66 @@ class TracklistSaveLoadStateTest(unittest.TestCase):
         consume = True
         next_tlid = len(tl_tracks) + 1
         self.core.tracklist.set_consume(consume)
+        entries = [TracklistEntry(tlid=t.tlid, uri=t.track.uri)
+                   for t in tl_tracks]
         target = TracklistState(consume=consume,
                                 repeat=False,
                                 single=False,
                                 random=False,
                                 next_tlid=next_tlid,
-                                tl_tracks=tl_tracks)
+                                version=self.core.tracklist.get_version(),
+                                entries=entries)
         value = self.core.tracklist._save_state()
         self.assertEqual(target, value)
 
+    def test_save_keeps_tracks_not_from_library(self):
+        track = Track(uri='dummy1:x', name='Not in library')
+        with deprecation.ignore('core.tracklist.add:tracks_arg'):
+            self.core.tracklist.add(tracks=[track, track])
+        self.core.tracklist.add(uris=[self.tracks[0].uri])
+
+        value = self.core.tracklist._save_state()
+
+        self.assertEqual(3, len(value.entries))
+        self.assertEqual((track,), value.tracks)
+
+    def test_load_looks_up_entries_in_library(self):
+        target = TracklistState(
+            next_tlid=3,
+            entries=[TracklistEntry(tlid=1, uri=self.tracks[1].uri),
+                     TracklistEntry(tlid=2, uri=self.tracks[0].uri)])
+
+        self.core.tracklist._load_state(target, ['tracklist'])
+
+        self.core.library.lookup.assert_called_once_with(
+            uris=[self.tracks[1].uri, self.tracks[0].uri])
+        self.assertEqual(
+            [TlTrack(1, self.tracks[1]), TlTrack(2, self.tracks[0])],
+            self.core.tracklist.get_tl_tracks())
+
+    def test_load_uses_saved_tracks_before_library(self):
+        track = Track(uri='dummy1:a', name='Saved')
+        target = TracklistState(
+            next_tlid=2,
+            entries=[TracklistEntry(tlid=1, uri=track.uri)],
+            tracks=[track])
+
+        self.core.tracklist._load_state(target, ['tracklist'])
+
+        self.assertFalse(self.core.library.lookup.called)
+        self.assertEqual(
+            [TlTrack(1, track)], self.core.tracklist.get_tl_tracks())
+
+    def test_load_unknown_entry_keeps_uri(self):
+        target = TracklistState(
+            next_tlid=2, entries=[TracklistEntry(tlid=1, uri='dummy1:gone')])
+
+        self.core.tracklist._load_state(target, ['tracklist'])
+
+        self.assertEqual(
+            [TlTrack(1, Track(uri='dummy1:gone'))],
+            self.core.tracklist.get_tl_tracks())
+
     def test_load(self):
         old_version = self.core.tracklist.get_version()
         target = TracklistState(consume=False,
@@ -294,3 +346,83 @@ class TracklistSaveLoadStateTest(unittest.TestCase):
 
     def test_load_none(self):
         self.core.tracklist._load_state(None, None)
+
+
+class TracklistJournalTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.temp_dir = tempfile.mkdtemp()
+        self.journal_file = os.path.join(self.temp_dir, b'tracklist.jsonl')
+
+        self.tracks = [
+            Track(uri='dummy1:a', name='a'),
+            Track(uri='dummy1:b', name='b'),
+            Track(uri='dummy1:c', name='c'),
+            Track(uri='dummy1:d', name='d'),
+        ]
+        self.core = self.create_core()
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.temp_dir)
+
+    def create_core(self):
+        def lookup(uris):
+            return {u: [t for t in self.tracks if t.uri == u] for u in uris}
+
+        config = {'core': {'max_tracklist_length': 10000}}
+        c = core.Core(config, mixer=None, backends=[])
+        c.library = mock.Mock(spec=core.LibraryController)
+        c.library.lookup.side_effect = lookup
+        c.playback = mock.Mock(spec=core.PlaybackController)
+        c.tracklist._setup_journal(self.journal_file)
+        return c
+
+    def test_replay_restores_changes(self):
+        tracklist = self.core.tracklist
+        tracklist.add(uris=[t.uri for t in self.tracks])
+        tracklist.move(0, 1, 3)
+        tracklist.remove({'tlid': [2]})
+        tracklist.add(uris=[self.tracks[1].uri], at_position=0)
+
+        restored = self.create_core()
+        restored.tracklist._load_state(None, ['tracklist'])
+
+        self.assertEqual(
+            tracklist.get_tl_tracks(), restored.tracklist.get_tl_tracks())
+        self.assertEqual(tracklist._next_tlid, restored.tracklist._next_tlid)
+        self.assertGreater(
+            restored.tracklist.get_version(), tracklist.get_version())
+
+    def test_replay_shuffle_and_clear(self):
+        tracklist = self.core.tracklist
+        tracklist.add(uris=[t.uri for t in self.tracks])
+        tracklist.clear()
+        tracklist.add(uris=[t.uri for t in self.tracks])
+        tracklist.shuffle()
+
+        restored = self.create_core()
+        restored.tracklist._load_state(None, ['tracklist'])
+
+        self.assertEqual(
+            tracklist.get_tl_tracks(), restored.tracklist.get_tl_tracks())
+
+    def test_replay_skips_changes_included_in_state(self):
+        tracklist = self.core.tracklist
+        tracklist.add(uris=[self.tracks[0].uri])
+        state = tracklist._save_state()
+        tracklist.add(uris=[self.tracks[1].uri])
+
+        restored = self.create_core()
+        restored.tracklist._load_state(state, ['tracklist'])
+
+        self.assertEqual(
+            tracklist.get_tl_tracks(), restored.tracklist.get_tl_tracks())
+
+    def test_clear_journal(self):
+        self.core.tracklist.add(uris=[self.tracks[0].uri])
+        self.core.tracklist._clear_journal()
+
+        restored = self.create_core()
+        restored.tracklist._load_state(None, ['tracklist'])
+
+        self.assertEqual(0, restored.tracklist.get_length())
@@ -0,0 +1,82 @@
+"""
+Benchmark for browsing with the file backend.
+
+Not run as part of the test suite. Run with::
+
+    PYTHONPATH=. python tests/file/benchmark.py [DEPTH] [FANOUT] [FILES]
+
+which browses a synthetic tree ``DEPTH`` directories deep, with ``FANOUT``
+subdirectories and ``FILES`` files in each directory, by default 3, 8 and
+200. Point ``TMPDIR`` to a network mount to see the effect of slow file
+systems.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from mopidy.file import library
+from mopidy.internal import path
+
+
+def make_tree(root, depth, fanout, files):
+    dirs = [root]
+    for name in range(files):
+        open(os.path.join(root, b'track-%d.mp3' % name), 'w').close()
+    if depth > 0:
+        for name in range(fanout):
+            child = os.path.join(root, b'dir-%d' % name)
+            os.mkdir(child)
+            dirs.extend(make_tree(child, depth - 1, fanout, files))
+    return dirs
+
+
+def make_provider(root):
+    return library.FileLibraryProvider(backend=None, config={
+        'proxy': {},
+        'file': {
+            'media_dirs': [root.decode(sys.getfilesystemencoding())],
+            'show_dotfiles': False,
+            'excluded_file_extensions': ['.jpg'],
+            'follow_symlinks': False,
+            'metadata_timeout': 1000,
+        },
+    })
+
+
+def browse_all(provider, uris):
+    start = time.time()
+    count = sum(len(provider.browse(uri)) for uri in uris)
+    return count, time.time() - start
+
+
+def main():
+    depth, fanout, files = ([int(a) for a in sys.argv[1:4]] + [3, 8, 200][
+        len(sys.argv[1:4]):])
+    root = tempfile.mkdtemp()
+    try:
+        dirs = make_tree(root, depth, fanout, files)
+        # Make the directories old enough to be cached.
+        mtime = time.time() - 60
+        for dir_path in dirs:
+            os.utime(dir_path, (mtime, mtime))
+        uris = [path.path_to_uri(dir_path) for dir_path in dirs]
+        library.BROWSE_CACHE_SIZE = len(uris)
+
+        print('Browsing %d directories with %d files each, scandir: %s' % (
+            len(uris), files, library.scandir is not None))
+        provider = make_provider(root)
+        count, seconds = browse_all(provider, uris)
+        print('%-20s %8d entries %10.3fs' % ('Uncached', count, seconds))
+        count, seconds = browse_all(provider, uris)
+        print('%-20s %8d entries %10.3fs' % ('Cached', count, seconds))
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    main()
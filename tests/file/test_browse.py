@@ -1,3 +1,136 @@
 from __future__ import unicode_literals
 
-# TODO Test browse()
+import os
+import time
+
+import mock
+
+import pytest
+
+from mopidy.internal import path
+
+
+@pytest.fixture
+def media_dir(tmpdir):
+    tmpdir.mkdir('Artist')
+    tmpdir.join('song.mp3').write('')
+    tmpdir.join('.hidden.mp3').write('')
+    tmpdir.join('cover.jpg').write('')
+    _set_old_mtime(str(tmpdir))
+    return bytes(tmpdir)
+
+
+@pytest.fixture
+def file_config(media_dir):
+    return {
+        'proxy': {},
+        'file': {
+            'media_dirs': [media_dir.decode('utf-8')],
+            'show_dotfiles': False,
+            'excluded_file_extensions': ['.jpg'],
+            'follow_symlinks': False,
+            'metadata_timeout': 1000,
+        },
+    }
+
+
+def _set_old_mtime(dir_path, age=60):
+    mtime = time.time() - age
+    os.utime(dir_path, (mtime, mtime))
+
+
+def _names(refs):
+    return [ref.name for ref in refs]
+
+
+def test_browse_lists_directories_first(file_library, media_dir):
+    result = file_library.browse(path.path_to_uri(media_dir))
+
+    assert _names(result) == ['Artist', 'song.mp3']
+    assert result[0].uri == path.path_to_uri(
+        os.path.join(media_dir, b'Artist'))
+    assert result[1].type == 'track'
+
+
+def test_browse_ignores_symlinks(file_library, media_dir):
+    os.symlink(
+        os.path.join(media_dir, b'song.mp3'),
+        os.path.join(media_dir, b'link.mp3'))
+    _set_old_mtime(media_dir)
+
+    result = file_library.browse(path.path_to_uri(media_dir))
+
+    assert _names(result) == ['Artist', 'song.mp3']
+
+
+def test_browse_follows_symlinks_inside_media_dirs(
+        file_config, media_dir, tmpdir_factory):
+    from mopidy.file import library
+
+    outside = bytes(tmpdir_factory.mktemp('outside'))
+    os.symlink(
+        os.path.join(media_dir, b'song.mp3'),
+        os.path.join(media_dir, b'link.mp3'))
+    os.symlink(outside, os.path.join(media_dir, b'outside'))
+    _set_old_mtime(media_dir)
+    file_config['file']['follow_symlinks'] = True
+    provider = library.FileLibraryProvider(backend=None, config=file_config)
+
+    result = provider.browse(path.path_to_uri(media_dir))
+
+    assert _names(result) == ['Artist', 'link.mp3', 'song.mp3']
+
+
+def test_browse_result_is_cached(file_library, media_dir):
+    from mopidy.file import library
+
+    uri = path.path_to_uri(media_dir)
+    file_library.browse(uri)
+
+    with mock.patch.object(library, '_scandir') as scandir_mock:
+        result = file_library.browse(uri)
+
+    assert _names(result) == ['Artist', 'song.mp3']
+    assert not scandir_mock.called
+
+
+def test_browse_cache_is_invalidated_by_changes(file_library, media_dir):
+    uri = path.path_to_uri(media_dir)
+    file_library.browse(uri)
+
+    open(os.path.join(media_dir, b'new.mp3'), 'w').close()
+    _set_old_mtime(media_dir, age=30)
+
+    assert _names(file_library.browse(uri)) == [
+        'Artist', 'new.mp3', 'song.mp3']
+
+
+def test_recently_modified_directories_are_not_cached(
+        file_library, media_dir):
+    os.utime(media_dir, None)
+
+    file_library.browse(path.path_to_uri(media_dir))
+
+    assert not file_library._browse_cache
+
+
+def test_browse_cache_is_bounded(file_library, media_dir):
+    from mopidy.file import library
+
+    for name in (b'A', b'B', b'C'):
+        os.mkdir(os.path.join(media_dir, name))
+        _set_old_mtime(os.path.join(media_dir, name))
+
+    with mock.patch.object(library, 'BROWSE_CACHE_SIZE', 2):
+        for name in (b'A', b'B', b'C'):
+            file_library.browse(
+                path.path_to_uri(os.path.join(media_dir, name)))
+
+    assert list(file_library._browse_cache) == [
+        os.path.join(media_dir, b'B'), os.path.join(media_dir, b'C')]
+
+
+def test_browse_outside_media_dirs_is_rejected(file_library, tmpdir_factory):
+    outside = bytes(tmpdir_factory.mktemp('outside'))
+
+    assert file_library.browse(path.path_to_uri(outside)) == []
@@ -0,0 +1,91 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+import mock
+
+import pytest
+
+from mopidy.file import cache
+from mopidy.models import Track
+
+
+URI = 'file:///music/song.mp3'
+TRACK = Track(uri=URI, name='Song', length=1000)
+
+
+@pytest.fixture
+def metadata_cache():
+    return cache.MetadataCache(size=2)
+
+
+def test_get_unknown_uri(metadata_cache):
+    assert metadata_cache.get(URI, 100, 1.5) is None
+
+
+def test_put_and_get(metadata_cache):
+    metadata_cache.put(URI, 100, 1.5, TRACK)
+
+    assert metadata_cache.get(URI, 100, 1.5) == TRACK
+
+
+def test_changed_file_is_not_used(metadata_cache):
+    metadata_cache.put(URI, 100, 1.5, TRACK)
+
+    assert metadata_cache.get(URI, 200, 1.5) is None
+    assert metadata_cache.get(URI, 100, 1.5) is None
+    assert len(metadata_cache) == 0
+
+
+def test_touched_file_is_not_used(metadata_cache):
+    metadata_cache.put(URI, 100, 1.5, TRACK)
+
+    assert metadata_cache.get(URI, 100, 2.5) is None
+
+
+def test_least_recently_used_uris_are_dropped(metadata_cache):
+    metadata_cache.put('file:///a', 1, 1, TRACK)
+    metadata_cache.put('file:///b', 1, 1, TRACK)
+    metadata_cache.get('file:///a', 1, 1)
+    metadata_cache.put('file:///c', 1, 1, TRACK)
+
+    assert metadata_cache.get('file:///a', 1, 1) == TRACK
+    assert metadata_cache.get('file:///b', 1, 1) is None
+    assert metadata_cache.get('file:///c', 1, 1) == TRACK
+
+
+def test_save_and_load(metadata_cache, tmpdir):
+    cache_file = str(tmpdir.join('metadata.json.gz'))
+    metadata_cache.put(URI, 100, 1.5, TRACK)
+    metadata_cache.save(cache_file)
+
+    loaded = cache.MetadataCache()
+    loaded.load(cache_file)
+
+    assert loaded.get(URI, 100, 1.5) == TRACK
+
+
+def test_save_skips_unchanged_cache(metadata_cache, tmpdir):
+    cache_file = str(tmpdir.join('metadata.json.gz'))
+    metadata_cache.save(cache_file)
+
+    assert not os.path.exists(cache_file)
+
+
+def test_load_missing_file(metadata_cache, tmpdir):
+    metadata_cache.load(str(tmpdir.join('missing.json.gz')))
+
+    assert len(metadata_cache) == 0
+
+
+def test_load_ignores_other_format_versions(metadata_cache, tmpdir):
+    cache_file = str(tmpdir.join('metadata.json.gz'))
+    metadata_cache.put(URI, 100, 1.5, TRACK)
+    metadata_cache.save(cache_file)
+
+    with mock.patch.object(
+            cache, 'FORMAT_VERSION', cache.FORMAT_VERSION + 1):
+        loaded = cache.MetadataCache()
+        loaded.load(cache_file)
+
+    assert len(loaded) == 0
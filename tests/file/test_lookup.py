@@ -1,3 +1,136 @@
 from __future__ import unicode_literals
 
-# TODO Test lookup()
+import os
+import time
+
+import mock
+
+import pykka
+
+import pytest
+
+from mopidy import exceptions
+from mopidy.internal import path
+
+
+@pytest.fixture
+def media_dir(tmpdir):
+    for name, content in [('song1.mp3', 'one'), ('song2.mp3', 'two')]:
+        tmpdir.join(name).write(content)
+        _set_old_mtime(str(tmpdir.join(name)))
+    return bytes(tmpdir)
+
+
+@pytest.fixture
+def file_config(media_dir):
+    return {
+        'proxy': {},
+        'file': {
+            'media_dirs': [media_dir.decode('utf-8')],
+            'show_dotfiles': False,
+            'excluded_file_extensions': [],
+            'follow_symlinks': False,
+            'metadata_timeout': 1000,
+        },
+    }
+
+
+@pytest.fixture
+def scanner(file_library):
+    scanner = mock.Mock(spec=['scan_async'])
+    scanner.scan_async.side_effect = _scan_async
+    file_library._scanner = scanner
+    return scanner
+
+
+def _scan_async(uri, timeout=None):
+    future = pykka.ThreadingFuture()
+    name = os.path.basename(path.uri_to_path(uri)).decode('utf-8')
+    result = mock.Mock(tags={'title': [name.upper()]}, duration=1000)
+    future.set(result)
+    return future
+
+
+def _set_old_mtime(file_path, age=60):
+    mtime = time.time() - age
+    os.utime(file_path, (mtime, mtime))
+
+
+def _uri(media_dir, name):
+    return path.path_to_uri(os.path.join(media_dir, name))
+
+
+def test_lookup_scans_file(file_library, scanner, media_dir):
+    uri = _uri(media_dir, b'song1.mp3')
+
+    tracks = file_library.lookup(uri)
+
+    assert len(tracks) == 1
+    assert tracks[0].uri == uri
+    assert tracks[0].name == 'SONG1.MP3'
+    assert tracks[0].length == 1000
+    scanner.scan_async.assert_called_once_with(uri, timeout=1000)
+
+
+def test_lookup_uses_filename_if_scan_fails(file_library, scanner, media_dir):
+    future = pykka.ThreadingFuture()
+    future.set_exception(exc_info=(
+        exceptions.ScannerError, exceptions.ScannerError('Failed'), None))
+    scanner.scan_async.side_effect = None
+    scanner.scan_async.return_value = future
+    uri = _uri(media_dir, b'song1.mp3')
+
+    tracks = file_library.lookup(uri)
+
+    assert tracks[0].name == 'song1.mp3'
+    assert tracks[0].length is None
+    assert len(file_library.metadata_cache) == 0
+
+
+def test_lookup_uses_cache_for_unchanged_files(
+        file_library, scanner, media_dir):
+    uri = _uri(media_dir, b'song1.mp3')
+    file_library.lookup(uri)
+
+    tracks = file_library.lookup(uri)
+
+    assert tracks[0].name == 'SONG1.MP3'
+    assert scanner.scan_async.call_count == 1
+
+
+def test_lookup_rescans_changed_files(file_library, scanner, media_dir):
+    uri = _uri(media_dir, b'song1.mp3')
+    file_library.lookup(uri)
+
+    with open(os.path.join(media_dir, b'song1.mp3'), 'a') as fh:
+        fh.write('more')
+    file_library.lookup(uri)
+
+    assert scanner.scan_async.call_count == 2
+
+
+def test_lookup_does_not_cache_recently_modified_files(
+        file_library, scanner, media_dir):
+    os.utime(os.path.join(media_dir, b'song1.mp3'), None)
+    uri = _uri(media_dir, b'song1.mp3')
+    file_library.lookup(uri)
+
+    tracks = file_library.lookup(uri)
+
+    assert tracks[0].name == 'SONG1.MP3'
+    assert scanner.scan_async.call_count == 2
+    assert len(file_library.metadata_cache) == 0
+
+
+def test_lookup_many_scans_uncached_files_together(
+        file_library, scanner, media_dir):
+    uri1 = _uri(media_dir, b'song1.mp3')
+    uri2 = _uri(media_dir, b'song2.mp3')
+    file_library.lookup(uri1)
+    scanner.scan_async.reset_mock()
+
+    result = file_library.lookup_many([uri1, uri2, uri2])
+
+    assert result[uri1][0].name == 'SONG1.MP3'
+    assert result[uri2][0].name == 'SONG2.MP3'
+    scanner.scan_async.assert_called_once_with(uri2, timeout=1000)
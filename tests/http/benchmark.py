@@ -0,0 +1,120 @@
+"""
+Benchmarks for JSON-RPC over HTTP and WebSocket.
+
+Not run as part of the test suite. Run with::
+
+    PYTHONPATH=. python tests/http/benchmark.py [REQUESTS]
+
+where ``REQUESTS`` is the number of ``core.playback.get_state`` calls to make
+with each method, by default 2000.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import json
+import sys
+import time
+
+import pykka
+
+import tornado.gen
+import tornado.httpclient
+import tornado.ioloop
+import tornado.netutil
+import tornado.websocket
+
+from mopidy import core
+from mopidy.http import actor, handlers
+from mopidy.internal import deprecation
+
+from tests import dummy_backend
+
+
+NUM_REQUESTS = 2000
+
+REQUEST = json.dumps({
+    'jsonrpc': '2.0', 'id': 1, 'method': 'core.playback.get_state'})
+
+
+def start_server():
+    config = {
+        'http': {
+            'hostname': '127.0.0.1',
+            'port': 0,
+            'static_dir': None,
+            'zeroconf': '',
+            'allowed_origins': [],
+            'max_concurrent_requests': 8,
+            'websocket_max_queued_events': 100,
+            'websocket_compression': False,
+            'image_cache_size': 0,
+            'image_sizes': [],
+        },
+    }
+    with deprecation.ignore():
+        core_proxy = core.Core.start(
+            config=None, backends=[dummy_backend.create_proxy()]).proxy()
+
+    sockets = tornado.netutil.bind_sockets(0, '127.0.0.1')
+    apps = [{
+        'name': 'mopidy',
+        'factory': handlers.make_mopidy_app_factory([], []),
+    }]
+    server = actor.HttpServer(
+        config=config, core=core_proxy, sockets=sockets, apps=apps,
+        statics=[])
+    server.daemon = True
+    server.start()
+    return server, sockets[0].getsockname()[1]
+
+
+def report(name, count, seconds):
+    print('%-40s %12.0f per second' % (name, count / seconds))
+
+
+def bench_http(port, count):
+    client = tornado.httpclient.HTTPClient()
+    url = 'http://127.0.0.1:%d/mopidy/rpc' % port
+    headers = {'Content-Type': 'application/json'}
+
+    start = time.time()
+    for _ in range(count):
+        client.fetch(url, method='POST', body=REQUEST, headers=headers)
+    report('HTTP POST', count, time.time() - start)
+    client.close()
+
+
+@tornado.gen.coroutine
+def bench_websocket(port, count):
+    conn = yield tornado.websocket.websocket_connect(
+        'ws://127.0.0.1:%d/mopidy/ws' % port)
+
+    start = time.time()
+    for _ in range(count):
+        conn.write_message(REQUEST)
+        yield conn.read_message()
+    report('WebSocket, one at a time', count, time.time() - start)
+
+    start = time.time()
+    for _ in range(count):
+        conn.write_message(REQUEST)
+    for _ in range(count):
+        yield conn.read_message()
+    report('WebSocket, pipelined', count, time.time() - start)
+
+    conn.close()
+
+
+def main(count):
+    server, port = start_server()
+    try:
+        bench_http(port, count)
+        tornado.ioloop.IOLoop().run_sync(
+            lambda: bench_websocket(port, count))
+    finally:
+        server.stop()
+        pykka.ActorRegistry.stop_all()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else NUM_REQUESTS)
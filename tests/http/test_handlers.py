@@ -1,15 +1,22 @@
 from __future__ import absolute_import, unicode_literals
 
+import json
 import os
+import unittest
 
 import mock
 
+import pykka
+
+import tornado.concurrent
+import tornado.gen
 import tornado.testing
 import tornado.web
 import tornado.websocket
 
 import mopidy
 from mopidy.http import handlers
+from mopidy.internal import jsonrpc, workers
 
 
 class StaticFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
@@ -41,20 +48,147 @@ class StaticFileHandlerTest(tornado.testing.AsyncHTTPTestCase):
             response.headers['Cache-Control'], 'no-cache')
 
 
+class MopidyAppFactoryTest(unittest.TestCase):
+
+    def test_handlers_share_jsonrpc_wrapper(self):
+        factory = handlers.make_mopidy_app_factory([], [])
+        config = {
+            'http': {
+                'allowed_origins': [],
+                'max_concurrent_requests': 1,
+                'websocket_max_queued_events': 1,
+                'websocket_compression': False,
+                'image_cache_size': 0,
+                'image_sizes': [],
+            },
+        }
+
+        request_handlers = factory(config, mock.Mock())
+
+        ws_kwargs, rpc_kwargs = request_handlers[0][2], request_handlers[1][2]
+        self.assertIsInstance(ws_kwargs['jsonrpc'], jsonrpc.JsonRpcWrapper)
+        self.assertIs(ws_kwargs['jsonrpc'], rpc_kwargs['jsonrpc'])
+        self.assertIs(ws_kwargs['pool'], rpc_kwargs['pool'])
+
+
+class EventSubscriptionsTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.subscriptions = handlers.EventSubscriptions()
+
+    def test_all_events_are_wanted_by_default(self):
+        self.assertTrue(self.subscriptions._wants('seeked'))
+        self.assertEqual(
+            sorted(handlers.EventSubscriptions.EVENTS),
+            self.subscriptions.get_subscriptions())
+
+    def test_subscribe_limits_events(self):
+        self.subscriptions.subscribe(['seeked'])
+        self.subscriptions.subscribe(['volume_changed'])
+
+        self.assertTrue(self.subscriptions._wants('seeked'))
+        self.assertTrue(self.subscriptions._wants('volume_changed'))
+        self.assertFalse(self.subscriptions._wants('tracklist_changed'))
+
+    def test_messages_without_event_are_always_wanted(self):
+        self.subscriptions.subscribe([])
+
+        self.assertTrue(self.subscriptions._wants(None))
+
+    def test_unsubscribe_while_receiving_all_events(self):
+        self.subscriptions.unsubscribe(['seeked'])
+
+        self.assertFalse(self.subscriptions._wants('seeked'))
+        self.assertTrue(self.subscriptions._wants('volume_changed'))
+
+    def test_unknown_events_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.subscriptions.subscribe(['seeked', 'bogus'])
+        with self.assertRaises(ValueError):
+            self.subscriptions.unsubscribe(['bogus'])
+
+    def test_events_match_core_listener(self):
+        self.assertIn('track_playback_started', self.subscriptions.EVENTS)
+        self.assertNotIn('on_event', self.subscriptions.EVENTS)
+
+
 class WebSocketHandlerTest(tornado.testing.AsyncHTTPTestCase):
 
     def get_app(self):
         self.core = mock.Mock()
+        self.core.get_version.return_value = mopidy.__version__
+        self.pool = workers.WorkerPool(2)
+        self.futures = []
+        handlers.WebSocketHandler.clients.clear()
         return tornado.web.Application([
             (r'/ws/?', handlers.WebSocketHandler, {
-                'core': self.core, 'allowed_origins': []
+                'core': self.core, 'allowed_origins': [], 'pool': self.pool,
             })
         ])
 
+    def tearDown(self):  # noqa: N802
+        for future in self.futures:
+            future.set(None)
+        self.pool.stop()
+        super(WebSocketHandlerTest, self).tearDown()
+
     def connection(self):
         url = self.get_url('/ws').replace('http', 'ws')
         return tornado.websocket.websocket_connect(url, self.io_loop)
 
+    def slow_method(self, count):
+        self.futures = [pykka.ThreadingFuture() for _ in range(count)]
+        self.core.playback.get_state.side_effect = self.futures
+
+    def request(self, conn, method, request_id):
+        conn.write_message(json.dumps(
+            {'jsonrpc': '2.0', 'method': method, 'id': request_id}))
+
+    @tornado.gen.coroutine
+    def read_id(self, conn):
+        message = yield conn.read_message()
+        raise tornado.gen.Return(json.loads(message)['id'])
+
+    @tornado.testing.gen_test
+    def test_slow_request_does_not_block_other_requests(self):
+        self.slow_method(1)
+        conn = yield self.connection()
+
+        self.request(conn, 'core.playback.get_state', 1)
+        self.request(conn, 'core.get_version', 2)
+        self.assertEqual(2, (yield self.read_id(conn)))
+
+        self.futures[0].set('playing')
+        self.assertEqual(1, (yield self.read_id(conn)))
+
+    @tornado.testing.gen_test
+    def test_requests_over_limit_wait_for_earlier_requests(self):
+        self.slow_method(2)
+        conn = yield self.connection()
+
+        self.request(conn, 'core.playback.get_state', 1)
+        self.request(conn, 'core.playback.get_state', 2)
+        self.request(conn, 'core.get_version', 3)
+        self.futures[0].set('playing')
+
+        self.assertEqual(1, (yield self.read_id(conn)))
+        self.assertEqual(3, (yield self.read_id(conn)))
+
+    @tornado.testing.gen_test
+    def test_methods_are_called_in_order_of_requests(self):
+        self.core.playback.get_state.return_value = 'stopped'
+        methods = ['core.get_version', 'core.playback.get_state'] * 3
+        conn = yield self.connection()
+
+        for i, method in enumerate(methods):
+            self.request(conn, method, i)
+        for _ in methods:
+            yield self.read_id(conn)
+
+        self.assertEqual(
+            [name for name, _, _ in self.core.mock_calls],
+            [method.replace('core.', '', 1) for method in methods])
+
     @tornado.testing.gen_test
     def test_invalid_json_rpc_request_doesnt_crash_handler(self):
         # An uncaught error would result in no message, so this is just a
@@ -71,6 +205,97 @@ class WebSocketHandlerTest(tornado.testing.AsyncHTTPTestCase):
         message = yield conn.read_message()
         self.assertEqual(message, 'message')
 
+    @tornado.gen.coroutine
+    def connected_client(self):
+        conn = yield self.connection()
+        client, = handlers.WebSocketHandler.clients
+        client.writes = []
+
+        def write_message(message):
+            client.writes.append(message)
+            future = tornado.concurrent.Future()
+            self.io_loop.add_callback(future.set_result, None)
+            return future
+
+        client.write_message = write_message
+        raise tornado.gen.Return((conn, client))
+
+    @tornado.testing.gen_test
+    def test_events_are_written_one_at_a_time(self):
+        conn, client = yield self.connected_client()
+
+        client.send_event('a')
+        client.send_event('b')
+        self.assertEqual(client.writes, ['a'])
+
+        yield tornado.gen.sleep(0.01)
+        self.assertEqual(client.writes, ['a', 'b'])
+
+    @tornado.testing.gen_test
+    def test_superseded_events_are_not_sent(self):
+        conn, client = yield self.connected_client()
+
+        client.send_event('a', 'track_playback_started')
+        client.send_event('b', 'seeked')
+        client.send_event('c', 'track_playback_paused')
+        client.send_event('d', 'seeked')
+        client.send_event('e', 'playlist_changed')
+        client.send_event('f', 'playlist_changed')
+
+        yield tornado.gen.sleep(0.01)
+        self.assertEqual(client.writes, ['a', 'c', 'd', 'e', 'f'])
+
+    @tornado.testing.gen_test
+    def test_client_too_far_behind_is_disconnected(self):
+        conn, client = yield self.connected_client()
+        client.max_queued_events = 2
+
+        for message in 'abcd':
+            client.send_event(message)
+
+        self.assertEqual(client.writes, ['a'])
+        self.assertIsNone((yield conn.read_message()))
+
+    def test_compression_is_disabled_by_default(self):
+        client = handlers.WebSocketHandler(
+            self._app, mock.Mock(), core=self.core, allowed_origins=[],
+            pool=self.pool)
+
+        self.assertIsNone(client.get_compression_options())
+
+    def test_compression_can_be_enabled(self):
+        client = handlers.WebSocketHandler(
+            self._app, mock.Mock(), core=self.core, allowed_origins=[],
+            pool=self.pool, compression=True)
+
+        self.assertEqual({}, client.get_compression_options())
+
+    @tornado.testing.gen_test
+    def test_subscribe_to_events(self):
+        conn = yield self.connection()
+        conn.write_message(json.dumps({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'core.events.subscribe',
+            'params': [['seeked', 'volume_changed']]}))
+        response = json.loads((yield conn.read_message()))
+        self.assertEqual(['seeked', 'volume_changed'], response['result'])
+
+        handlers.WebSocketHandler.broadcast('a', 'track_playback_started')
+        handlers.WebSocketHandler.broadcast('b', 'seeked')
+        handlers.WebSocketHandler.broadcast('c')
+
+        self.assertEqual('b', (yield conn.read_message()))
+        self.assertEqual('c', (yield conn.read_message()))
+
+    @tornado.testing.gen_test
+    def test_subscribe_to_unknown_event_fails(self):
+        conn = yield self.connection()
+        conn.write_message(json.dumps({
+            'jsonrpc': '2.0', 'id': 1, 'method': 'core.events.subscribe',
+            'params': [['bogus']]}))
+        response = json.loads((yield conn.read_message()))
+
+        self.assertEqual('ValueError', response['error']['data']['type'])
+
     @tornado.testing.gen_test
     def test_broadcast_to_client_that_just_closed_connection(self):
         conn = yield self.connection()
@@ -0,0 +1,175 @@
+from __future__ import absolute_import, unicode_literals
+
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+
+from mopidy.http import images
+from mopidy.internal import path
+from mopidy.models import Image
+
+
+class ImageCacheTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmpdir, b'images')
+        self.cache = images.ImageCache(
+            self.cache_dir, max_size=1024, sizes=[300, 64],
+            session=mock.Mock())
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.tmpdir)
+
+    def make_image(self, name, data):
+        file_path = os.path.join(self.tmpdir, name)
+        with open(file_path, 'wb') as fh:
+            fh.write(data)
+        return path.path_to_uri(file_path)
+
+    def test_get_size_picks_smallest_large_enough_size(self):
+        self.assertEqual(64, self.cache.get_size(1))
+        self.assertEqual(64, self.cache.get_size(64))
+        self.assertEqual(300, self.cache.get_size(65))
+        self.assertEqual(images.ORIGINAL, self.cache.get_size(301))
+
+    def test_add_file_image(self):
+        uri = self.make_image('a.jpg', b'data')
+
+        key = self.cache.add(uri)
+
+        self.assertEqual(images.get_key(uri), key)
+        self.assertEqual(b'data', self.cache.read(key))
+
+    def test_add_http_image(self):
+        uri = 'http://example.com/a.jpg'
+        with mock.patch.object(
+                images.http, 'download', return_value=b'data') as download:
+            key = self.cache.add(uri)
+            self.cache.add(uri)
+
+        download.assert_called_once_with(
+            self.cache._session, uri, timeout=self.cache._timeout)
+        self.assertEqual(b'data', self.cache.read(key))
+
+    def test_add_unsupported_uri(self):
+        self.assertIsNone(self.cache.add('dummy:image'))
+
+    def test_add_missing_file(self):
+        uri = path.path_to_uri(os.path.join(self.tmpdir, 'missing.jpg'))
+
+        self.assertIsNone(self.cache.add(uri))
+
+    def test_concurrent_adds_fetch_once(self):
+        uri = 'http://example.com/a.jpg'
+        fetching = threading.Event()
+        done = threading.Event()
+
+        def fetch(uri):
+            fetching.set()
+            done.wait(1)
+            return b'data'
+
+        with mock.patch.object(
+                self.cache, '_fetch', side_effect=fetch) as mock_fetch:
+            threads = [
+                threading.Thread(target=self.cache.add, args=[uri])
+                for _ in range(2)]
+            threads[0].start()
+            fetching.wait(1)
+            threads[1].start()
+            done.set()
+            for thread in threads:
+                thread.join(1)
+
+        mock_fetch.assert_called_once_with(uri)
+        self.assertEqual(b'data', self.cache.read(images.get_key(uri)))
+
+    def test_read_falls_back_to_original(self):
+        key = self.cache.add(self.make_image('a.jpg', b'data'))
+
+        with mock.patch.object(images, 'PILImage', None):
+            self.assertEqual(b'data', self.cache.read(key, 64))
+
+    def test_read_unknown_key(self):
+        self.assertIsNone(self.cache.read(images.get_key('unknown')))
+
+    def test_least_recently_used_images_are_removed(self):
+        first = self.cache.add(self.make_image('a', b'a' * 500))
+        second = self.cache.add(self.make_image('b', b'b' * 500))
+        self.cache.read(first)
+        third = self.cache.add(self.make_image('c', b'c' * 500))
+
+        self.assertIsNotNone(self.cache.read(first))
+        self.assertIsNone(self.cache.read(second))
+        self.assertIsNotNone(self.cache.read(third))
+
+    def test_cached_images_are_kept_across_restarts(self):
+        key = self.cache.add(self.make_image('a.jpg', b'data'))
+
+        cache = images.ImageCache(
+            self.cache_dir, max_size=1024, sizes=[], session=None)
+
+        self.assertEqual(b'data', cache.read(key))
+        self.assertEqual(4, cache._total_size)
+
+    @unittest.skipIf(images.PILImage is None, 'Pillow not installed')
+    def test_thumbnails_are_made_for_each_size(self):
+        output = io.BytesIO()
+        images.PILImage.new('RGB', (600, 400)).save(output, 'PNG')
+        cache = images.ImageCache(
+            self.cache_dir, max_size=2 ** 20, sizes=[300, 64], session=None)
+        key = cache.add(self.make_image('a.png', output.getvalue()))
+
+        for size in (64, 300):
+            thumbnail = images.PILImage.open(io.BytesIO(cache.read(key, size)))
+            self.assertLessEqual(max(thumbnail.size), size)
+
+
+class ImageServiceTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.core = mock.Mock()
+        self.cache = mock.Mock(spec=images.ImageCache)
+        self.service = images.ImageService(self.core, self.cache, size=1)
+
+    def set_images(self, uri, *result):
+        self.core.library.get_images.return_value.get.return_value = {
+            uri: result}
+
+    def test_gets_key_of_largest_image(self):
+        self.set_images(
+            'dummy:a', Image(uri='http://small', width=10, height=10),
+            Image(uri='http://large', width=100, height=100))
+
+        key = self.service.get_key('dummy:a')
+
+        self.cache.add.assert_called_once_with('http://large')
+        self.assertEqual(self.cache.add.return_value, key)
+
+    def test_no_images(self):
+        self.set_images('dummy:a')
+
+        self.assertIsNone(self.service.get_key('dummy:a'))
+        self.cache.add.assert_not_called()
+
+    def test_images_are_only_looked_up_once(self):
+        self.set_images('dummy:a', Image(uri='http://a'))
+
+        self.service.get_key('dummy:a')
+        self.service.get_key('dummy:a')
+
+        self.core.library.get_images.assert_called_once_with(['dummy:a'])
+
+    def test_only_the_most_recent_uris_are_remembered(self):
+        self.set_images('dummy:a', Image(uri='http://a'))
+        self.service.get_key('dummy:a')
+        self.set_images('dummy:b', Image(uri='http://b'))
+        self.service.get_key('dummy:b')
+
+        self.assertEqual(['dummy:b'], list(self.service._images))
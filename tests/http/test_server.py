@@ -1,14 +1,25 @@
 from __future__ import absolute_import, unicode_literals
 
+import gzip
+import io
 import os
+import shutil
+import tempfile
 
 import mock
 
+import pykka
+
 import tornado.testing
 import tornado.wsgi
 
 import mopidy
-from mopidy.http import actor, handlers
+from mopidy import core
+from mopidy.http import actor, handlers, images
+from mopidy.internal import deprecation, metrics, path
+from mopidy.models import Image, Playlist, Ref, Track
+
+from tests import dummy_backend
 
 
 class HttpServerTest(tornado.testing.AsyncHTTPTestCase):
@@ -21,13 +32,22 @@ class HttpServerTest(tornado.testing.AsyncHTTPTestCase):
                 'static_dir': None,
                 'zeroconf': '',
                 'allowed_origins': [],
+                'max_concurrent_requests': 2,
+                'websocket_max_queued_events': 10,
+                'websocket_compression': False,
+                'image_cache_size': 0,
+                'image_sizes': [],
             }
         }
 
-    def get_app(self):
+    def get_core(self):
         core = mock.Mock()
         core.get_version = mock.MagicMock(name='get_version')
         core.get_version.return_value = mopidy.__version__
+        return core
+
+    def get_app(self):
+        core = self.get_core()
 
         testapps = [dict(name='testapp')]
         teststatics = [dict(name='teststatic')]
@@ -164,6 +184,20 @@ class MopidyRPCHandlerTest(HttpServerTest):
             {'jsonrpc': '2.0', 'id': 1, 'result': mopidy.__version__},
             tornado.escape.json_decode(response.body))
 
+    def test_describe_includes_profiler_methods(self):
+        cmd = tornado.escape.json_encode({
+            'method': 'core.describe',
+            'jsonrpc': '2.0',
+            'id': 1,
+        })
+
+        response = self.fetch('/mopidy/rpc', method='POST', body=cmd, headers={
+            'Content-Type': 'application/json'})
+
+        result = tornado.escape.json_decode(response.body)['result']
+        self.assertIn('profiler.start', result)
+        self.assertIn('profiler.stop', result)
+
     def test_should_return_extra_headers(self):
         response = self.fetch('/mopidy/rpc', method='HEAD')
 
@@ -205,6 +239,274 @@ class MopidyRPCHandlerTest(HttpServerTest):
             response.headers['Access-Control-Allow-Headers'], 'Content-Type')
 
 
+class MopidyReadHandlerTest(HttpServerTest):
+
+    def get_core(self):
+        self.backend = dummy_backend.create_proxy()
+        config = {'core': {'max_tracklist_length': 10000}}
+        with deprecation.ignore():
+            self.core = core.Core.start(
+                config=config, backends=[self.backend]).proxy()
+        return self.core
+
+    def tearDown(self):  # noqa: N802
+        super(MopidyReadHandlerTest, self).tearDown()
+        pykka.ActorRegistry.stop_all()
+
+    def add_tracks(self, count):
+        tracks = [
+            Track(uri='dummy:track%d' % i, name='Track %d' % i)
+            for i in range(count)]
+        self.backend.library.dummy_library = tracks
+        self.core.tracklist.add(uris=[t.uri for t in tracks]).get()
+
+    def test_tracklist_is_encoded_like_jsonrpc_results(self):
+        self.add_tracks(1)
+
+        response = self.fetch('/mopidy/api/tracklist')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(
+            [{'__model__': 'TlTrack', 'tlid': 1, 'track': {
+                '__model__': 'Track', 'uri': 'dummy:track0',
+                'name': 'Track 0'}}],
+            tornado.escape.json_decode(response.body))
+        self.assertIn('X-Mopidy-Version', response.headers)
+
+    def test_tracklist_etag_changes_with_tracklist_version(self):
+        etag = self.fetch('/mopidy/api/tracklist').headers['Etag']
+
+        response = self.fetch(
+            '/mopidy/api/tracklist', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.code)
+        self.assertEqual(b'', response.body)
+
+        self.add_tracks(1)
+        response = self.fetch(
+            '/mopidy/api/tracklist', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.code)
+        self.assertNotEqual(etag, response.headers['Etag'])
+
+    def test_unchanged_tracklist_is_not_fetched_again(self):
+        etag = self.fetch('/mopidy/api/tracklist').headers['Etag']
+
+        with mock.patch.object(
+                handlers.TracklistHandler, 'get_data') as get_data:
+            not_modified = self.fetch(
+                '/mopidy/api/tracklist', headers={'If-None-Match': etag})
+            cached = self.fetch('/mopidy/api/tracklist')
+
+        self.assertEqual(304, not_modified.code)
+        self.assertEqual(b'[]', cached.body)
+        get_data.assert_not_called()
+
+    def test_large_responses_are_gzipped(self):
+        self.add_tracks(50)
+
+        response = self.fetch(
+            '/mopidy/api/tracklist', decompress_response=False,
+            headers={'Accept-Encoding': 'gzip'})
+
+        self.assertEqual('gzip', response.headers['Content-Encoding'])
+        self.assertEqual('Accept-Encoding', response.headers['Vary'])
+        data = gzip.GzipFile(fileobj=io.BytesIO(response.body)).read()
+        self.assertEqual(50, len(tornado.escape.json_decode(data)))
+
+    def test_small_responses_are_not_gzipped(self):
+        response = self.fetch(
+            '/mopidy/api/tracklist', decompress_response=False,
+            headers={'Accept-Encoding': 'gzip'})
+
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(b'[]', response.body)
+
+    def test_playlists_etag_changes_without_playlist_events(self):
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(uri='dummy:pl', name='pl')]).get()
+        response = self.fetch('/mopidy/api/playlists')
+        etag = response.headers['Etag']
+
+        self.assertEqual(
+            [{'__model__': 'Ref', 'type': 'playlist', 'uri': 'dummy:pl',
+              'name': 'pl'}],
+            tornado.escape.json_decode(response.body))
+
+        response = self.fetch(
+            '/mopidy/api/playlists', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.code)
+
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(uri='dummy:pl', name='renamed')]).get()
+        response = self.fetch(
+            '/mopidy/api/playlists', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.code)
+        self.assertNotEqual(etag, response.headers['Etag'])
+        self.assertEqual(
+            'renamed', tornado.escape.json_decode(response.body)[0]['name'])
+
+    def test_playlist_events_drop_cached_playlists(self):
+        self.backend.playlists.set_dummy_playlists(
+            [Playlist(uri='dummy:pl', name='pl')]).get()
+        put = handlers.ResponseCache.put
+
+        with mock.patch.object(
+                handlers.ResponseCache, 'put', autospec=True,
+                side_effect=put) as put_mock:
+            self.fetch('/mopidy/api/playlists')
+            self.fetch('/mopidy/api/playlists')
+            actor.on_event(
+                'playlist_changed', playlist=Playlist(uri='dummy:pl'))
+            response = self.fetch('/mopidy/api/playlists')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(2, put_mock.call_count)
+        first_key = put_mock.call_args_list[0][0][1]
+        second_key = put_mock.call_args_list[1][0][1]
+        self.assertNotEqual(first_key, second_key)
+
+    def test_playlist_items(self):
+        self.backend.playlists.set_dummy_playlists([Playlist(
+            uri='dummy:pl', tracks=[Track(uri='dummy:a', name='a')])]).get()
+
+        response = self.fetch('/mopidy/api/playlists?uri=dummy:pl')
+
+        self.assertEqual(
+            [{'__model__': 'Ref', 'type': 'track', 'uri': 'dummy:a',
+              'name': 'a'}],
+            tornado.escape.json_decode(response.body))
+
+    def test_unknown_playlist_is_not_found(self):
+        response = self.fetch('/mopidy/api/playlists?uri=dummy:unknown')
+
+        self.assertEqual(404, response.code)
+
+    def test_browse_etag_is_derived_from_result(self):
+        self.backend.library.dummy_browse_result = {
+            'dummy:/': [Ref.track(uri='dummy:a', name='a')]}
+        response = self.fetch('/mopidy/api/browse?uri=dummy:/')
+        etag = response.headers['Etag']
+
+        self.assertEqual(
+            [{'__model__': 'Ref', 'type': 'track', 'uri': 'dummy:a',
+              'name': 'a'}],
+            tornado.escape.json_decode(response.body))
+        response = self.fetch(
+            '/mopidy/api/browse?uri=dummy:/', headers={'If-None-Match': etag})
+        self.assertEqual(304, response.code)
+
+        self.backend.library.dummy_browse_result = {'dummy:/': []}
+        response = self.fetch(
+            '/mopidy/api/browse?uri=dummy:/', headers={'If-None-Match': etag})
+        self.assertEqual(200, response.code)
+        self.assertEqual(b'[]', response.body)
+
+    def test_browse_root(self):
+        response = self.fetch('/mopidy/api/browse')
+
+        self.assertEqual(
+            [{'__model__': 'Ref', 'type': 'directory', 'uri': 'dummy:/',
+              'name': 'dummy'}],
+            tornado.escape.json_decode(response.body))
+
+    def test_same_origin_gets_cors_header(self):
+        response = self.fetch('/mopidy/api/tracklist', headers={
+            'Host': 'me:6680', 'Origin': 'http://me:6680'})
+
+        self.assertEqual(
+            'http://me:6680', response.headers['Access-Control-Allow-Origin'])
+
+
+class MopidyMetricsHandlerTest(HttpServerTest):
+
+    def tearDown(self):  # noqa: N802
+        super(MopidyMetricsHandlerTest, self).tearDown()
+        metrics.registry.enabled = False
+        metrics.registry.reset()
+
+    def test_metrics_are_not_found_when_disabled(self):
+        response = self.fetch('/mopidy/metrics')
+
+        self.assertEqual(404, response.code)
+
+    def test_metrics_in_prometheus_format(self):
+        metrics.registry.enabled = True
+        metrics.registry.observe('mpd', 'status', 0.01)
+
+        response = self.fetch('/mopidy/metrics')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(
+            'text/plain; version=0.0.4', response.headers['Content-Type'])
+        self.assertIn(
+            b'mopidy_call_duration_seconds_count'
+            b'{component="mpd",method="status"} 1\n',
+            response.body)
+
+
+class MopidyImageHandlerTest(HttpServerTest):
+
+    def setUp(self):  # noqa: N802
+        # Non-ASCII, to check that the cache dir is joined as bytes.
+        self.tmpdir = tempfile.mkdtemp(suffix=b'-\xc3\xa6')
+        super(MopidyImageHandlerTest, self).setUp()
+
+    def tearDown(self):  # noqa: N802
+        super(MopidyImageHandlerTest, self).tearDown()
+        shutil.rmtree(self.tmpdir)
+
+    def get_config(self):
+        config = super(MopidyImageHandlerTest, self).get_config()
+        config['core'] = {'cache_dir': self.tmpdir}
+        config['proxy'] = {}
+        config['http']['image_cache_size'] = 1
+        config['http']['image_sizes'] = ['64', '300']
+        return config
+
+    def get_core(self):
+        image_path = os.path.join(self.tmpdir, b'image.png')
+        with open(image_path, 'wb') as fh:
+            fh.write(b'\x89PNG\r\n\x1a\n')
+        core = super(MopidyImageHandlerTest, self).get_core()
+        core.library.get_images.return_value.get.return_value = {
+            'dummy:a': [Image(uri=path.path_to_uri(image_path))]}
+        return core
+
+    def test_redirects_to_cached_image(self):
+        response = self.fetch(
+            '/mopidy/images/?uri=dummy:a&size=100', follow_redirects=False)
+
+        self.assertEqual(302, response.code)
+        self.assertEqual('no-cache', response.headers['Cache-Control'])
+        key = images.get_key(
+            path.path_to_uri(os.path.join(self.tmpdir, b'image.png')))
+        self.assertEqual(
+            '/mopidy/images/%s/300' % key, response.headers['Location'])
+
+    def test_serves_cached_image_with_long_lived_cache_headers(self):
+        response = self.fetch('/mopidy/images/?uri=dummy:a')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual(b'\x89PNG\r\n\x1a\n', response.body)
+        self.assertEqual('image/png', response.headers['Content-Type'])
+        self.assertEqual(
+            'public, max-age=31536000', response.headers['Cache-Control'])
+
+    def test_unknown_item_is_not_found(self):
+        response = self.fetch('/mopidy/images/?uri=dummy:unknown')
+
+        self.assertEqual(404, response.code)
+
+    def test_invalid_size(self):
+        response = self.fetch('/mopidy/images/?uri=dummy:a&size=large')
+
+        self.assertEqual(400, response.code)
+
+    def test_uncached_image_is_not_found(self):
+        response = self.fetch('/mopidy/images/%s/0' % ('0' * 40))
+
+        self.assertEqual(404, response.code)
+
+
 class HttpServerWithStaticFilesTest(tornado.testing.AsyncHTTPTestCase):
 
     def get_app(self):
@@ -61,3 +61,37 @@ def test_download_times_out_if_download_is_slow(session, caplog):
     assert (
         'Download of %r failed due to download taking more than 1.000s' % URI
         in caplog.text)
+
+
+@responses.activate
+def test_download_chunks(session):
+    responses.add(responses.GET, URI, body=BODY, content_type='text/plain')
+
+    chunks = http.download_chunks(session, URI, chunk_size=10)
+
+    assert list(chunks) == [BODY[i:i + 10] for i in range(0, len(BODY), 10)]
+
+
+@responses.activate
+def test_download_chunks_on_server_side_error(session, caplog):
+    responses.add(responses.GET, URI, body=BODY, status=500)
+
+    result = http.download_chunks(session, URI)
+
+    assert result is None
+    assert 'Problem downloading' in caplog.text
+
+
+@responses.activate
+def test_download_chunks_stops_if_download_is_slow(session, caplog):
+    responses.add(responses.GET, URI, body=BODY, content_type='text/plain')
+
+    with mock.patch.object(http, 'time') as time_mock:
+        time_mock.time.side_effect = [0, 0, TIMEOUT + 1]
+
+        chunks = list(http.download_chunks(session, URI, chunk_size=10))
+
+    assert chunks == [BODY[:10], BODY[10:20]]
+    assert (
+        'Download of %r stopped due to download taking more than 1.000s' % URI
+        in caplog.text)
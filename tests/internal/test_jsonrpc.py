@@ -1,6 +1,7 @@
 from __future__ import absolute_import, unicode_literals
 
 import json
+import time
 import unittest
 
 import mock
@@ -8,7 +9,7 @@ import mock
 import pykka
 
 from mopidy import core, models
-from mopidy.internal import deprecation, jsonrpc
+from mopidy.internal import deprecation, jsonrpc, metrics
 
 from tests import dummy_backend
 
@@ -50,6 +51,13 @@ class Calculator(object):
         raise ValueError('What did you expect?')
 
 
+class Sleeper(pykka.ThreadingActor):
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+        return seconds
+
+
 class JsonRpcTestBase(unittest.TestCase):
 
     def setUp(self):  # noqa: N802
@@ -85,28 +93,29 @@ class JsonRpcSetupTest(JsonRpcTestBase):
 class JsonRpcSerializationTest(JsonRpcTestBase):
 
     def test_handle_json_converts_from_and_to_json(self):
-        self.jrw.handle_data = mock.Mock()
-        self.jrw.handle_data.return_value = {'foo': 'response'}
+        self.jrw.dispatch_data = mock.Mock()
+        self.jrw.dispatch_data.return_value = lambda: {'foo': 'response'}
 
         request = '{"foo": "request"}'
         response = self.jrw.handle_json(request)
 
-        self.jrw.handle_data.assert_called_once_with({'foo': 'request'})
+        self.jrw.dispatch_data.assert_called_once_with({'foo': 'request'})
         self.assertEqual(response, '{"foo": "response"}')
 
     def test_handle_json_decodes_mopidy_models(self):
-        self.jrw.handle_data = mock.Mock()
-        self.jrw.handle_data.return_value = []
+        self.jrw.dispatch_data = mock.Mock()
+        self.jrw.dispatch_data.return_value = lambda: []
 
         request = '{"foo": {"__model__": "Artist", "name": "bar"}}'
         self.jrw.handle_json(request)
 
-        self.jrw.handle_data.assert_called_once_with(
+        self.jrw.dispatch_data.assert_called_once_with(
             {'foo': models.Artist(name='bar')})
 
     def test_handle_json_encodes_mopidy_models(self):
-        self.jrw.handle_data = mock.Mock()
-        self.jrw.handle_data.return_value = {'foo': models.Artist(name='bar')}
+        self.jrw.dispatch_data = mock.Mock()
+        self.jrw.dispatch_data.return_value = lambda: {
+            'foo': models.Artist(name='bar')}
 
         request = '[]'
         response = json.loads(self.jrw.handle_json(request))
@@ -253,6 +262,173 @@ class JsonRpcSingleCommandTest(JsonRpcTestBase):
         self.assertEqual(response['result'], 7)
 
 
+class JsonRpcDispatchTest(JsonRpcTestBase):
+
+    def test_method_is_called_before_waiting_for_the_result(self):
+        future = pykka.ThreadingFuture()
+        self.calc.add = mock.Mock(return_value=future)
+
+        complete = self.jrw.dispatch_json(
+            '{"jsonrpc": "2.0", "method": "calc.add", "params": [1, 2], '
+            '"id": 1}')
+
+        self.calc.add.assert_called_once_with(1, 2)
+
+        future.set(3)
+        self.assertEqual(json.loads(complete())['result'], 3)
+
+    def test_batch_calls_all_methods_before_waiting(self):
+        futures = [pykka.ThreadingFuture(), pykka.ThreadingFuture()]
+        self.calc.add = mock.Mock(side_effect=futures)
+
+        complete = self.jrw.dispatch_data([
+            {'jsonrpc': '2.0', 'method': 'calc.add', 'params': [1, 2],
+             'id': 1},
+            {'jsonrpc': '2.0', 'method': 'calc.add', 'params': [3, 4],
+             'id': 2},
+        ])
+
+        self.assertEqual(self.calc.add.call_count, 2)
+
+        futures[1].set(7)
+        futures[0].set(3)
+        self.assertEqual([r['result'] for r in complete()], [3, 7])
+
+    def test_batch_responses_keep_order_of_requests(self):
+        futures = [pykka.ThreadingFuture() for _ in range(3)]
+        self.calc.add = mock.Mock(side_effect=futures)
+
+        complete = self.jrw.dispatch_data([
+            {'jsonrpc': '2.0', 'method': 'calc.add', 'id': 1},
+            {'jsonrpc': '2.0', 'method': 'calc.add'},
+            {'jsonrpc': '2.0', 'method': 'calc.bogus', 'id': 2},
+            {'jsonrpc': '2.0', 'method': 'calc.add', 'id': 3},
+        ])
+        futures[2].set('c')
+        futures[1].set('b')
+        futures[0].set('a')
+        response = complete()
+
+        self.assertEqual([r['id'] for r in response], [1, 2, 3])
+        self.assertEqual(response[0]['result'], 'a')
+        self.assertEqual(response[1]['error']['code'], -32601)
+        self.assertEqual(response[2]['result'], 'c')
+
+    def test_batch_calls_to_different_actors_run_concurrently(self):
+        jrw = jsonrpc.JsonRpcWrapper(objects={
+            'sleeper%d' % i: Sleeper.start().proxy() for i in range(3)})
+        request = [
+            {'jsonrpc': '2.0', 'method': 'sleeper%d.sleep' % i,
+             'params': [0.2], 'id': i}
+            for i in range(3)]
+
+        start = time.time()
+        response = jrw.handle_data(request)
+
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual([r['result'] for r in response], [0.2] * 3)
+
+    def test_error_in_result_is_returned_on_completion(self):
+        future = pykka.ThreadingFuture()
+        self.calc.add = mock.Mock(return_value=future)
+
+        complete = self.jrw.dispatch_data(
+            {'jsonrpc': '2.0', 'method': 'calc.add', 'id': 1})
+        try:
+            raise ValueError('What did you expect?')
+        except ValueError:
+            future.set_exception()
+        response = complete()
+
+        self.assertEqual(response['error']['code'], 0)
+        self.assertEqual(response['error']['data']['type'], 'ValueError')
+
+    def test_notification_result_is_not_waited_for(self):
+        self.calc.add = mock.Mock(return_value=pykka.ThreadingFuture())
+
+        complete = self.jrw.dispatch_data(
+            {'jsonrpc': '2.0', 'method': 'calc.add'})
+
+        self.assertIsNone(complete())
+
+
+class JsonRpcMetricsTest(JsonRpcTestBase):
+
+    def test_calls_are_timed(self):
+        request = {
+            'jsonrpc': '2.0',
+            'id': 1,
+            'method': 'core.playback.get_state',
+        }
+
+        with mock.patch.object(metrics.registry, 'enabled', True), \
+                mock.patch.object(metrics.registry, 'observe') as observe:
+            self.jrw.handle_data(request)
+
+        observe.assert_any_call(
+            'jsonrpc', 'core.playback.get_state', mock.ANY)
+
+
+class JsonRpcMethodCacheTest(JsonRpcTestBase):
+
+    def test_method_is_only_looked_up_once(self):
+        request = {
+            'jsonrpc': '2.0',
+            'method': 'core.playback.get_state',
+            'id': 1,
+        }
+
+        with mock.patch.object(
+                self.jrw, '_find_method',
+                wraps=self.jrw._find_method) as find_method:
+            self.jrw.handle_data(request)
+            response = self.jrw.handle_data(request)
+
+        find_method.assert_called_once_with('core.playback.get_state')
+        self.assertEqual(response['result'], 'stopped')
+
+    def test_missing_method_is_not_cached(self):
+        request = {'jsonrpc': '2.0', 'method': 'calc.bogus', 'id': 1}
+
+        self.assertIn('error', self.jrw.handle_data(request))
+
+        self.calc.bogus = lambda: 'found'
+        self.assertEqual(self.jrw.handle_data(request)['result'], 'found')
+
+
+class JsonRpcExtendTest(JsonRpcTestBase):
+
+    def setUp(self):  # noqa: N802
+        super(JsonRpcExtendTest, self).setUp()
+        self.extended = self.jrw.extend({'extra': Calculator()})
+
+    def test_extended_wrapper_exposes_new_objects(self):
+        response = self.extended.handle_data(
+            {'jsonrpc': '2.0', 'method': 'extra.add', 'params': [1, 2],
+             'id': 1})
+
+        self.assertEqual(response['result'], 3)
+
+    def test_extended_wrapper_exposes_original_objects(self):
+        response = self.extended.handle_data(
+            {'jsonrpc': '2.0', 'method': 'calc.model', 'id': 1})
+
+        self.assertEqual(response['result'], 'TI83')
+
+    def test_original_wrapper_is_unchanged(self):
+        response = self.jrw.handle_data(
+            {'jsonrpc': '2.0', 'method': 'extra.add', 'id': 1})
+
+        self.assertEqual(response['error']['code'], -32601)
+
+    def test_original_objects_are_looked_up_in_original_wrapper(self):
+        self.extended.handle_data(
+            {'jsonrpc': '2.0', 'method': 'calc.model', 'id': 1})
+
+        self.assertIn('calc.model', self.jrw._methods)
+        self.assertNotIn('calc.model', self.extended._methods)
+
+
 class JsonRpcSingleNotificationTest(JsonRpcTestBase):
 
     def test_notification_does_not_return_a_result(self):
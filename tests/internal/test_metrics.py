@@ -0,0 +1,109 @@
+from __future__ import absolute_import, unicode_literals
+
+import unittest
+
+import mock
+
+from mopidy import backend
+from mopidy.internal import metrics
+
+
+class RegistryTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.registry = metrics.Registry()
+        self.registry.enabled = True
+
+    def get_histogram(self, component, method):
+        return dict(self.registry.get_histograms())[(component, method)]
+
+    def test_observe(self):
+        self.registry.observe('core', 'library.search', 0.002)
+        self.registry.observe('core', 'library.search', 0.3)
+
+        histogram = self.get_histogram('core', 'library.search')
+        self.assertEqual(2, histogram.count)
+        self.assertAlmostEqual(0.302, histogram.sum)
+        self.assertEqual(0.3, histogram.max)
+        self.assertEqual(1, histogram.bucket_counts[1])
+        self.assertEqual(1, histogram.bucket_counts[7])
+
+    def test_slower_than_all_buckets(self):
+        self.registry.observe('core', 'library.search', 60)
+
+        histogram = self.get_histogram('core', 'library.search')
+        self.assertEqual(1, histogram.bucket_counts[-1])
+
+    def test_timed(self):
+        with mock.patch.object(metrics.time, 'time', side_effect=[1.0, 1.5]):
+            with self.registry.timed('mpd', 'status'):
+                pass
+
+        self.assertEqual(0.5, self.get_histogram('mpd', 'status').sum)
+
+    def test_timed_records_nothing_when_disabled(self):
+        self.registry.enabled = False
+
+        with self.registry.timed('mpd', 'status'):
+            pass
+
+        self.assertEqual([], self.registry.get_histograms())
+
+    def test_instrument(self):
+        provider = backend.LibraryProvider(backend=None)
+
+        self.registry.instrument(provider, 'backend', ['browse', 'lookup'])
+        result = provider.browse('dummy:/')
+
+        self.assertEqual([], result)
+        self.assertEqual(
+            1, self.get_histogram('backend', 'LibraryProvider.browse').count)
+        self.assertEqual(
+            [('backend', 'LibraryProvider.browse')],
+            [key for key, _ in self.registry.get_histograms()])
+
+    def test_instrument_does_nothing_when_disabled(self):
+        self.registry.enabled = False
+        provider = backend.LibraryProvider(backend=None)
+
+        self.registry.instrument(provider, 'backend', ['browse'])
+
+        self.assertNotIn('browse', vars(provider))
+
+    def test_format_prometheus(self):
+        self.registry.observe('jsonrpc', 'core.get_"version"', 0.02)
+
+        lines = self.registry.format_prometheus().splitlines()
+
+        labels = 'component="jsonrpc",method="core.get_\\"version\\""'
+        self.assertIn('# TYPE mopidy_call_duration_seconds histogram', lines)
+        self.assertIn(
+            'mopidy_call_duration_seconds_bucket{%s,le="0.01"} 0' % labels,
+            lines)
+        self.assertIn(
+            'mopidy_call_duration_seconds_bucket{%s,le="0.025"} 1' % labels,
+            lines)
+        self.assertIn(
+            'mopidy_call_duration_seconds_bucket{%s,le="+Inf"} 1' % labels,
+            lines)
+        self.assertIn(
+            'mopidy_call_duration_seconds_sum{%s} 0.02' % labels, lines)
+        self.assertIn(
+            'mopidy_call_duration_seconds_count{%s} 1' % labels, lines)
+
+    def test_format_summary(self):
+        self.registry.observe('mpd', 'status', 0.01)
+        self.registry.observe('mpd', 'status', 0.03)
+
+        lines = self.registry.format_summary().splitlines()
+
+        self.assertEqual(2, len(lines))
+        self.assertEqual(
+            ['mpd', 'status', '2', '40.0', '20.0', '30.0'], lines[1].split())
+
+    def test_reset(self):
+        self.registry.observe('mpd', 'status', 0.01)
+
+        self.registry.reset()
+
+        self.assertEqual([], self.registry.get_histograms())
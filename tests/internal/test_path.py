@@ -5,6 +5,7 @@ from __future__ import absolute_import, unicode_literals
 import os
 import shutil
 import tempfile
+import time
 import unittest
 
 import pytest
@@ -406,6 +407,14 @@ class FindMTimesTest(unittest.TestCase):
         self.assertEqual(errors, {})
 
 
+class TestIsRecentlyModified(object):
+    def test_now_is_recent(self):
+        assert path.is_recently_modified(time.time())
+
+    def test_a_minute_ago_is_not_recent(self):
+        assert not path.is_recently_modified(time.time() - 60)
+
+
 class TestIsPathInsideBaseDir(object):
     def test_when_inside(self):
         assert path.is_path_inside_base_dir(
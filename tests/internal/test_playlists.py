@@ -171,3 +171,47 @@ class UriListPlaylistTest(unittest.TestCase):
     def test_parse_invalid_playlist(self):
         uris = list(self.parse(self.invalid))
         self.assertEqual(uris, [])
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('data', [
+    URILIST, EXTM3U, PLS, ASX, SIMPLE_ASX, XSPF])
+@pytest.mark.parametrize('size', [1, 7, 100])
+def test_parse_chunks(data, size):
+    assert playlists.parse_chunks(split(data, size)) == EXPECTED
+
+
+@pytest.mark.parametrize('data', [
+    URILIST, EXTM3U, PLS, ASX, SIMPLE_ASX, XSPF])
+def test_parse_chunks_stops_after_max_uris(data):
+    def chunks():
+        for chunk in split(data, 10):
+            yield chunk
+        # Allow for some reading ahead, but not to the end.
+        for _ in range(64):
+            yield b'\n' * 1024
+        raise AssertionError('Read to the end of the playlist')
+
+    result = playlists.parse_chunks(chunks(), max_uris=1)
+
+    assert result == EXPECTED[:1]
+
+
+def test_parse_chunks_stops_after_max_size():
+    data = EXTM3U + b'file:///tmp/qux\n' * 1000
+
+    result = playlists.parse_chunks(
+        split(data, 10), max_size=EXTM3U.index(b'file:///tmp/baz') + 15)
+
+    assert result == EXPECTED
+
+
+def test_parse_chunks_of_binary_data_stops_early():
+    def chunks():
+        yield b'\xff\xfb\x90\x00' * 4096
+        raise AssertionError('Read past the first line')
+
+    assert playlists.parse_chunks(chunks()) == []
@@ -0,0 +1,168 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+import mock
+
+import pykka
+
+from mopidy import exceptions
+from mopidy.internal import profiler
+
+
+class BusyActor(pykka.ThreadingActor):
+
+    def wait(self, event):
+        event.wait(5)
+
+
+class GetThreadLabelsTest(unittest.TestCase):
+
+    def tearDown(self):  # noqa: N802
+        pykka.ActorRegistry.stop_all()
+
+    def test_actor_threads_are_labeled_with_actor_class(self):
+        BusyActor.start()
+
+        self.assertIn(
+            'tests.internal.test_profiler.BusyActor',
+            profiler.get_thread_labels().values())
+
+    def test_thread_numbers_are_removed(self):
+        event = threading.Event()
+        thread = threading.Thread(target=event.wait, name='Worker-12')
+        thread.start()
+        try:
+            labels = profiler.get_thread_labels()
+        finally:
+            event.set()
+            thread.join()
+
+        self.assertEqual('Worker', labels[thread.ident])
+
+    def test_main_thread_is_labeled_as_main_loop(self):
+        labels = profiler.get_thread_labels()
+
+        self.assertEqual(
+            'MainThread (GLib main loop)',
+            labels[threading.current_thread().ident])
+
+
+class ProfilerTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.tmpdir = tempfile.mkdtemp()
+        self.profiler = profiler.Profiler(
+            output_dir=self.tmpdir, duration=10, interval=0.001)
+        self.event = threading.Event()
+
+    def tearDown(self):  # noqa: N802
+        self.event.set()
+        self.stop_and_wait()
+        pykka.ActorRegistry.stop_all()
+        shutil.rmtree(self.tmpdir)
+
+    def stop_and_wait(self):
+        thread = self.profiler._thread
+        self.profiler.stop()
+        if thread is not None:
+            thread.join(5)
+
+    def read_profile(self, file_path):
+        with open(file_path, 'rb') as fh:
+            return fh.read().decode('utf-8').splitlines()
+
+    def test_stop_writes_collapsed_stacks(self):
+        actor = BusyActor.start().proxy()
+        actor.wait(self.event)
+
+        self.assertTrue(self.profiler.start())
+        self.assertTrue(self.profiler.is_running())
+        self.event.wait(0.1)
+        self.stop_and_wait()
+
+        self.assertFalse(self.profiler.is_running())
+        file_path = self.profiler.last_profile
+        self.assertEqual(self.tmpdir, os.path.dirname(file_path))
+        lines = self.read_profile(file_path)
+        self.assertTrue(any(
+            line.startswith('tests.internal.test_profiler.BusyActor;') and
+            'tests.internal.test_profiler:wait' in line
+            for line in lines))
+        for line in lines:
+            self.assertGreater(int(line.rsplit(' ', 1)[1]), 0)
+            self.assertNotIn('Profiler;', line)
+
+    def test_stops_after_duration(self):
+        self.profiler.duration = 0.05
+        self.profiler.start()
+
+        self.profiler._thread.join(5)
+
+        self.assertFalse(self.profiler.is_running())
+        self.assertTrue(os.path.isfile(self.profiler.last_profile))
+
+    def test_start_rejects_invalid_duration(self):
+        with self.assertRaises(exceptions.ValidationError):
+            self.profiler.start(duration=0)
+        with self.assertRaises(exceptions.ValidationError):
+            self.profiler.start(duration='10')
+
+        self.assertFalse(self.profiler.is_running())
+
+    def test_start_without_output_dir_does_nothing(self):
+        self.profiler.output_dir = None
+
+        self.assertFalse(self.profiler.start())
+        self.assertFalse(self.profiler.is_running())
+
+    def test_is_not_running_after_failing(self):
+        with mock.patch.object(
+                self.profiler, '_write', side_effect=Exception):
+            self.profiler.duration = 0.05
+            self.profiler.start()
+            self.profiler._thread.join(5)
+
+        self.assertFalse(self.profiler.is_running())
+
+    def test_start_when_running_does_nothing(self):
+        self.profiler.start()
+
+        self.assertFalse(self.profiler.start())
+
+    def test_stop_when_not_running(self):
+        self.assertFalse(self.profiler.stop())
+
+    def test_stop_does_not_wait_for_profile_to_be_written(self):
+        writing = threading.Event()
+
+        def write(samples, start):
+            writing.set()
+            self.event.wait(5)
+
+        with mock.patch.object(self.profiler, '_write', side_effect=write):
+            self.profiler.start()
+            thread = self.profiler._thread
+
+            self.assertTrue(self.profiler.stop())
+            self.assertTrue(writing.wait(5))
+            self.assertTrue(self.profiler.is_running())
+
+            self.event.set()
+            thread.join(5)
+
+        self.assertFalse(self.profiler.is_running())
+
+    def test_toggle(self):
+        self.profiler.toggle()
+        self.assertTrue(self.profiler.is_running())
+
+        thread = self.profiler._thread
+        self.profiler.toggle()
+        thread.join(5)
+        self.assertFalse(self.profiler.is_running())
+        self.assertIsNotNone(self.profiler.last_profile)
@@ -0,0 +1,147 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mopidy.internal import storage
+from mopidy.models import Ref
+
+
+class JournalTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, b'journal.jsonl')
+        self.journal = storage.Journal(self.path)
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.temp_dir)
+
+    def test_load_missing_file(self):
+        self.assertEqual(self.journal.load(), [])
+        self.assertEqual(self.journal.size, 0)
+
+    def test_append_and_load(self):
+        self.journal.append({'op': 'add', 'ref': Ref.track(uri='dummy:a')})
+        self.journal.append({'op': 'clear'})
+
+        records = storage.Journal(self.path).load()
+
+        self.assertEqual(records, [
+            {'op': 'add', 'ref': Ref.track(uri='dummy:a')},
+            {'op': 'clear'}])
+        self.assertEqual(self.journal.size, 2)
+
+    def test_load_ignores_truncated_record(self):
+        self.journal.append({'op': 'clear'})
+        with open(self.path, 'ab') as fp:
+            fp.write(b'{"op": "ad')
+
+        journal = storage.Journal(self.path)
+
+        self.assertEqual(journal.load(), [{'op': 'clear'}])
+        self.assertEqual(journal.size, 1)
+
+    def test_rewrite_replaces_content(self):
+        self.journal.append({'op': 'clear'})
+        self.journal.append({'op': 'clear'})
+
+        self.journal.rewrite([{'op': 'add'}])
+
+        self.assertEqual(self.journal.size, 1)
+        self.assertEqual(storage.Journal(self.path).load(), [{'op': 'add'}])
+        self.assertEqual(os.listdir(self.temp_dir), [b'journal.jsonl'])
+
+    def test_clear_removes_file(self):
+        self.journal.append({'op': 'clear'})
+
+        self.journal.clear()
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.journal.size, 0)
+
+
+class LruCacheTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, b'cache.json.gz')
+        self.cache = storage.LruCache(size=2)
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.temp_dir)
+
+    def test_get_unknown_key(self):
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_put_and_get(self):
+        self.cache.put('a', {'value': 1})
+
+        self.assertEqual({'value': 1}, self.cache.get('a'))
+        self.assertTrue(self.cache.changed)
+
+    def test_least_recently_used_entries_are_dropped(self):
+        self.cache.put('a', {'value': 1})
+        self.cache.put('b', {'value': 2})
+        self.cache.get('a')
+        self.cache.put('c', {'value': 3})
+
+        self.assertEqual(2, len(self.cache))
+        self.assertIsNotNone(self.cache.get('a'))
+        self.assertIsNone(self.cache.get('b'))
+
+    def test_remove(self):
+        self.cache.put('a', {'value': 1})
+
+        self.cache.remove('a')
+
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_save_and_load(self):
+        ref = Ref.track(uri='dummy:a', name='A')
+        self.cache.put('a', {'ref': ref})
+        self.cache.save(self.path)
+        self.assertFalse(self.cache.changed)
+
+        loaded = storage.LruCache(size=2)
+        loaded.load(self.path)
+
+        self.assertEqual({'ref': ref}, loaded.get('a'))
+        self.assertFalse(loaded.changed)
+
+    def test_save_and_load_skip_invalid_entries(self):
+        self.cache.put('a', {'value': 1})
+        self.cache.put('b', {'value': 2})
+        self.cache.save(self.path, is_valid=lambda e: e['value'] > 1)
+
+        loaded = storage.LruCache(size=2)
+        loaded.load(self.path, is_valid=lambda e: e['value'] < 2)
+
+        self.assertEqual(0, len(loaded))
+
+    def test_load_trims_to_size(self):
+        self.cache.put('a', {'value': 1})
+        self.cache.put('b', {'value': 2})
+        self.cache.save(self.path)
+
+        loaded = storage.LruCache(size=1)
+        loaded.load(self.path)
+
+        self.assertIsNone(loaded.get('a'))
+        self.assertEqual({'value': 2}, loaded.get('b'))
+
+    def test_load_ignores_other_versions(self):
+        self.cache.put('a', {'value': 1})
+        self.cache.save(self.path)
+
+        loaded = storage.LruCache(size=2, version=2)
+        loaded.load(self.path)
+
+        self.assertEqual(0, len(loaded))
+
+    def test_load_missing_file(self):
+        self.cache.load(self.path)
+
+        self.assertEqual(0, len(self.cache))
@@ -0,0 +1,50 @@
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import unittest
+
+from mopidy.internal import workers
+
+
+class WorkerPoolTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.pool = workers.WorkerPool(2, name='Test')
+
+    def tearDown(self):  # noqa: N802
+        self.pool.stop()
+
+    def test_submit_returns_future_with_result(self):
+        future = self.pool.submit(lambda a, b=0: a + b, 1, b=2)
+
+        self.assertEqual(3, future.get(timeout=1))
+
+    def test_exception_is_raised_from_future(self):
+        def fail():
+            raise ValueError('error')
+
+        with self.assertRaises(ValueError):
+            self.pool.submit(fail).get(timeout=1)
+
+    def test_runs_in_named_worker_thread(self):
+        name = self.pool.submit(lambda: threading.current_thread().name)
+
+        self.assertEqual('Test-1', name.get(timeout=1))
+
+    def test_work_is_queued_when_all_workers_are_busy(self):
+        event = threading.Event()
+        futures = [self.pool.submit(event.wait) for _ in range(3)]
+        queued = self.pool.submit(lambda: 'done')
+
+        self.assertEqual(2, len(self.pool._threads))
+
+        event.set()
+        self.assertEqual('done', queued.get(timeout=1))
+        for future in futures:
+            self.assertTrue(future.get(timeout=1))
+
+    def test_idle_workers_are_reused(self):
+        for _ in range(5):
+            self.pool.submit(lambda: None).get(timeout=1)
+
+        self.assertEqual(1, len(self.pool._threads))
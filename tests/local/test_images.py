@@ -0,0 +1,63 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from mopidy.internal import path
+from mopidy.local import images
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 32
+
+
+class ImageStoreTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.tmpdir = tempfile.mkdtemp()
+        self.image_dir = os.path.join(self.tmpdir, b'images')
+        self.store = images.ImageStore(self.image_dir)
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.tmpdir)
+
+    def test_add_writes_image_named_by_content(self):
+        uri = self.store.add(PNG)
+
+        file_path = path.uri_to_path(uri)
+        self.assertEqual(self.image_dir, os.path.dirname(file_path))
+        self.assertTrue(file_path.endswith(b'.png'))
+        with open(file_path, 'rb') as fh:
+            self.assertEqual(PNG, fh.read())
+
+    def test_same_image_is_stored_once(self):
+        first = self.store.add(PNG)
+        second = images.ImageStore(self.image_dir).add(PNG)
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(os.listdir(self.image_dir)))
+
+    def test_different_images_are_stored_separately(self):
+        self.assertNotEqual(self.store.add(PNG), self.store.add(PNG + b'x'))
+        self.assertEqual(2, len(os.listdir(self.image_dir)))
+
+    def test_unknown_image_type_has_no_extension(self):
+        uri = self.store.add(b'not an image')
+
+        self.assertNotIn(b'.', os.path.basename(path.uri_to_path(uri)))
+
+    def test_store_images_replaces_images_with_uris(self):
+        tags = {'title': ['Song'], 'image': [PNG], 'preview-image': [PNG]}
+
+        result = self.store.store_images(tags)
+
+        uri = self.store.add(PNG)
+        self.assertEqual(
+            {'title': ['Song'], 'image': [uri], 'preview-image': [uri]},
+            result)
+        self.assertEqual([PNG], tags['image'])
+
+    def test_store_images_without_images(self):
+        self.assertEqual(
+            {'title': ['Song']}, self.store.store_images({'title': ['Song']}))
+        self.assertFalse(os.path.exists(self.image_dir))
@@ -64,6 +64,8 @@ class LocalLibraryProviderTest(unittest.TestCase):
         Track(uri='local:track:nameless', album=albums[-1]),
     ]
 
+    library_class = json.JsonLibrary
+
     config = {
         'core': {
             'data_dir': path_to_data_dir(''),
@@ -75,7 +77,7 @@ class LocalLibraryProviderTest(unittest.TestCase):
     }
 
     def setUp(self):  # noqa: N802
-        actor.LocalBackend.libraries = [json.JsonLibrary]
+        actor.LocalBackend.libraries = [self.library_class]
         self.backend = actor.LocalBackend.start(
             config=self.config, audio=None).proxy()
         self.core = core.Core(backends=[self.backend])
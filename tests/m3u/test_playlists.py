@@ -6,13 +6,18 @@ import os
 import platform
 import shutil
 import tempfile
+import time
 import unittest
 
+import mock
+
 import pykka
 
 from mopidy import core
 from mopidy.internal import deprecation
+from mopidy.m3u import translator
 from mopidy.m3u.backend import M3UBackend
+from mopidy.m3u.playlists import M3UPlaylistsProvider
 from mopidy.models import Playlist, Track
 
 from tests import dummy_audio, path_to_data_dir
@@ -351,6 +356,102 @@ class M3UPlaylistsProviderTest(unittest.TestCase):
         self.assertIsNone(item_refs)
 
 
+class M3UPlaylistsProviderCacheTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        self.playlists_dir = tempfile.mkdtemp()
+        self.provider = M3UPlaylistsProvider(backend=None, config={
+            'm3u': {
+                'base_dir': None,
+                'default_encoding': 'latin-1',
+                'default_extension': '.m3u',
+                'playlists_dir': self.playlists_dir,
+            }
+        })
+        self.write_playlist(b'a.m3u', 'dummy:a')
+        self.write_playlist(b'b.m3u', 'dummy:b')
+
+    def tearDown(self):  # noqa: N802
+        shutil.rmtree(self.playlists_dir)
+
+    def write_playlist(self, name, *uris, **kwargs):
+        path = os.path.join(self.playlists_dir, name)
+        with open(path, 'w') as f:
+            f.write(''.join(uri + '\n' for uri in uris))
+        self.set_old_mtime(path, kwargs.get('age', 60))
+        self.set_old_mtime(self.playlists_dir, kwargs.get('age', 60))
+
+    def set_old_mtime(self, path, age):
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+
+    def test_as_list_is_cached_until_dir_changes(self):
+        self.provider.as_list()
+
+        with mock.patch.object(os, 'listdir') as listdir_mock:
+            self.assertEqual(len(self.provider.as_list()), 2)
+        self.assertFalse(listdir_mock.called)
+
+        self.write_playlist(b'c.m3u', 'dummy:c', age=30)
+        self.assertEqual(
+            ['a', 'b', 'c'], [ref.name for ref in self.provider.as_list()])
+
+    def test_items_are_parsed_once_until_file_changes(self):
+        with mock.patch.object(
+                translator, 'load_items',
+                wraps=translator.load_items) as load_mock:
+            self.provider.get_items('m3u:a.m3u')
+            playlist = self.provider.lookup('m3u:a.m3u')
+            self.assertEqual(load_mock.call_count, 1)
+            self.assertEqual('dummy:a', playlist.tracks[0].uri)
+
+            self.write_playlist(b'a.m3u', 'dummy:x', age=30)
+            playlist = self.provider.lookup('m3u:a.m3u')
+            self.assertEqual(load_mock.call_count, 2)
+            self.assertEqual('dummy:x', playlist.tracks[0].uri)
+
+    def test_recently_modified_files_are_not_cached(self):
+        path = os.path.join(self.playlists_dir, b'a.m3u')
+        os.utime(path, None)
+
+        self.provider.get_items('m3u:a.m3u')
+
+        self.assertEqual(self.provider._items, {})
+
+    def test_refresh_only_parses_changed_files(self):
+        self.provider.refresh()
+        self.write_playlist(b'b.m3u', 'dummy:x', age=30)
+
+        with mock.patch.object(
+                translator, 'load_items',
+                wraps=translator.load_items) as load_mock:
+            self.provider.refresh()
+
+        self.assertEqual(load_mock.call_count, 1)
+        self.assertEqual(
+            'dummy:x', self.provider.get_items('m3u:b.m3u')[0].uri)
+
+    def test_refresh_forgets_removed_files(self):
+        self.provider.refresh()
+        os.remove(os.path.join(self.playlists_dir, b'b.m3u'))
+
+        self.provider.refresh()
+
+        self.assertEqual(['a'], [ref.name for ref in self.provider.as_list()])
+        self.assertEqual(
+            [os.path.join(self.playlists_dir, b'a.m3u')],
+            list(self.provider._items))
+
+    def test_save_replaces_cached_items(self):
+        self.provider.get_items('m3u:a.m3u')
+
+        self.provider.save(Playlist(
+            uri='m3u:a.m3u', tracks=[Track(uri='dummy:x')]))
+
+        self.assertEqual(
+            'dummy:x', self.provider.get_items('m3u:a.m3u')[0].uri)
+
+
 class M3UPlaylistsProviderBaseDirectoryTest(M3UPlaylistsProviderTest):
 
     def setUp(self):  # noqa: N802
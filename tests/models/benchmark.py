@@ -0,0 +1,149 @@
+"""
+Benchmarks for the model classes.
+
+Not run as part of the test suite. Run with::
+
+    PYTHONPATH=. python tests/models/benchmark.py [LIBRARY_SIZE]
+
+where ``LIBRARY_SIZE`` is the number of tracks in the synthetic library used
+for the serialization benchmarks, by default 500000.
+"""
+
+from __future__ import absolute_import, print_function, unicode_literals
+
+import functools
+import json
+import sys
+import time
+import timeit
+
+from mopidy.models import (
+    Album, Artist, ModelJSONEncoder, Track, model_json_decoder, serialize)
+
+
+NUM_TRACKS = 10000
+NUM_ALBUMS = 100
+LIBRARY_SIZE = 500000
+
+
+def make_kwargs(i):
+    album = i % NUM_ALBUMS
+    return {
+        'uri': 'local:track:%d.mp3' % i,
+        'name': 'Track %d' % i,
+        'track_no': i % 12 + 1,
+        'length': 180000 + i,
+        'artists': [Artist(name='Artist %d' % album)],
+        'album': Album(
+            name='Album %d' % album,
+            artists=[Artist(name='Artist %d' % album)]),
+    }
+
+
+def bench(name, func, number, items):
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print('%-40s %12.0f per second' % (name, number * items / seconds))
+
+
+def main():
+    kwargs = [make_kwargs(i) for i in range(NUM_TRACKS)]
+    tracks = [Track(**kw) for kw in kwargs]
+    copies = [Track(**kw) for kw in kwargs]  # noqa: F841, keeps them alive
+    album_kwargs = [
+        {'name': 'Album %d' % (i % NUM_ALBUMS), 'num_tracks': 12}
+        for i in range(NUM_TRACKS)]
+    serialized = json.dumps(tracks, cls=ModelJSONEncoder)
+
+    def construct_existing():
+        for kw in kwargs:
+            Track(**kw)
+
+    def construct_new():
+        for i, kw in enumerate(kwargs):
+            Track(comment='%d' % i, **kw)
+
+    def construct_repeated_albums():
+        for kw in album_kwargs:
+            Album(**kw)
+
+    def hash_fresh():
+        for track in tracks:
+            object.__delattr__(track, '_hash')
+            hash(track)
+
+    def hash_cached():
+        for track in tracks:
+            hash(track)
+
+    def equality():
+        for a, b in zip(tracks, tracks[1:]):
+            a == b  # noqa: B015
+
+    def replace():
+        for track in tracks:
+            track.replace(name='Other')
+
+    def decode():
+        json.loads(serialized, object_hook=model_json_decoder)
+
+    def decode_trusted():
+        json.loads(
+            serialized, object_hook=serialize.trusted_model_json_decoder)
+
+    bench('Track(): existing instance', construct_existing, 5, NUM_TRACKS)
+    bench('Track(): new instance', construct_new, 5, NUM_TRACKS)
+    bench('Album(): repeated instances', construct_repeated_albums, 5,
+          NUM_TRACKS)
+    bench('hash(): not cached', hash_fresh, 5, NUM_TRACKS)
+    bench('hash(): cached', hash_cached, 5, NUM_TRACKS)
+    bench('==: different tracks', equality, 5, NUM_TRACKS)
+    bench('replace()', replace, 5, NUM_TRACKS)
+    bench('model_json_decoder', decode, 1, NUM_TRACKS)
+    bench('trusted_model_json_decoder', decode_trusted, 1, NUM_TRACKS)
+
+
+def bench_once(name, func, items):
+    start = time.time()
+    result = func()
+    seconds = time.time() - start
+    print('%-40s %12.0f per second' % (name, items / seconds))
+    return result
+
+
+def make_library(size):
+    # Albums of 10 tracks, each album with its own artist.
+    tracks = [
+        Track(**dict(make_kwargs(i), album=Album(
+            name='Album %d' % (i // 10),
+            artists=[Artist(name='Artist %d' % (i // 10))])))
+        for i in range(size)]
+    return {'version': '3.0', 'tracks': tracks}
+
+
+def encode(data):
+    return ''.join(serialize.iterencode_models(data))
+
+
+def bench_library(size):
+    library = make_library(size)
+
+    print('Library of %d tracks:' % size)
+    data = bench_once(
+        'ModelJSONEncoder',
+        functools.partial(json.dumps, library, cls=ModelJSONEncoder), size)
+    bench_once('iterencode_models', functools.partial(encode, library), size)
+
+    # Decode without the models in memory, like when loading the library.
+    del library
+    bench_once(
+        'model_json_decoder',
+        lambda: json.loads(data, object_hook=model_json_decoder), size)
+    bench_once(
+        'decode_models',
+        lambda: serialize.decode_models(json.loads(data)), size)
+
+
+if __name__ == '__main__':
+    main()
+    print()
+    bench_library(int(sys.argv[1]) if len(sys.argv) > 1 else LIBRARY_SIZE)
@@ -5,7 +5,7 @@ import unittest
 
 from mopidy.models import (
     Album, Artist, Image, ModelJSONEncoder, Playlist,
-    Ref, SearchResult, TlTrack, Track, model_json_decoder)
+    Ref, SearchResult, TlTrack, Track, model_json_decoder, serialize)
 
 
 class InheritanceTest(unittest.TestCase):
@@ -54,6 +54,61 @@ class CachingTest(unittest.TestCase):
         t = Track(uri='test1')
         self.assertIsNot(t, t.replace(uri='test2'))
 
+    def test_same_instance_with_collections(self):
+        artists = [Artist(name='a'), Artist(name='b')]
+        self.assertIs(
+            Track(uri='test', artists=artists),
+            Track(uri='test', artists=list(reversed(artists))))
+
+    def test_same_instance_with_bytes_and_unicode_identifier(self):
+        self.assertIs(Track(uri=b'test'), Track(uri='test'))
+
+    def test_same_instance_ignores_none_and_default_values(self):
+        self.assertIs(Track(uri='test'), Track(uri='test', name=None))
+        self.assertIs(Track(uri='test'), Track(uri='test', artists=[]))
+
+    def test_different_instance_with_subset_of_values(self):
+        self.assertIsNot(
+            Track(uri='test', name='name'), Track(uri='test'))
+
+    def test_existing_instance_does_not_skip_validation(self):
+        Track(length=1, name='name', artists=[Artist(name='a')])
+
+        with self.assertRaises(TypeError):
+            Track(length=1.0, name='name', artists=[Artist(name='a')])
+        with self.assertRaises(TypeError):
+            Track(length=1, name='name', artists=[Ref(name='a')])
+
+    def test_existing_instance_does_not_skip_collection_validation(self):
+        Album(images=['a', 'b'])
+
+        with self.assertRaises(TypeError):
+            Album(images='ab')
+
+    def test_trusted_decoding_gives_same_instance(self):
+        track = Track(
+            uri='test', name='name', length=1,
+            artists=[Artist(name='a')], album=Album(name='b'))
+        serialized = json.dumps(track, cls=ModelJSONEncoder)
+
+        result = json.loads(
+            serialized, object_hook=serialize.trusted_model_json_decoder)
+
+        self.assertIs(track, result)
+
+    def test_trusted_decoding_creates_valid_instance(self):
+        result = json.loads(
+            '{"__model__": "Album", "uri": "test", "name": "name", '
+            '"artists": [{"__model__": "Artist", "name": "unique name"}]}',
+            object_hook=serialize.trusted_model_json_decoder)
+
+        album = Album(
+            uri='test', name='name', artists=[Artist(name='unique name')])
+        self.assertIs(album, result)
+        self.assertEqual(hash(album), hash(result))
+        self.assertIsInstance(result.uri, bytes)
+        self.assertIsInstance(result.artists, frozenset)
+
 
 class GenericReplaceTest(unittest.TestCase):
 
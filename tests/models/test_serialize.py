@@ -0,0 +1,103 @@
+from __future__ import absolute_import, unicode_literals
+
+import json
+import unittest
+
+from mopidy.models import (
+    Album, Artist, ImmutableObject, ModelJSONEncoder, Playlist, TlTrack,
+    Track, model_json_decoder, serialize)
+
+
+class LegacyModel(ImmutableObject):
+    name = None
+    models = ()
+
+
+class DecodeModelsTest(unittest.TestCase):
+
+    def setUp(self):  # noqa: N802
+        artist = Artist(name='B\xe4r')
+        album = Album(name='Album', artists=[artist], images=['a', 'b'])
+        self.tracks = [
+            Track(uri='dummy:%d' % i, name='Track %d' % i, track_no=i,
+                  artists=[artist], album=album)
+            for i in range(3)]
+
+    def decode(self, data):
+        return serialize.decode_models(json.loads(data))
+
+    def test_same_result_as_model_json_decoder(self):
+        data = json.dumps(
+            {'tracks': self.tracks, 'tl_track': TlTrack(1, self.tracks[0])},
+            cls=ModelJSONEncoder)
+
+        self.assertEqual(
+            json.loads(data, object_hook=model_json_decoder),
+            self.decode(data))
+
+    def test_nested_models_are_decoded_once(self):
+        result = self.decode(json.dumps(self.tracks, cls=ModelJSONEncoder))
+
+        self.assertIs(result[0].album, result[2].album)
+        self.assertIs(result[0].album.artists, result[2].album.artists)
+
+    def test_models_in_collections(self):
+        playlist = Playlist(uri='dummy:p', tracks=self.tracks)
+
+        result = self.decode(json.dumps(playlist, cls=ModelJSONEncoder))
+
+        self.assertEqual(playlist, result)
+
+    def test_plain_data_is_unchanged(self):
+        data = {'a': [1, 2, {'b': None}], 'c': True, 'd': 'e'}
+
+        self.assertEqual(data, self.decode(json.dumps(data)))
+
+    def test_unknown_model_becomes_dict(self):
+        self.assertEqual(
+            {'a': 1}, self.decode('{"__model__": "NoSuchModel", "a": 1}'))
+
+
+class IterencodeModelsTest(unittest.TestCase):
+
+    def encode(self, data):
+        return ''.join(serialize.iterencode_models(data))
+
+    def assert_same_json(self, data):
+        self.assertEqual(
+            json.loads(json.dumps(data, cls=ModelJSONEncoder)),
+            json.loads(self.encode(data)))
+
+    def test_track(self):
+        artist = Artist(name='B\xe4r', musicbrainz_id='id')
+        self.assert_same_json(Track(
+            uri='dummy:\xe4', name='Track', track_no=1, length=2,
+            artists=[artist],
+            album=Album(name='Album', artists=[artist], images=['a'])))
+
+    def test_plain_data(self):
+        self.assert_same_json(
+            {'a': [1, 2, (3, 4), {'b': None}], 'c': True, 'd': False,
+             'e': 'f', 'g': 1.5, 'h': {1: 2}})
+
+    def test_models_in_plain_data(self):
+        track = Track(name='a', artists=[Artist(name='b')])
+        self.assert_same_json(
+            {'version': '1', 'tracks': [track, track.replace(name='c')]})
+
+    def test_empty_collections_are_omitted(self):
+        self.assertEqual(
+            '{"__model__": "Playlist", "name": "a"}',
+            self.encode(Playlist(name='a', tracks=[])))
+
+    def test_legacy_models(self):
+        self.assert_same_json(LegacyModel(
+            name='a', models=(LegacyModel(name='b'),)))
+
+    def test_round_trip(self):
+        tracks = [
+            Track(uri='dummy:%d' % i, album=Album(name='a')) for i in range(3)]
+
+        result = serialize.decode_models(json.loads(self.encode(tracks)))
+
+        self.assertEqual(tracks, result)
@@ -192,6 +192,22 @@ class PlaylistsHandlerTest(protocol.BaseTestCase):
         self.assertEqual('dummy:e', tracks[4].uri)
         self.assertInResponse('OK')
 
+    @mock.patch.object(stored_playlists, '_LOAD_CHUNK_SIZE', 2)
+    def test_load_adds_tracks_in_chunks(self):
+        tracks = [Track(uri='dummy:%s' % name) for name in 'abcde']
+        self.backend.library.dummy_library = tracks
+        self.backend.playlists.set_dummy_playlists([
+            Playlist(name='A-list', uri='dummy:A-list', tracks=tracks)])
+        version = self.core.tracklist.get_version().get()
+
+        self.send_request('load "A-list"')
+
+        self.assertEqual(
+            [t.uri for t in tracks],
+            [t.uri for t in self.core.tracklist.get_tracks().get()])
+        self.assertEqual(version + 3, self.core.tracklist.get_version().get())
+        self.assertInResponse('OK')
+
     def test_load_with_range_loads_part_of_playlist(self):
         tracks = [
             Track(uri='dummy:a'),
@@ -4,6 +4,9 @@ from __future__ import absolute_import, unicode_literals
 
 import unittest
 
+import mock
+
+from mopidy.internal import metrics
 from mopidy.mpd import exceptions, protocol
 
 
@@ -65,6 +68,15 @@ class TestCommands(unittest.TestCase):
         def test(context):
             pass
 
+    def test_call_is_timed(self):
+        self.commands.add('bar')(lambda context: None)
+
+        with mock.patch.object(metrics.registry, 'enabled', True), \
+                mock.patch.object(metrics.registry, 'observe') as observe:
+            self.commands.call(['bar'])
+
+        observe.assert_called_once_with('mpd', 'bar', mock.ANY)
+
     def test_register_second_command_to_same_name_fails(self):
         def func(context):
             pass
@@ -0,0 +1,101 @@
+from __future__ import absolute_import, unicode_literals
+
+import os
+
+import mock
+
+import pytest
+
+from mopidy.models import Track
+from mopidy.stream import cache
+
+
+URI = 'http://example.com/listen.m3u'
+STREAM_URI = 'http://example.com/stream.mp3'
+TRACK = Track(uri=URI, name='Radio')
+
+
+@pytest.yield_fixture
+def now():
+    with mock.patch.object(cache.time, 'time') as time_mock:
+        time_mock.return_value = 1000.0
+        yield time_mock
+
+
+@pytest.fixture
+def unwrap_cache(now):
+    return cache.UnwrapCache(ttl=60, size=2, failure_ttl=10)
+
+
+def test_get_unknown_uri(unwrap_cache):
+    assert unwrap_cache.get(URI) is None
+
+
+def test_put_and_get(unwrap_cache):
+    unwrap_cache.put(URI, STREAM_URI, TRACK)
+
+    assert unwrap_cache.get(URI) == (STREAM_URI, TRACK)
+
+
+def test_results_expire_after_ttl(unwrap_cache, now):
+    unwrap_cache.put(URI, STREAM_URI, TRACK)
+
+    now.return_value += 59
+    assert unwrap_cache.get(URI) == (STREAM_URI, TRACK)
+    now.return_value += 1
+    assert unwrap_cache.get(URI) is None
+    assert len(unwrap_cache) == 0
+
+
+def test_failures_expire_after_failure_ttl(unwrap_cache, now):
+    unwrap_cache.put(URI, None, None)
+
+    assert unwrap_cache.get(URI) == (None, None)
+    now.return_value += 10
+    assert unwrap_cache.get(URI) is None
+
+
+def test_least_recently_used_uris_are_dropped(unwrap_cache):
+    unwrap_cache.put('http://a', 'http://a', None)
+    unwrap_cache.put('http://b', 'http://b', None)
+    unwrap_cache.get('http://a')
+    unwrap_cache.put('http://c', 'http://c', None)
+
+    assert unwrap_cache.get('http://a') is not None
+    assert unwrap_cache.get('http://b') is None
+    assert unwrap_cache.get('http://c') is not None
+
+
+def test_nothing_is_cached_with_zero_ttl():
+    unwrap_cache = cache.UnwrapCache(ttl=0)
+
+    unwrap_cache.put(URI, STREAM_URI, TRACK)
+
+    assert unwrap_cache.get(URI) is None
+
+
+def test_save_and_load(unwrap_cache, now, tmpdir):
+    path = os.path.join(str(tmpdir), b'unwrap.json.gz')
+    unwrap_cache.put(URI, STREAM_URI, TRACK)
+    unwrap_cache.put('http://failed', None, None)
+    unwrap_cache.save(path)
+
+    now.return_value += 30
+    loaded = cache.UnwrapCache(ttl=60)
+    loaded.load(path)
+
+    assert loaded.get(URI) == (STREAM_URI, TRACK)
+    assert loaded.get('http://failed') is None
+
+
+def test_load_ignores_other_formats(unwrap_cache, tmpdir):
+    path = os.path.join(str(tmpdir), b'unwrap.json.gz')
+    unwrap_cache.put(URI, STREAM_URI, TRACK)
+    unwrap_cache.save(path)
+
+    with mock.patch.object(
+            cache, 'FORMAT_VERSION', cache.FORMAT_VERSION + 1):
+        loaded = cache.UnwrapCache(ttl=60)
+        loaded.load(path)
+
+    assert len(loaded) == 0
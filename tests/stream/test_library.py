@@ -17,6 +17,7 @@ def config():
         'proxy': {},
         'stream': {
             'timeout': 1000,
+            'cache_ttl': 3600,
             'metadata_blacklist': [],
             'protocols': ['file'],
         },
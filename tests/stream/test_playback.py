@@ -1,9 +1,12 @@
 from __future__ import absolute_import, unicode_literals
 
 import logging
+import threading
 
 import mock
 
+import pykka
+
 import pytest
 
 import requests.exceptions
@@ -31,6 +34,7 @@ def config():
         'proxy': {},
         'stream': {
             'timeout': TIMEOUT,
+            'cache_ttl': 3600,
             'metadata_blacklist': [],
             'protocols': ['http'],
         },
@@ -47,9 +51,14 @@ def audio():
 
 @pytest.yield_fixture
 def scanner():
+    # Use a new scan service, so that scans still running from a previous
+    # test aren't shared with this one.
+    service = scan.ScanService()
     patcher = mock.patch.object(scan, 'Scanner')
-    yield patcher.start()()
+    with mock.patch.object(scan, '_service', service):
+        yield patcher.start()()
     patcher.stop()
+    service.stop()
 
 
 @pytest.fixture
@@ -68,7 +77,8 @@ class TestTranslateURI(object):
     def test_audio_stream_returns_same_uri(self, scanner, provider):
         scanner.scan.side_effect = [
             # Set playable to False to test detection by mimetype
-            mock.Mock(mime='audio/mpeg', playable=False),
+            mock.Mock(
+                mime='audio/mpeg', playable=False, tags={}, duration=None),
         ]
 
         result = provider.translate_uri(STREAM_URI)
@@ -82,7 +92,8 @@ class TestTranslateURI(object):
 
         scanner.scan.side_effect = [
             # Set playable to True to ignore detection as possible playlist
-            mock.Mock(mime='application/ogg', playable=True),
+            mock.Mock(
+                mime='application/ogg', playable=True, tags={}, duration=None),
         ]
 
         result = provider.translate_uri(STREAM_URI)
@@ -99,7 +110,8 @@ class TestTranslateURI(object):
             # Scanning playlist
             mock.Mock(mime='text/foo', playable=False),
             # Scanning stream
-            mock.Mock(mime='audio/mpeg', playable=True),
+            mock.Mock(
+                mime='audio/mpeg', playable=True, tags={}, duration=None),
         ]
         responses.add(
             responses.GET, PLAYLIST_URI,
@@ -131,7 +143,8 @@ class TestTranslateURI(object):
             # Scanning playlist
             mock.Mock(mime='application/xspf+xml', playable=False),
             # Scanning stream
-            mock.Mock(mime='audio/mpeg', playable=True),
+            mock.Mock(
+                mime='audio/mpeg', playable=True, tags={}, duration=None),
         ]
         responses.add(
             responses.GET, PLAYLIST_URI,
@@ -154,7 +167,8 @@ class TestTranslateURI(object):
             # Scanning playlist
             exceptions.ScannerError('some failure'),
             # Scanning stream
-            mock.Mock(mime='audio/mpeg', playable=True),
+            mock.Mock(
+                mime='audio/mpeg', playable=True, tags={}, duration=None),
         ]
         responses.add(
             responses.GET, PLAYLIST_URI,
@@ -231,3 +245,143 @@ class TestTranslateURI(object):
             'Unwrapping stream from URI (%s) failed: '
             'playlist referenced itself' % PLAYLIST_URI) in caplog.text
         assert result is None
+
+
+class TestProbeStreams(object):
+
+    MIRROR_URI = 'http://foo.bar/baz'
+
+    @pytest.yield_fixture(autouse=True)
+    def probe_delay(self):
+        with mock.patch.object(actor, '_PROBE_DELAY', 0.01):
+            yield
+
+    def scan(self, streams, event=None):
+        # Scans of URIs without a result hang until the event is set.
+        def scan(uri, timeout=None):
+            result = streams.get(uri)
+            if result is None:
+                event.wait(5)
+                raise exceptions.ScannerError('Timeout')
+            elif isinstance(result, Exception):
+                raise result
+            return result
+        return scan
+
+    @responses.activate
+    def test_slow_first_stream_is_skipped(self, scanner, provider):
+        event = threading.Event()
+        scanner.scan.side_effect = self.scan({
+            PLAYLIST_URI: mock.Mock(mime='text/foo', playable=False),
+            self.MIRROR_URI: mock.Mock(
+                mime='audio/mpeg', playable=True, tags={}, duration=None),
+        }, event)
+        responses.add(
+            responses.GET, PLAYLIST_URI,
+            body=BODY, content_type='audio/x-mpegurl')
+
+        try:
+            result = provider.translate_uri(PLAYLIST_URI)
+        finally:
+            event.set()
+
+        assert result == self.MIRROR_URI
+
+    @responses.activate
+    def test_failing_first_stream_is_skipped(self, scanner, provider):
+        scanner.scan.side_effect = self.scan({
+            PLAYLIST_URI: mock.Mock(mime='text/foo', playable=False),
+            STREAM_URI: exceptions.ScannerError('Kaboom'),
+            self.MIRROR_URI: mock.Mock(
+                mime='audio/mpeg', playable=True, tags={}, duration=None),
+        })
+        responses.add(
+            responses.GET, PLAYLIST_URI,
+            body=BODY, content_type='audio/x-mpegurl')
+
+        assert provider.translate_uri(PLAYLIST_URI) == self.MIRROR_URI
+
+    @responses.activate
+    def test_first_stream_is_followed_if_none_found(self, scanner, provider):
+        scanner.scan.side_effect = self.scan({
+            PLAYLIST_URI: mock.Mock(mime='text/foo', playable=False),
+            STREAM_URI: exceptions.ScannerError('Kaboom'),
+            self.MIRROR_URI: exceptions.ScannerError('Kaboom'),
+        })
+        responses.add(
+            responses.GET, PLAYLIST_URI,
+            body=BODY, content_type='audio/x-mpegurl')
+        responses.add(
+            responses.GET, STREAM_URI,
+            body=b'some audio data', content_type='audio/mpeg')
+
+        assert provider.translate_uri(PLAYLIST_URI) == STREAM_URI
+        assert scanner.scan.call_count == 3
+
+    def test_probes_leave_a_scanner_worker_free(self):
+        scanner = mock.Mock(num_workers=2)
+        scanner.scan_async.return_value = pykka.ThreadingFuture()
+
+        result = actor._probe_streams(
+            [STREAM_URI, self.MIRROR_URI], 100, scanner)
+
+        assert result == ((None, None), {})
+        scanner.scan_async.assert_called_once_with(
+            STREAM_URI, timeout=mock.ANY)
+
+
+class TestUnwrapCache(object):
+
+    @responses.activate
+    def test_lookup_and_playback_share_result(self, scanner, backend):
+        scanner.scan.side_effect = [
+            mock.Mock(mime='audio/mpeg', playable=True, tags={}, duration=0),
+        ]
+
+        tracks = backend.library.lookup(STREAM_URI)
+        result = backend.playback.translate_uri(STREAM_URI)
+
+        scanner.scan.assert_called_once_with(STREAM_URI, timeout=mock.ANY)
+        assert tracks[0].uri == STREAM_URI
+        assert result == STREAM_URI
+
+    @responses.activate
+    def test_failures_are_cached(self, scanner, backend):
+        scanner.scan.side_effect = exceptions.ScannerError('Kaboom')
+        responses.add(
+            responses.GET, STREAM_URI,
+            body=requests.exceptions.HTTPError('Kaboom'))
+
+        assert backend.playback.translate_uri(STREAM_URI) is None
+        assert backend.playback.translate_uri(STREAM_URI) is None
+
+        assert scanner.scan.call_count == 1
+
+    @responses.activate
+    def test_nothing_is_cached_if_disabled(self, scanner, audio, config):
+        config['stream']['cache_ttl'] = 0
+        backend = actor.StreamBackend(audio=audio, config=config)
+        scanner.scan.return_value = mock.Mock(
+            mime='audio/mpeg', playable=True, tags={}, duration=None)
+
+        backend.playback.translate_uri(STREAM_URI)
+        backend.playback.translate_uri(STREAM_URI)
+
+        assert scanner.scan.call_count == 2
+
+    @responses.activate
+    def test_cache_is_kept_across_restarts(
+            self, scanner, audio, config, tmpdir):
+        config['core'] = {'cache_dir': str(tmpdir)}
+        scanner.scan.return_value = mock.Mock(
+            mime='audio/mpeg', playable=True, tags={}, duration=None)
+        backend = actor.StreamBackend(audio=audio, config=config)
+        backend.on_start()
+        backend.playback.translate_uri(STREAM_URI)
+        backend.on_stop()
+
+        backend = actor.StreamBackend(audio=audio, config=config)
+        backend.on_start()
+
+        assert backend.playback.translate_uri(STREAM_URI) == STREAM_URI
+        assert scanner.scan.call_count == 1
@@ -250,6 +250,16 @@ class TestValidateExtensionData(object):
         expected = os.path.join(core_cache_dir, extension.ext_name)
         assert cache_dir == expected
 
+    def test_get_cache_dir_with_non_ascii_path(self, ext_data):
+        core_cache_dir = b'/tmp/\xc3\xa6'
+        config = {'core': {'cache_dir': core_cache_dir}}
+        extension = ext_data.extension
+
+        with mock.patch.object(ext.path, 'get_or_create_dir'):
+            cache_dir = extension.get_cache_dir(config)
+
+        assert cache_dir == b'/tmp/\xc3\xa6/' + bytes(extension.ext_name)
+
     def test_get_config_dir(self, ext_data):
         core_config_dir = '/tmp'
         config = {'core': {'config_dir': core_config_dir}}
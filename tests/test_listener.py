@@ -0,0 +1,93 @@
+from __future__ import absolute_import, unicode_literals
+
+import threading
+import unittest
+
+import pykka
+
+from mopidy import listener
+
+
+class DummyListener(listener.Listener):
+
+    def an_event(self):
+        pass
+
+    def other_event(self):
+        pass
+
+
+class EventActor(pykka.ThreadingActor, DummyListener):
+
+    def __init__(self):
+        super(EventActor, self).__init__()
+        self.received = threading.Event()
+
+    def an_event(self):
+        self.received.set()
+
+
+class OnEventActor(pykka.ThreadingActor, DummyListener):
+
+    def __init__(self):
+        super(OnEventActor, self).__init__()
+        self.events = []
+
+    def on_event(self, event, **kwargs):
+        self.events.append(event)
+
+
+class DefaultsActor(pykka.ThreadingActor, DummyListener):
+    pass
+
+
+class NotAListenerActor(pykka.ThreadingActor):
+
+    def an_event(self):
+        pass
+
+
+class SendTest(unittest.TestCase):
+
+    def tearDown(self):  # noqa: N802
+        pykka.ActorRegistry.stop_all()
+
+    def test_sends_event_to_actor_implementing_it(self):
+        actor = EventActor.start()
+
+        listener.send(DummyListener, 'an_event')
+
+        self.assertTrue(actor.proxy().received.get().wait(1))
+
+    def test_sends_all_events_to_actor_implementing_on_event(self):
+        actor = OnEventActor.start()
+
+        listener.send(DummyListener, 'an_event')
+        listener.send(DummyListener, 'other_event')
+
+        self.assertEqual(
+            ['an_event', 'other_event'], actor.proxy().events.get())
+
+    def test_only_sends_to_actors_handling_the_event(self):
+        actors = [
+            EventActor.start(), OnEventActor.start(), DefaultsActor.start(),
+            NotAListenerActor.start()]
+
+        self.assertEqual(
+            actors[:2], listener._get_listeners(DummyListener, 'an_event'))
+        self.assertEqual(
+            actors[1:2], listener._get_listeners(DummyListener, 'other_event'))
+
+    def test_listeners_are_updated_when_actors_start_and_stop(self):
+        first = EventActor.start()
+        self.assertEqual(
+            [first], listener._get_listeners(DummyListener, 'an_event'))
+
+        second = EventActor.start()
+        self.assertEqual(
+            [first, second],
+            listener._get_listeners(DummyListener, 'an_event'))
+
+        first.stop()
+        self.assertEqual(
+            [second], listener._get_listeners(DummyListener, 'an_event'))